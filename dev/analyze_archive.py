@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Prediction accuracy, headway and delay statistics over a recorded feed archive
+
+Streams the segments written by feed_archive.py through a process pool (one segment per
+task, so only a few segments are ever decompressed at once) and extracts stop arrivals with
+the same code the display and the SwiftBar plugin use: G snapshots go through
+ArrivalTable.upcoming (mta-display/arrival_table.py), as in get_all_trains, so the numbers
+describe the arrivals the board shows; ferry snapshots through mta-display/feed_extract.py.
+
+For each watched stop it reports:
+  - prediction error by horizon: predicted time minus the time the train/ferry actually came
+    (positive = it came earlier than predicted), for predictions made 0-2, 2-5, ... min ahead
+  - headways between consecutive arrivals
+  - slip: final arrival time minus the first prediction seen for that trip
+  - ferries only: departure minus arrival at the stop, and the feed's own delay field
+
+"Actually came" is the last prediction seen before the trip dropped the stop, which is only
+trusted if that prediction was under two minutes away.
+
+Usage:
+    python dev/analyze_archive.py [--source g|ferry] [--since 2026-10-01] [--until 2026-10-08]
+                                  [--workers N] [--dir DIR]
+
+--since and --until take a date or a time (2026-10-01T08:30); snapshots from --since up to,
+but not including, --until are analyzed.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from feed_archive import ARCHIVE_DIR, ArchiveReader, segment_start
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mta-display"))
+from arrival_table import ArrivalTable
+from feed_extract import boarding_time, stop_time_events
+
+STOPS = {
+    "g": ["G26N", "G26S"],  # Greenpoint Av, Queens-bound / Church Ave-bound
+    "ferry": ["18"],  # Greenpoint ferry landing
+}
+
+# Prediction horizons (minutes ahead) that errors are grouped by
+HORIZON_BUCKETS = [(0, 2), (2, 5), (5, 10), (10, 15), (15, 20), (20, 30)]
+RESOLVED_HORIZON = 120  # seconds; a trip's last prediction must be this close to count as "arrived"
+MAX_HEADWAY = 3600  # gaps longer than this are service breaks (overnight), not headways
+
+
+def horizon_bucket(seconds_ahead):
+    minutes = seconds_ahead / 60
+    for i, (low, high) in enumerate(HORIZON_BUCKETS):
+        if low <= minutes < high:
+            return i
+    return None
+
+
+class TripObservation:
+    """Everything kept about one trip at one stop - a fixed handful of numbers, however long it's watched"""
+    __slots__ = ('first_ts', 'first_predicted', 'last_ts', 'last_predicted', 'horizons',
+                 'dwell', 'delay')
+
+    def __init__(self, snapshot_ts, predicted):
+        self.first_ts = snapshot_ts
+        self.first_predicted = predicted
+        self.last_ts = snapshot_ts
+        self.last_predicted = predicted
+        self.horizons = {}  # horizon bucket -> (snapshot ts, predicted) of the earliest sample in it
+        self.dwell = None  # ferries: departure - arrival at the last sample
+        self.delay = None  # ferries: feed-reported arrival delay at the last sample
+
+    def observe(self, snapshot_ts, predicted):
+        if snapshot_ts < self.first_ts:
+            self.first_ts, self.first_predicted = snapshot_ts, predicted
+        if snapshot_ts >= self.last_ts:
+            self.last_ts, self.last_predicted = snapshot_ts, predicted
+        bucket = horizon_bucket(predicted - snapshot_ts)
+        if bucket is not None:
+            sample = self.horizons.get(bucket)
+            if sample is None or snapshot_ts < sample[0]:
+                self.horizons[bucket] = (snapshot_ts, predicted)
+
+    def merge(self, other):
+        """Fold in the same trip seen in another segment"""
+        self.observe(other.first_ts, other.first_predicted)
+        later = other.last_ts >= self.last_ts
+        self.observe(other.last_ts, other.last_predicted)
+        if later:
+            self.dwell, self.delay = other.dwell, other.delay
+        for bucket, sample in other.horizons.items():
+            mine = self.horizons.get(bucket)
+            if mine is None or sample[0] < mine[0]:
+                self.horizons[bucket] = sample
+
+    @property
+    def resolved(self):
+        return self.last_predicted - self.last_ts <= RESOLVED_HORIZON
+
+
+def analyze_segment(archive_dir, source, name, since=None, until=None):
+    """Worker: return ({(stop, trip key): TripObservation}, snapshot count) for one segment
+
+    Only snapshots in [since, until) are read, for the segments at either end of the range.
+    """
+    reader = ArchiveReader(archive_dir, source)
+    trips = {}
+    snapshots = 0
+    start = segment_start(name)
+    end = start + 3600
+    records = reader.iter_snapshots(start if since is None else max(start, since),
+                                    end if until is None else min(end, until))
+
+    if source == "g":
+        stops = set(STOPS[source])
+        for snapshot_ts, payload in records:
+            table = ArrivalTable.from_bytes(payload, stops=stops)
+            snapshots += 1
+            for stop_id in STOPS[source]:
+                # Every arrival the board could show at this snapshot, not just the first few
+                for _minutes, predicted, trip in table.upcoming(stop_id, snapshot_ts):
+                    key = (stop_id, table.trip_ids[trip], table.trip_start_dates[trip])
+                    observation = trips.get(key)
+                    if observation is None:
+                        trips[key] = TripObservation(snapshot_ts, predicted)
+                    else:
+                        observation.observe(snapshot_ts, predicted)
+    else:
+        # nyct_gtfs's compiled pb2 decodes any GTFS-realtime feed and avoids the protobuf
+        # conflict with google.transit's copy
+        from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2
+
+        message = gtfs_realtime_pb2.FeedMessage()
+        for snapshot_ts, payload in records:
+            message.ParseFromString(payload)
+            snapshots += 1
+            for stop_id in STOPS[source]:
+                for trip_update, arrival, departure in stop_time_events(message, stop_id):
+                    key = (stop_id, trip_update.trip.trip_id, trip_update.trip.start_date)
+                    predicted = boarding_time(arrival, departure)
+                    observation = trips.get(key)
+                    if observation is None:
+                        observation = trips[key] = TripObservation(snapshot_ts, predicted)
+                    else:
+                        observation.observe(snapshot_ts, predicted)
+                    if observation.last_ts == snapshot_ts:
+                        if arrival is not None and departure is not None:
+                            observation.dwell = departure - arrival
+                        for stop_time in trip_update.stop_time_update:
+                            if stop_time.stop_id == stop_id and stop_time.arrival.HasField('delay'):
+                                observation.delay = stop_time.arrival.delay
+                                break
+
+    return trips, snapshots
+
+
+def summarize(values, scale=60):
+    """'n=.. mean=.. median=.. p90=..' in minutes (values in seconds)"""
+    if not values:
+        return "n=0"
+    ordered = sorted(values)
+    n = len(ordered)
+    mean = sum(ordered) / n / scale
+    median = ordered[n // 2] / scale
+    p90 = ordered[min(n - 1, int(n * 0.9))] / scale
+    return f"n={n:<6} mean={mean:+6.2f}  median={median:+6.2f}  p90={p90:+6.2f} min"
+
+
+def report(source, trips):
+    for stop_id in STOPS[source]:
+        observations = [obs for (stop, _, _), obs in trips.items() if stop == stop_id]
+        resolved = [obs for obs in observations if obs.resolved]
+        print(f"\n{source} stop {stop_id}: {len(observations)} trips seen, {len(resolved)} arrived in the archive")
+
+        print("  Prediction error (predicted - actual) by horizon:")
+        for i, (low, high) in enumerate(HORIZON_BUCKETS):
+            errors = [obs.horizons[i][1] - obs.last_predicted for obs in resolved if i in obs.horizons]
+            print(f"    {low:>2}-{high:<2} min ahead: {summarize(errors)}")
+
+        actuals = sorted(obs.last_predicted for obs in resolved)
+        headways = [b - a for a, b in zip(actuals, actuals[1:]) if 0 < b - a <= MAX_HEADWAY]
+        print(f"  Headway:          {summarize(headways)}")
+        print(f"  Slip since first: {summarize([obs.last_predicted - obs.first_predicted for obs in resolved])}")
+
+        if source == "ferry":
+            print(f"  Departure - arrival: {summarize([obs.dwell for obs in resolved if obs.dwell is not None])}")
+            print(f"  Feed delay field:    {summarize([obs.delay for obs in resolved if obs.delay is not None])}")
+
+
+def parse_day(value):
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    archive_dir = ARCHIVE_DIR
+    if "--dir" in sys.argv:
+        archive_dir = sys.argv[sys.argv.index("--dir") + 1]
+    sources = list(STOPS)
+    if "--source" in sys.argv:
+        sources = [sys.argv[sys.argv.index("--source") + 1]]
+    since = parse_day(sys.argv[sys.argv.index("--since") + 1]) if "--since" in sys.argv else None
+    until = parse_day(sys.argv[sys.argv.index("--until") + 1]) if "--until" in sys.argv else None
+    workers = os.cpu_count() or 1
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for source in sources:
+            segments = ArchiveReader(archive_dir, source).segments
+            if since is not None:
+                segments = [name for name in segments if segment_start(name) + 3600 > since]
+            if until is not None:
+                segments = [name for name in segments if segment_start(name) < until]
+            if not segments:
+                print(f"{source}: no archived segments in range")
+                continue
+
+            started = time.perf_counter()
+            trips = {}
+            snapshots = 0
+            futures = [pool.submit(analyze_segment, archive_dir, source, name, since, until) for name in segments]
+            for future in futures:
+                segment_trips, segment_snapshots = future.result()
+                snapshots += segment_snapshots
+                # Trips crossing an hour boundary show up in two segments
+                for key, observation in segment_trips.items():
+                    if key in trips:
+                        trips[key].merge(observation)
+                    else:
+                        trips[key] = observation
+            elapsed = time.perf_counter() - started
+
+            print(f"{source}: {snapshots} snapshots from {len(segments)} segments in {elapsed:.1f}s "
+                  f"({snapshots / elapsed:.0f} snapshots/sec, {workers} workers)")
+            report(source, trips)
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Compare output encodings of the display frame: file size, encode time and decode time
+
+Encodes one rendered frame with every encoding in mta-display/frame_encoding.py at several
+zlib levels and strategies, then reports the median encode time, file size and decode time.
+Decode time is measured locally with Pillow unless --decode-cmd gives a command that decodes
+(or displays) the file on the device; it is run once per file per run and timed.
+
+With --link-kbps the transfer time is estimated and included in the total, and --refresh
+shows what share of the refresh interval each option costs.
+
+Usage:
+    python dev/bench_encoding.py [--image PATH] [--runs N] [--link-kbps K] [--refresh SECONDS]
+                                 [--decode-cmd "scp {path} kindle:/tmp/ && ssh kindle eips -g /tmp/{name}"]
+"""
+
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mta-display"))
+from frame_encoding import ENCODINGS, save_frame
+
+DEFAULT_IMAGE = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mta-display", "schedule.png"))
+LEVELS = (1, 6, 9)
+STRATEGIES = ('default', 'filtered', 'rle')
+
+
+def options():
+    """(label, frame mode, encoding, compress level, strategy) of every combination to try"""
+    yield "png RGB (current default)", 'RGB', 'png', None, None
+    for encoding in ENCODINGS:
+        if encoding == 'pgm':
+            yield "pgm", 'L', 'pgm', None, None
+            continue
+        for level in LEVELS:
+            for strategy in STRATEGIES:
+                yield f"{encoding} level {level} {strategy}", 'L', encoding, level, strategy
+
+
+def time_ms(action, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def pillow_decode(path):
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.load()
+
+
+def device_decode(command, path):
+    formatted = command.format(path=shlex.quote(path), name=shlex.quote(os.path.basename(path)))
+    result = subprocess.run(formatted, shell=True, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{formatted!r} failed: {result.stderr.decode(errors='replace').strip()}")
+
+
+def option(name, convert=str):
+    return convert(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else None
+
+
+def main():
+    from PIL import Image
+
+    image_path = option("--image") or DEFAULT_IMAGE
+    runs = option("--runs", int) or 5
+    link_kbps = option("--link-kbps", float)
+    refresh = option("--refresh", float)
+    decode_cmd = option("--decode-cmd")
+
+    frame = Image.open(image_path).convert('RGB')
+    frames = {'RGB': frame, 'L': frame.convert('L')}
+    print(f"Frame: {image_path} ({frame.width}x{frame.height}), median of {runs} runs")
+    print(f"Decode: {'device command' if decode_cmd else 'Pillow, this machine'}\n")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, mode, encoding, level, strategy) in enumerate(options()):
+            base_path = os.path.join(tmp, f"frame{i}.png")
+            path = save_frame(frames[mode], base_path, encoding, level, strategy)
+            encode_ms = time_ms(lambda: save_frame(frames[mode], base_path, encoding, level, strategy), runs)
+            size = os.path.getsize(path)
+            if decode_cmd:
+                decode_ms = time_ms(lambda: device_decode(decode_cmd, path), runs)
+            else:
+                decode_ms = time_ms(lambda: pillow_decode(path), runs)
+            transfer_ms = size * 8 / link_kbps if link_kbps else 0  # bits / (kbit/s) = ms
+            results.append((encode_ms + transfer_ms + decode_ms, label, size, encode_ms, transfer_ms, decode_ms))
+
+    header = f"{'encoding':<34} {'size KB':>8} {'encode ms':>10} {'decode ms':>10}"
+    if link_kbps:
+        header += f" {'xfer ms':>8}"
+    header += f" {'total ms':>9}"
+    if refresh:
+        header += f" {'of refresh':>10}"
+    print(header)
+    for total_ms, label, size, encode_ms, transfer_ms, decode_ms in sorted(results):
+        line = f"{label:<34} {size / 1024:8.1f} {encode_ms:10.1f} {decode_ms:10.1f}"
+        if link_kbps:
+            line += f" {transfer_ms:8.1f}"
+        line += f" {total_ms:9.1f}"
+        if refresh:
+            line += f" {total_ms / (refresh * 1000):10.2%}"
+        print(line)
+
+    smallest = min(results, key=lambda result: result[2])
+    print(f"\nSmallest: {smallest[1]} ({smallest[2] / 1024:.1f} KB); fastest overall: {min(results)[1]}")
+
+
+if __name__ == "__main__":
+    main()
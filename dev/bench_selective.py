@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare selective supersampling (--selective) with drawing the whole frame at 2x
+
+Renders each fixture board (dev/display_fixtures.py) both ways at one or more sizes and
+reports the median render time of each, the speedup, and how far the selective frame is
+from the 2x one: the largest and mean difference in gray levels, and the share of pixels
+off by more than one of the Kindle's 16 gray levels. Exits non-zero if that share exceeds
+--max-changed. --diff-dir saves amplified difference images for a closer look.
+
+Usage:
+    python dev/bench_selective.py [--runs N] [--sizes 800x600,600x800] [--max-changed PERCENT]
+                                  [--diff-dir DIR]
+"""
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from display_fixtures import fixture_snapshots
+from mta_display import render_frame
+
+PANEL_STEP = 17  # One of the panel's 16 gray levels (255 / 15)
+
+
+def option(name, convert=str):
+    return convert(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else None
+
+
+def render_ms(snapshot, size, selective, runs):
+    """(median ms, last frame) of render_frame with the 2x canvas or selective supersampling"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # render_frame reports fonts as it loads them
+            # low_memory skips the section cache, so both sides draw every pixel every time
+            img = render_frame(snapshot, low_memory=not selective, size=size, selective=selective)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), img
+
+
+def compare(full, selective):
+    """(max difference, mean difference, share of pixels off by more than a panel gray level)"""
+    from PIL import ImageChops, ImageStat
+
+    diff = ImageChops.difference(full.convert('L'), selective.convert('L'))
+    histogram = diff.histogram()
+    changed = sum(histogram[PANEL_STEP + 1:])
+    return diff, diff.getextrema()[1], ImageStat.Stat(diff).mean[0], changed / (diff.width * diff.height)
+
+
+def main():
+    runs = option("--runs", int) or 5
+    sizes = [tuple(int(value) for value in size.split('x')) for size in (option("--sizes") or "800x600").split(',')]
+    max_changed = option("--max-changed", float)
+    max_changed = 1.0 if max_changed is None else max_changed
+    diff_dir = option("--diff-dir")
+    if diff_dir:
+        os.makedirs(diff_dir, exist_ok=True)
+
+    print(f"Median of {runs} runs; 'changed' = pixels off by more than {PANEL_STEP} gray levels\n")
+    print(f"{'board':<12} {'size':>9} {'2x ms':>7} {'selective ms':>13} {'speedup':>8} "
+          f"{'max diff':>9} {'mean diff':>10} {'changed':>8}")
+    worst = 0.0
+    speedups = []
+    for width, height in sizes:
+        for name, snapshot in fixture_snapshots():
+            full_ms, full = render_ms(snapshot, (width, height), False, runs)
+            selective_ms, selective = render_ms(snapshot, (width, height), True, runs)
+            diff, max_diff, mean_diff, changed = compare(full, selective)
+            worst = max(worst, changed)
+            speedups.append(full_ms / selective_ms)
+            print(f"{name:<12} {f'{width}x{height}':>9} {full_ms:7.1f} {selective_ms:13.1f} "
+                  f"{full_ms / selective_ms:7.1f}x {max_diff:9} {mean_diff:10.2f} {changed:8.2%}")
+            if diff_dir:
+                path = os.path.join(diff_dir, f"{name.replace(' ', '_')}-{width}x{height}.png")
+                diff.point(lambda value: min(255, value * 8)).save(path)
+
+    print(f"\nMedian speedup {statistics.median(speedups):.1f}x; worst changed {worst:.2%} (limit {max_changed:.2f}%)")
+    if worst * 100 > max_changed:
+        print("Selective output differs from the 2x render by more than the limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
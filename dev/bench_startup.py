@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Cold-start budget check for the display generator and the SwiftBar plugin
+
+Runs each entry point's import in a fresh interpreter with `-X importtime`, reports
+the wall time and the heaviest imports, and exits non-zero if any target is exceeded.
+
+Usage:
+    python dev/bench_startup.py [--runs N]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, working directory, code that imports the entry point without running it, target ms)
+ENTRY_POINTS = [
+    ("mta_display", os.path.join(REPO_DIR, "mta-display"),
+     "import mta_display", 60),
+    ("swiftbar client", os.path.join(REPO_DIR, "swiftbar"),
+     "import runpy; runpy.run_path('greenpoint-transit.30s.py')", 40),
+    ("swiftbar fallback", os.path.join(REPO_DIR, "swiftbar"),
+     "import transit_menu", 400),
+]
+
+TOP_IMPORTS = 8
+
+
+def measure(cwd, code):
+    """Run one cold start; return (wall ms, {module: cumulative us}) for the top two import levels"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=cwd, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines look like: "import time:  self_us | cumulative_us |   package.module"
+    # Nesting is shown by two extra spaces of indentation per level
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:  # the entry point itself and what it imports directly
+            cumulative[name.strip()] = int(fields[1])
+    return wall_ms, cumulative
+
+
+def main():
+    runs = 5
+    if "--runs" in sys.argv:
+        runs = int(sys.argv[sys.argv.index("--runs") + 1])
+
+    # Interpreter start with no imports, subtracted so targets measure our code only
+    baseline_samples = [measure(REPO_DIR, "pass") for _ in range(runs)]
+    baseline = statistics.median(wall for wall, _ in baseline_samples)
+    interpreter_modules = set(baseline_samples[0][1])
+    print(f"Interpreter baseline: {baseline:.1f} ms (median of {runs})\n")
+
+    over_budget = False
+    for name, cwd, code, target_ms in ENTRY_POINTS:
+        try:
+            samples = [measure(cwd, code) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{name}: FAILED to import ({e})\n")
+            over_budget = True
+            continue
+
+        startup_ms = statistics.median(wall for wall, _ in samples) - baseline
+        status = "ok" if startup_ms <= target_ms else "OVER BUDGET"
+        over_budget |= startup_ms > target_ms
+        print(f"{name}: {startup_ms:.1f} ms over baseline (target {target_ms} ms) - {status}")
+
+        ours = {module: us for module, us in samples[-1][1].items() if module not in interpreter_modules}
+        heaviest = sorted(ours.items(), key=lambda item: item[1], reverse=True)
+        for module, cumulative_us in heaviest[:TOP_IMPORTS]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+        print()
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Deterministic display snapshots for the render benchmarks and soak test (no network)
+
+snapshot_at(when) builds the board as it would read at any time: G trains every few
+minutes in both directions, a 156-hour NWS-style forecast and fixed sunrise/sunset times,
+all derived from `when` alone. fixture_snapshots() adds the edge cases (stale sources,
+a single train, no data at all). feed_payload_at(when) encodes the same trains as a G
+GTFS-realtime feed, for exercising the decode path too.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mta-display"))
+from mta_display import EASTERN, DisplaySnapshot
+from weather_model import WeatherReport, build_hourly, condition_icon
+
+START = datetime(2026, 10, 19, 16, 7, tzinfo=EASTERN)
+HEADWAYS = (("Court Square", 9 * 60, 170), ("Church Ave", 11 * 60, 40))  # destination, headway, phase (s)
+CONDITIONS = ("Sunny", "Partly Cloudy", "Rain", "Mostly Cloudy")
+# G line stops from Church Ave to Court Sq; Greenpoint Av (G26) is the board's station
+G_STOPS = ("F27", "F26", "F25", "F24", "F23", "F22", "F21", "F20", "A42", "G36", "G35",
+           "G34", "G33", "G32", "G31", "G30", "G29", "G28", "G26", "G24", "G22")
+STOP_SECONDS = 120  # Running time between stops in the synthetic feed
+
+
+def trains_at(when, per_direction=2):
+    """The next trains in each direction, as get_all_trains rows"""
+    now_ts = when.timestamp()
+    rows = []
+    for destination, headway, phase in HEADWAYS:
+        arrival = now_ts - (now_ts - phase) % headway
+        for _ in range(per_direction):
+            arrival += headway
+            rows.append({'minutes': int((arrival - now_ts) / 60), 'destination': destination,
+                         'scheduled': False, 'arrival': arrival})
+    return rows
+
+
+def feed_payload_at(when, window=90 * 60):
+    """Serialized G feed as fetched at `when`: every trip due at Greenpoint Av within `window`
+    seconds (either way), with its remaining stops, on the same timetable as trains_at()"""
+    from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2, nyct_subway_pb2
+
+    now_ts = int(when.timestamp())
+    message = gtfs_realtime_pb2.FeedMessage()
+    message.header.gtfs_realtime_version = "1.0"
+    message.header.timestamp = now_ts
+    for (destination, headway, phase), direction in zip(HEADWAYS, "NS"):
+        stops = G_STOPS if direction == "N" else G_STOPS[::-1]
+        at_station = stops.index("G26")
+        first = now_ts - window - (now_ts - window - phase) % headway
+        for arrival in range(first, now_ts + window, headway):
+            trip_number = (arrival - phase) // headway
+            entity = message.entity.add()
+            entity.id = f"{direction}{trip_number}"
+            trip = entity.trip_update.trip
+            trip.trip_id = f"{trip_number % 100000:06d}_G..{direction}"
+            trip.route_id = "G"
+            trip.Extensions[nyct_subway_pb2.nyct_trip_descriptor].train_id = \
+                f"1G {trip_number % 10000:04d}+ {'CHU/CRS' if direction == 'N' else 'CRS/CHU'}"
+            for i, stop in enumerate(stops):
+                stop_ts = arrival + (i - at_station) * STOP_SECONDS
+                if stop_ts < now_ts - 60:
+                    continue  # Already passed
+                update = entity.trip_update.stop_time_update.add()
+                update.stop_id = stop + direction
+                update.arrival.time = stop_ts
+                update.departure.time = stop_ts + 30
+    return message.SerializeToString()
+
+
+def nws_periods(when, hours=156):
+    """Hourly NWS-style periods starting three hours before `when`"""
+    base = when.replace(minute=0, second=0, microsecond=0)
+    periods = []
+    for i in range(-3, hours - 3):
+        periods.append({'startTime': (base + timedelta(hours=i)).isoformat(),
+                        'temperature': 50 + (i * 7) % 13, 'shortForecast': CONDITIONS[i % len(CONDITIONS)]})
+    return periods
+
+
+def weather_at(when):
+    sunrise = when.replace(hour=7, minute=10, second=0, microsecond=0)
+    sunset = when.replace(hour=18, minute=20, second=0, microsecond=0)
+    hourly = build_hourly(nws_periods(when), when, sunrise.timestamp(), sunset.timestamp())
+    if sunrise <= when < sunset:
+        sun_icon, sun_time = 'sunset', sunset
+    else:
+        sun_icon, sun_time = 'sunrise', sunrise if when < sunrise else sunrise + timedelta(days=1)
+    condition = CONDITIONS[when.hour % len(CONDITIONS)]
+    sun_text = sun_time.strftime('%I:%M %p').lstrip('0')
+    return WeatherReport(f"{hourly[0].temp}°F {condition}", condition_icon(condition), sun_icon, sun_text,
+                         hourly, sunrise.timestamp(), sunset.timestamp())
+
+
+def snapshot_at(when, stale=()):
+    return DisplaySnapshot(trains_at(when), weather_at(when), when, stale)
+
+
+def fixture_snapshots():
+    """(name, snapshot) pairs covering the usual board and its edge cases"""
+    base = snapshot_at(START)
+    return [
+        ("afternoon", base),
+        ("night", snapshot_at(START.replace(hour=5, minute=52))),
+        ("stale", snapshot_at(START + timedelta(minutes=3), stale=('weather', 'trains'))),
+        ("one train", DisplaySnapshot(base.trains[:1], base.weather, START)),
+        ("no data", DisplaySnapshot([], None, START)),
+    ]
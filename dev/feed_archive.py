@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Record raw G and ferry GTFS-realtime snapshots into a compact, time-indexed archive
+
+Each source gets one segment per hour (by feed header timestamp):
+    archive/g/20261019T14.seg      records: [u32 length][u64 header timestamp][protobuf bytes]
+    archive/g/20261019T14.idx      sidecar: [u64 header timestamp][u64 offset] per record
+
+Identical snapshots (same bytes, or a header timestamp that hasn't moved) are skipped.
+Finished segments are compressed to .seg.xz with lzma - consecutive snapshots are nearly
+identical, so they shrink to a few percent of their raw size. The .idx stays uncompressed
+so any moment can be found with a bisect without decompressing anything.
+
+Usage:
+    python dev/feed_archive.py record [--interval 30] [--dir DIR]
+    python dev/feed_archive.py info [--dir DIR]
+    python dev/feed_archive.py at "2026-10-19 14:05" [--source g] [-o snapshot.pb] [--dir DIR]
+"""
+
+import bisect
+import hashlib
+import lzma
+import os
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+
+DEV_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The shared HTTP transport lives with the display generator
+sys.path.insert(0, os.path.join(DEV_DIR, "..", "mta-display"))
+import http_transport
+
+ARCHIVE_DIR = os.path.join(DEV_DIR, "archive")
+
+SOURCES = {
+    "g": "https://api-endpoint.mta.info/Dataservice/mtagtfsfeeds/nyct%2Fgtfs-g",
+    "ferry": "http://nycferry.connexionz.net/rtt/public/utility/gtfsrealtime.aspx/tripupdate",
+}
+
+RECORD_HEADER = struct.Struct("<IQ")  # payload length, header timestamp
+INDEX_ENTRY = struct.Struct("<QQ")  # header timestamp, record offset in the (uncompressed) segment
+SEGMENT_FORMAT = "%Y%m%dT%H"  # one segment per UTC hour
+LZMA_PRESET = 6  # preset 9 needs ~700 MB to compress; 6 is plenty for near-duplicate records
+
+
+def read_varint(data, pos):
+    """Decode a protobuf varint at data[pos]; return (value, next position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def header_timestamp(payload):
+    """Read FeedMessage.header.timestamp straight from the wire format (None if missing)
+
+    The header is field 1 of FeedMessage and comes first, so this avoids decoding the
+    whole feed just to file it.
+    """
+    try:
+        if not payload or payload[0] != 0x0A:  # field 1, length-delimited
+            return None
+        length, pos = read_varint(payload, 1)
+        end = pos + length
+        while pos < end:
+            tag, pos = read_varint(payload, pos)
+            field, wire_type = tag >> 3, tag & 7
+            if wire_type == 0:
+                value, pos = read_varint(payload, pos)
+                if field == 3:  # FeedHeader.timestamp
+                    return value
+            elif wire_type == 2:
+                size, pos = read_varint(payload, pos)
+                pos += size
+            elif wire_type == 1:
+                pos += 8
+            elif wire_type == 5:
+                pos += 4
+            else:
+                return None
+    except IndexError:
+        pass
+    return None
+
+
+def segment_name(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(SEGMENT_FORMAT)
+
+
+def segment_start(name):
+    return datetime.strptime(name, SEGMENT_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+def read_index(idx_path):
+    """Return (timestamps, offsets) lists from a sidecar index"""
+    with open(idx_path, "rb") as f:
+        data = f.read()
+    data = data[:len(data) - len(data) % INDEX_ENTRY.size]  # Drop a torn final entry
+    timestamps = []
+    offsets = []
+    for timestamp, offset in INDEX_ENTRY.iter_unpack(data):
+        timestamps.append(timestamp)
+        offsets.append(offset)
+    return timestamps, offsets
+
+
+class ArchiveWriter:
+    """Appends snapshots for one source, rotating and compressing hourly segments"""
+
+    def __init__(self, archive_dir, source):
+        self.dir = os.path.join(archive_dir, source)
+        os.makedirs(self.dir, exist_ok=True)
+        self.segment = None  # name of the open segment
+        self.seg_file = None
+        self.idx_file = None
+        self.last_hash = None
+        self.last_timestamp = 0
+        self.written = 0
+        self.skipped = 0
+        self._resume()
+
+    def _resume(self):
+        """Pick up the newest segment's last record so dedupe survives a restart"""
+        names = sorted(name[:-4] for name in os.listdir(self.dir) if name.endswith(".idx"))
+        if not names:
+            return
+        timestamps, offsets = read_index(os.path.join(self.dir, names[-1] + ".idx"))
+        if not timestamps:
+            return
+        self.last_timestamp = timestamps[-1]
+        raw_path = os.path.join(self.dir, names[-1] + ".seg")
+        if os.path.exists(raw_path):
+            with open(raw_path, "rb") as f:
+                f.seek(offsets[-1])
+                length, _ = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+                self.last_hash = hashlib.blake2b(f.read(length), digest_size=16).digest()
+
+    def _open(self, name):
+        self.close()
+        base = os.path.join(self.dir, name)
+        self.segment = name
+        self.seg_file = open(base + ".seg", "ab")
+        self.idx_file = open(base + ".idx", "ab")
+        compress_finished(self.dir, keep=name)
+
+    def append(self, payload, fetched_at=None):
+        """Store one snapshot; return False if it was a duplicate or older than the last one"""
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        timestamp = header_timestamp(payload) or int(fetched_at or time.time())
+        if digest == self.last_hash or timestamp <= self.last_timestamp:
+            self.skipped += 1
+            return False
+
+        name = segment_name(timestamp)
+        if name != self.segment:
+            self._open(name)
+
+        offset = self.seg_file.tell()
+        self.seg_file.write(RECORD_HEADER.pack(len(payload), timestamp))
+        self.seg_file.write(payload)
+        self.seg_file.flush()
+        # Index entry after the record, so a crash never indexes a half-written record
+        self.idx_file.write(INDEX_ENTRY.pack(timestamp, offset))
+        self.idx_file.flush()
+
+        self.last_hash = digest
+        self.last_timestamp = timestamp
+        self.written += 1
+        return True
+
+    def close(self):
+        if self.seg_file:
+            self.seg_file.close()
+            self.idx_file.close()
+        self.seg_file = self.idx_file = self.segment = None
+
+
+def compress_finished(source_dir, keep=None):
+    """Compress every raw segment except `keep` (the one still being written)"""
+    for name in sorted(os.listdir(source_dir)):
+        if not name.endswith(".seg") or name[:-4] == keep:
+            continue
+        raw_path = os.path.join(source_dir, name)
+        with open(raw_path, "rb") as f:
+            data = f.read()
+        tmp_path = raw_path + ".xz.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(lzma.compress(data, preset=LZMA_PRESET))
+        os.replace(tmp_path, raw_path + ".xz")
+        os.unlink(raw_path)
+
+
+class ArchiveReader:
+    """Time-ordered access to one source's snapshots"""
+
+    def __init__(self, archive_dir, source):
+        self.dir = os.path.join(archive_dir, source)
+        self.segments = sorted(name[:-4] for name in os.listdir(self.dir) if name.endswith(".idx")) \
+            if os.path.isdir(self.dir) else []
+        self._cached = (None, None)  # (segment name, decompressed bytes)
+
+    def index(self, name):
+        return read_index(os.path.join(self.dir, name + ".idx"))
+
+    def segment_data(self, name):
+        """Return a segment's raw bytes, decompressing (and caching the last one) if needed"""
+        if self._cached[0] == name:
+            return self._cached[1]
+        base = os.path.join(self.dir, name)
+        if os.path.exists(base + ".seg"):
+            with open(base + ".seg", "rb") as f:
+                data = f.read()
+        else:
+            with lzma.open(base + ".seg.xz") as f:
+                data = f.read()
+        self._cached = (name, data)
+        return data
+
+    def _record(self, data, offset):
+        length, timestamp = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        return timestamp, data[start:start + length]
+
+    def snapshot_at(self, timestamp):
+        """Return (header timestamp, payload) of the latest snapshot at or before timestamp, or None"""
+        # Segments are named by hour, so only the segment for that hour (or an earlier one) can match
+        pos = bisect.bisect_right(self.segments, segment_name(timestamp))
+        for name in reversed(self.segments[:pos]):
+            timestamps, offsets = self.index(name)
+            i = bisect.bisect_right(timestamps, timestamp)
+            if i:
+                return self._record(self.segment_data(name), offsets[i - 1])
+        return None
+
+    def iter_segment(self, name):
+        """Yield (header timestamp, payload) for every record in one segment"""
+        _timestamps, offsets = self.index(name)
+        data = self.segment_data(name)
+        for offset in offsets:
+            yield self._record(data, offset)
+
+    def iter_snapshots(self, start=None, end=None):
+        """Yield (header timestamp, payload) in time order, optionally limited to [start, end)"""
+        for name in self.segments:
+            seg_start = segment_start(name)
+            if end is not None and seg_start >= end:
+                break
+            if start is not None and seg_start + 3600 <= start:
+                continue
+            timestamps, offsets = self.index(name)
+            first = bisect.bisect_left(timestamps, start) if start is not None else 0
+            last = bisect.bisect_left(timestamps, end) if end is not None else len(timestamps)
+            if first >= last:
+                continue
+            data = self.segment_data(name)
+            for offset in offsets[first:last]:
+                yield self._record(data, offset)
+
+
+def record(archive_dir, interval):
+    writers = {source: ArchiveWriter(archive_dir, source) for source in SOURCES}
+    print(f"Recording {', '.join(SOURCES)} every {interval}s into {archive_dir}")
+    try:
+        while True:
+            started = time.time()
+            for source, url in SOURCES.items():
+                try:
+                    response = http_transport.get(url, timeout=10)
+                    if response.status_code != 200:
+                        print(f"{source}: HTTP {response.status_code}")
+                        continue
+                    writers[source].append(response.content, started)
+                except Exception as e:
+                    print(f"{source}: error fetching feed: {e}")
+            time.sleep(max(0, interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for source, writer in writers.items():
+            writer.close()
+            print(f"{source}: {writer.written} snapshots stored, {writer.skipped} duplicates skipped")
+
+
+def info(archive_dir):
+    for source in SOURCES:
+        reader = ArchiveReader(archive_dir, source)
+        if not reader.segments:
+            print(f"{source}: no segments")
+            continue
+        records = 0
+        raw_bytes = 0
+        stored_bytes = 0
+        for name in reader.segments:
+            timestamps, offsets = reader.index(name)
+            records += len(timestamps)
+            base = os.path.join(reader.dir, name)
+            if os.path.exists(base + ".seg"):
+                size = os.path.getsize(base + ".seg")
+                raw_bytes += size
+                stored_bytes += size
+            else:
+                stored_bytes += os.path.getsize(base + ".seg.xz")
+                raw_bytes += len(reader.segment_data(name))
+        first = datetime.fromtimestamp(segment_start(reader.segments[0]))
+        print(f"{source}: {records} snapshots in {len(reader.segments)} segments since {first:%Y-%m-%d %H:00}, "
+              f"{stored_bytes / 1024:.0f} KB on disk ({raw_bytes / 1024:.0f} KB raw)")
+
+
+def parse_when(value):
+    """Accept epoch seconds or a local 'YYYY-MM-DD HH:MM[:SS]' time"""
+    if value.isdigit():
+        return int(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("record", "info", "at"):
+        print(__doc__)
+        sys.exit(1)
+
+    archive_dir = ARCHIVE_DIR
+    if "--dir" in sys.argv:
+        archive_dir = sys.argv[sys.argv.index("--dir") + 1]
+
+    command = sys.argv[1]
+    if command == "record":
+        interval = 30
+        if "--interval" in sys.argv:
+            interval = float(sys.argv[sys.argv.index("--interval") + 1])
+        record(archive_dir, interval)
+    elif command == "info":
+        info(archive_dir)
+    else:
+        source = "g"
+        if "--source" in sys.argv:
+            source = sys.argv[sys.argv.index("--source") + 1]
+        found = ArchiveReader(archive_dir, source).snapshot_at(parse_when(sys.argv[2]))
+        if found is None:
+            print("No snapshot at or before that time")
+            sys.exit(1)
+        timestamp, payload = found
+        print(f"{source} snapshot from {datetime.fromtimestamp(timestamp)} ({len(payload)} bytes)")
+        if "-o" in sys.argv:
+            with open(sys.argv[sys.argv.index("-o") + 1], "wb") as f:
+                f.write(payload)
+
+
+if __name__ == "__main__":
+    main()
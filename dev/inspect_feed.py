@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Inspect the G or ferry GTFS-realtime feed
+
+Loads one snapshot, builds trip/stop/route indexes once, and answers queries from them.
+The raw snapshot and its index are cached in dev/.cache/, so repeated queries against the
+same snapshot don't download or parse anything.
+
+Usage:
+    python dev/inspect_feed.py [--feed g|ferry] [--from SOURCE] COMMAND [options]
+
+Sources (--from):
+    auto (default)      the cached snapshot if it is under a minute old, otherwise live
+    live                download now (and refresh the cache)
+    cache               the last downloaded snapshot, however old
+    PATH.pb             a saved snapshot, e.g. from `feed_archive.py at ... -o PATH.pb`
+    "archive:TIME"      the archived snapshot at TIME (epoch or "2026-10-19 14:05")
+
+Commands:
+    summary                      feed time and counts
+    stops                        every stop with its trip count and routes
+    routes                       routes with trip counts and a sample stop sequence
+    trips [--route R] [--stop S] trips with their remaining stops
+    trip TRIP_ID                 one trip's stop updates in detail
+    arrivals --stop S            arrivals/departures at a stop, soonest first
+    shell                        prompt for more commands against the same snapshot
+"""
+
+import hashlib
+import os
+import pickle
+import shlex
+import sys
+import time
+from datetime import datetime
+
+from feed_archive import SOURCES, ArchiveReader, ARCHIVE_DIR
+import http_transport  # on sys.path via feed_archive
+
+DEV_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DEV_DIR, ".cache")
+CACHE_MAX_AGE = 60  # seconds before --from auto fetches a new snapshot
+INDEX_VERSION = 1
+
+
+def stop_sort_key(stop_id):
+    """Ferry stops are numbers, subway stops are strings like G26N"""
+    return (0, int(stop_id), "") if stop_id.isdigit() else (1, 0, stop_id)
+
+
+class FeedIndex:
+    """Trips of one snapshot plus lookups by trip ID, stop and route
+
+    Each trip is (trip_id, route_id, start_date, stops) where stops is a list of
+    (stop_id, stop_sequence, arrival, departure, arrival delay) with None for missing fields.
+    """
+
+    def __init__(self, timestamp, trips):
+        self.timestamp = timestamp
+        self.trips = trips
+        self.by_trip_id = {}
+        self.by_route = {}
+        self.by_stop = {}  # stop_id -> [(time, trip index, position in the trip's stops)] sorted by time
+        for i, (trip_id, route_id, _start_date, stops) in enumerate(trips):
+            self.by_trip_id.setdefault(trip_id, []).append(i)
+            self.by_route.setdefault(route_id, []).append(i)
+            for position, (stop_id, _seq, arrival, departure, _delay) in enumerate(stops):
+                event_time = arrival if arrival is not None else departure
+                self.by_stop.setdefault(stop_id, []).append((event_time or 0, i, position))
+        for events in self.by_stop.values():
+            events.sort()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        # nyct_gtfs's compiled pb2 decodes both feeds and doesn't clash with google.transit's copy
+        from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2
+
+        message = gtfs_realtime_pb2.FeedMessage()
+        message.ParseFromString(payload)
+
+        trips = []
+        for entity in message.entity:
+            if not entity.HasField('trip_update'):
+                continue
+            trip = entity.trip_update
+            stops = []
+            for stop_time in trip.stop_time_update:
+                stops.append((
+                    stop_time.stop_id,
+                    stop_time.stop_sequence if stop_time.HasField('stop_sequence') else None,
+                    stop_time.arrival.time if stop_time.HasField('arrival') else None,
+                    stop_time.departure.time if stop_time.HasField('departure') else None,
+                    stop_time.arrival.delay if stop_time.arrival.HasField('delay') else None,
+                ))
+            stops.sort(key=lambda stop: stop[1] if stop[1] is not None else 0)
+            trips.append((
+                trip.trip.trip_id or "Unknown",
+                trip.trip.route_id or "Unknown",
+                trip.trip.start_date,
+                stops,
+            ))
+        return cls(message.header.timestamp, trips)
+
+
+def fetch_live(feed):
+    payload = http_transport.get_bytes(SOURCES[feed], timeout=10)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, f"{feed}.pb"), "wb") as f:
+        f.write(payload)
+    return payload
+
+
+def load_payload(feed, source):
+    """Return (raw snapshot bytes, description of where they came from)"""
+    cache_path = os.path.join(CACHE_DIR, f"{feed}.pb")
+    if source == "auto":
+        fresh = os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CACHE_MAX_AGE
+        source = "cache" if fresh else "live"
+
+    if source == "live":
+        return fetch_live(feed), "live"
+    if source == "cache":
+        with open(cache_path, "rb") as f:
+            return f.read(), f"cache ({time.time() - os.path.getmtime(cache_path):.0f}s old)"
+    if source.startswith("archive:"):
+        when = source[len("archive:"):]
+        timestamp = int(when) if when.isdigit() else datetime.fromisoformat(when).timestamp()
+        found = ArchiveReader(ARCHIVE_DIR, feed).snapshot_at(timestamp)
+        if found is None:
+            raise RuntimeError(f"No archived {feed} snapshot at or before {when}")
+        return found[1], "archive"
+    with open(source, "rb") as f:
+        return f.read(), source
+
+
+def load_index(feed, source):
+    """Load a snapshot and its index, reusing a cached index built from the same bytes"""
+    payload, origin = load_payload(feed, source)
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    index_path = os.path.join(CACHE_DIR, f"{feed}.index.pkl")
+
+    try:
+        with open(index_path, "rb") as f:
+            version, cached_digest, index = pickle.load(f)
+        if version == INDEX_VERSION and cached_digest == digest:
+            return index, origin
+    except (OSError, pickle.UnpicklingError, ValueError, EOFError, AttributeError):
+        pass
+
+    index = FeedIndex.from_bytes(payload)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(index_path, "wb") as f:
+        pickle.dump((INDEX_VERSION, digest, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return index, origin
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S") if timestamp else "-"
+
+
+def option(args, name):
+    return args[args.index(name) + 1] if name in args else None
+
+
+def show_summary(index, args):
+    print(f"Feed timestamp: {datetime.fromtimestamp(index.timestamp)}")
+    print(f"Trips: {len(index.trips)}  Stops: {len(index.by_stop)}  Routes: {len(index.by_route)}")
+
+
+def show_stops(index, args):
+    for stop_id in sorted(index.by_stop, key=stop_sort_key):
+        events = index.by_stop[stop_id]
+        routes = sorted({index.trips[i][1] for _, i, _ in events})
+        print(f"{stop_id:>8}  {len(events):3d} trips  routes: {', '.join(routes)}")
+
+
+def show_routes(index, args):
+    for route_id in sorted(index.by_route):
+        trip_ids = index.by_route[route_id]
+        longest = max(trip_ids, key=lambda i: len(index.trips[i][3]))
+        sample = " -> ".join(stop[0] for stop in index.trips[longest][3])
+        print(f"Route {route_id}: {len(trip_ids)} trips")
+        print(f"  Longest remaining stop sequence: {sample}")
+
+
+def show_trips(index, args):
+    route = option(args, "--route")
+    stop = option(args, "--stop")
+    if route is not None:
+        selected = index.by_route.get(route, [])
+    else:
+        selected = range(len(index.trips))
+    if stop is not None:
+        at_stop = {i for _, i, _ in index.by_stop.get(stop, [])}
+        selected = [i for i in selected if i in at_stop]
+
+    for i in selected:
+        trip_id, route_id, start_date, stops = index.trips[i]
+        times = " -> ".join(f"{stop_id}@{format_time(arrival or departure)[:5]}"
+                            for stop_id, _, arrival, departure, _ in stops)
+        print(f"Trip {trip_id} (Route: {route_id}, {start_date}, {len(stops)} stops)")
+        print(f"  {times}")
+    print(f"{len(selected)} trips")
+
+
+def show_trip(index, args):
+    if not args:
+        print("Usage: trip TRIP_ID")
+        return
+    matches = index.by_trip_id.get(args[0], [])
+    if not matches:
+        print(f"No trip {args[0]} in this snapshot")
+    for i in matches:
+        trip_id, route_id, start_date, stops = index.trips[i]
+        print(f"Trip {trip_id}  route={route_id}  start_date={start_date}")
+        for stop_id, seq, arrival, departure, delay in stops:
+            delay_text = f"  delay={delay}s" if delay is not None else ""
+            print(f"  {stop_id:>8} (seq={seq if seq is not None else '?'}): "
+                  f"arr={format_time(arrival)} dep={format_time(departure)}{delay_text}")
+
+
+def show_arrivals(index, args):
+    stop = option(args, "--stop")
+    if stop is None:
+        print("Usage: arrivals --stop STOP_ID")
+        return
+    events = index.by_stop.get(stop)
+    if not events:
+        print(f"Stop {stop} is not in this snapshot")
+        return
+    print(f"Arrivals at {stop} as of {format_time(index.timestamp)}:")
+    for _, i, position in events:
+        trip_id, route_id, _, stops = index.trips[i]
+        _, _, arrival, departure, delay = stops[position]
+        event_time = arrival if arrival is not None else departure
+        # Skipped stops (and any other update without a time) are listed first, without minutes
+        when = "skipped/no time" if event_time is None else f"{int((event_time - index.timestamp) / 60):4d} min"
+        delay_text = f"  delay={delay}s" if delay is not None else ""
+        print(f"  {when}  arr={format_time(arrival)} dep={format_time(departure)}  "
+              f"route={route_id} trip={trip_id}{delay_text}")
+
+
+COMMANDS = {
+    "summary": show_summary,
+    "stops": show_stops,
+    "routes": show_routes,
+    "trips": show_trips,
+    "trip": show_trip,
+    "arrivals": show_arrivals,
+}
+
+
+def shell(index):
+    print(f"Commands: {', '.join(COMMANDS)} (empty line or Ctrl-D to quit)")
+    while True:
+        try:
+            line = input("> ").strip()
+        except EOFError:
+            break
+        if not line:
+            break
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            print(f"Could not parse command: {e}")
+            continue
+        command = COMMANDS.get(args[0])
+        if command is None:
+            print(f"Unknown command: {args[0]}")
+            continue
+        command(index, args[1:])
+
+
+def main():
+    args = sys.argv[1:]
+    feed = option(args, "--feed") or "g"
+    source = option(args, "--from") or "auto"
+    for name in ("--feed", "--from"):
+        if name in args:
+            del args[args.index(name):args.index(name) + 2]
+
+    if not args or (args[0] not in COMMANDS and args[0] != "shell") or feed not in SOURCES:
+        print(__doc__)
+        sys.exit(1)
+
+    index, origin = load_index(feed, source)
+    print(f"{feed} feed from {origin}, generated {datetime.fromtimestamp(index.timestamp)}\n")
+    if args[0] == "shell":
+        shell(index)
+    else:
+        COMMANDS[args[0]](index, args[1:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Soak test: thousands of render cycles in one process, watching for memory growth
+
+A resident display generator decodes a feed, builds the hourly forecast and renders and
+encodes a frame every minute for weeks, so anything that leaks per cycle (PIL images,
+fonts, protobuf messages, forecast lists, caches without a bound) eventually exhausts a
+small device. This drives the real decode and render code in a loop on a fake clock:
+
+- Each cycle's G feed is a recorded snapshot (--feed files, or the feed archive in
+  dev/archive/), replayed at its own feed time, or a synthetic feed for a clock that
+  advances --step minutes per cycle (dev/display_fixtures.py). The weather is the
+  fixture forecast for the same time.
+- Trains go through mta_display.get_all_trains, and the frame through render_frame and
+  save_frame, as in a normal run.
+
+Every --interval cycles it records RSS and tracemalloc's traced size. Growth is measured
+from a baseline taken after --warmup cycles, once fonts, glyphs and tiles are cached. The
+default warmup is one simulated day, because the glyph atlas keeps each clock string it
+draws. It reports RSS over time, the RSS slope over the second half of the run, and the
+allocation sites that grew most. It exits non-zero if
+RSS goes past --ceiling-mb, or traced memory grows by more than --max-growth-kb. Pixel
+buffers are allocated by PIL outside Python's allocator, so only RSS sees those;
+--no-tracemalloc runs at full speed with RSS only.
+
+Usage:
+    python dev/soak_render.py [--cycles N] [--interval N] [--warmup N] [--ceiling-mb MB]
+                              [--max-growth-kb KB] [--top N] [--step MINUTES] [--no-tracemalloc]
+                              [--feed A.pb,B.pb | --archive DIR] [--selective] [--low-memory]
+                              [--strips N] [--grayscale] [--size WxH] [--encoding NAME]
+"""
+
+import contextlib
+import gc
+import io
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import display_fixtures
+import mta_display
+from frame_encoding import save_frame
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def option(name, convert=str):
+    return convert(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else None
+
+
+def rss_mb():
+    """Current resident set size in MB (the peak where the current size isn't available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return mta_display.peak_rss_mb()
+
+
+class ReplayFeed:
+    """Stands in for the G feed's DataSource: get() returns the payload of the current cycle"""
+
+    payload = b""
+
+    def get(self, fetch, key=None, **kwargs):
+        return self.payload, False
+
+
+def recorded_feeds():
+    """[(feed time, payload)] from --feed files or the archive; None means synthesize"""
+    from arrival_table import ArrivalTable
+
+    if option("--feed"):
+        feeds = []
+        for path in option("--feed").split(','):
+            with open(path, "rb") as f:
+                payload = f.read()
+            feeds.append((ArrivalTable.from_bytes(payload, stops=()).timestamp, payload))
+        return feeds
+
+    archive_dir = option("--archive") or ARCHIVE_DIR
+    if os.path.isdir(os.path.join(archive_dir, "g")):
+        from feed_archive import ArchiveReader
+
+        feeds = list(ArchiveReader(archive_dir, "g").iter_snapshots())
+        if feeds:
+            return feeds
+    return None
+
+
+def render_options():
+    size = option("--size")
+    return {
+        'rotate': False,
+        'grayscale': "--grayscale" in sys.argv,
+        'low_memory': "--low-memory" in sys.argv,
+        'strips': option("--strips", int) or 1,
+        'size': tuple(int(value) for value in size.split('x')) if size else None,
+        'selective': "--selective" in sys.argv,
+    }
+
+
+def top_growth(baseline, limit):
+    """Allocation sites that grew most since the baseline snapshot"""
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    current = tracemalloc.take_snapshot().filter_traces(filters)
+    # Grouped by whole traceback, so growth inside PIL can be traced back to our calling line
+    stats = current.compare_to(baseline.filter_traces(filters), 'traceback')
+    return [stat for stat in stats if stat.size_diff > 0][:limit]
+
+
+def location(frame):
+    return f"{os.path.relpath(frame.filename, REPO_DIR)}:{frame.lineno}"
+
+
+def print_growth(baseline, limit):
+    stats = top_growth(baseline, limit)
+    if not stats:
+        print("No allocation site grew since the baseline")
+        return
+    print(f"Top {len(stats)} growing allocation sites since the baseline:")
+    for stat in stats:
+        frames = list(stat.traceback)  # Oldest call first
+        line = f"  {stat.size_diff / 1024:+9.1f} KB {stat.count_diff:+7d} blocks  {location(frames[-1])}"
+        ours = next((frame for frame in reversed(frames) if frame.filename.startswith(REPO_DIR)), None)
+        if ours is not None and ours is not frames[-1]:
+            line += f"  (from {location(ours)})"
+        print(line)
+
+
+def main():
+    cycles = option("--cycles", int) or 3000
+    interval = option("--interval", int) or 250
+    step = timedelta(minutes=option("--step", float) or 1)
+    # By default, warm up for a simulated day (every clock string) or half the run if shorter
+    warmup = option("--warmup", int) or max(1, min(int(timedelta(days=1) / step), cycles // 2))
+    ceiling_mb = option("--ceiling-mb", float) or 200.0
+    max_growth_kb = option("--max-growth-kb", float)
+    top = option("--top", int) or 10
+    trace = "--no-tracemalloc" not in sys.argv
+    encoding = option("--encoding") or 'png'
+    options = render_options()
+
+    feeds = recorded_feeds()
+    print(f"Feed: {f'{len(feeds)} recorded snapshots' if feeds else 'synthetic'}; {cycles} cycles; "
+          f"options {options}; encoding {encoding}")
+    print(f"Warmup {warmup} cycles; RSS ceiling {ceiling_mb:.0f} MB"
+          + (f", traced growth limit {max_growth_kb:.0f} KB" if max_growth_kb else ""))
+
+    replay = ReplayFeed()
+    mta_display.G_FEED = replay  # get_all_trains reads the feed through this
+    with contextlib.redirect_stdout(io.StringIO()):
+        mta_display.prewarm_atlas(options['size'])  # As run_resident does at startup
+    if trace:
+        tracemalloc.start(25)
+
+    samples = []  # (cycle, fake time, RSS MB, traced MB)
+    baseline = None
+    baseline_traced = 0
+    failure = None
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "schedule.png")
+        for cycle in range(1, cycles + 1):
+            if feeds:
+                feed_ts, replay.payload = feeds[(cycle - 1) % len(feeds)]
+                when = datetime.fromtimestamp(feed_ts, mta_display.EASTERN)
+            else:
+                when = display_fixtures.START + (cycle - 1) * step
+                replay.payload = display_fixtures.feed_payload_at(when)
+
+            with contextlib.redirect_stdout(io.StringIO()):  # Font and section chatter every cycle
+                trains = mta_display.get_all_trains(limit=4, now=when)
+                snapshot = mta_display.DisplaySnapshot(trains, display_fixtures.weather_at(when), when)
+                img = mta_display.render_frame(snapshot, **options)
+                save_frame(img, output_path, encoding)
+            del img, snapshot, trains
+
+            if cycle == warmup and trace:
+                gc.collect()
+                baseline = tracemalloc.take_snapshot()
+                baseline_traced = tracemalloc.get_traced_memory()[0]
+            if cycle % interval == 0 or cycle == cycles:
+                gc.collect()
+                rss = rss_mb()
+                traced = tracemalloc.get_traced_memory()[0] if trace else None
+                samples.append((cycle, when, rss, traced))
+                line = f"cycle {cycle:6d}  {when:%Y-%m-%d %H:%M}  RSS {rss:7.1f} MB"
+                if trace:
+                    line += f"  traced {traced / (1024 * 1024):7.2f} MB"
+                    if baseline is not None:
+                        growth_kb = (traced - baseline_traced) / 1024
+                        line += f" ({growth_kb:+.0f} KB since warmup)"
+                        if max_growth_kb is not None and growth_kb > max_growth_kb:
+                            failure = f"traced memory grew {growth_kb:.0f} KB since warmup (limit {max_growth_kb:.0f} KB)"
+                print(line + f"  {(time.perf_counter() - start) / cycle * 1000:.0f} ms/cycle", flush=True)
+                if rss is not None and rss > ceiling_mb:
+                    failure = f"RSS {rss:.1f} MB is over the {ceiling_mb:.0f} MB ceiling"
+                if failure:
+                    break
+
+    measured = [sample for sample in samples if sample[0] >= warmup]
+    if len(measured) >= 2 and measured[0][2] is not None:
+        # A leak keeps growing after the caches have filled, so the slope is taken late in the run
+        late = [sample for sample in measured if sample[0] >= (measured[0][0] + measured[-1][0]) / 2]
+        if len(late) < 2:
+            late = measured[-2:]
+        per_1000 = (late[-1][2] - late[0][2]) / (late[-1][0] - late[0][0]) * 1000
+        print(f"\nRSS after warmup {measured[0][2]:.1f} MB, at the end {measured[-1][2]:.1f} MB, "
+              f"peak {max(sample[2] for sample in samples):.1f} MB; "
+              f"{per_1000:+.2f} MB per 1000 cycles over the second half")
+    if baseline is not None:
+        print_growth(baseline, top)
+    if platform.system() != 'Linux':
+        print("(RSS is the process peak on this platform)")
+
+    if failure:
+        print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Range filtering in analyze_archive.py, on a small synthetic ferry archive
+
+    python -m unittest discover -s dev
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from analyze_archive import analyze_segment
+from feed_archive import ArchiveWriter, segment_name
+
+from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2
+
+HOUR = datetime(2026, 10, 1, 8, tzinfo=timezone.utc).timestamp()
+
+
+def ferry_snapshot(timestamp):
+    """A feed with one trip calling at the Greenpoint landing ten minutes after `timestamp`"""
+    message = gtfs_realtime_pb2.FeedMessage()
+    message.header.gtfs_realtime_version = "2.0"
+    message.header.timestamp = int(timestamp)
+    entity = message.entity.add(id="1")
+    entity.trip_update.trip.trip_id = "ER-1"
+    entity.trip_update.trip.start_date = "20261001"
+    stop_time = entity.trip_update.stop_time_update.add(stop_id="18")
+    stop_time.arrival.time = int(timestamp) + 600
+    return message.SerializeToString()
+
+
+class SegmentRangeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive_dir = self.tmp.name
+        writer = ArchiveWriter(self.archive_dir, "ferry")
+        for minute in (0, 15, 30, 45):  # Four snapshots in the 08:00 segment
+            writer.append(ferry_snapshot(HOUR + minute * 60))
+        writer.close()
+        self.name = segment_name(HOUR)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def snapshots(self, since=None, until=None):
+        return analyze_segment(self.archive_dir, "ferry", self.name, since, until)[1]
+
+    def test_whole_segment(self):
+        self.assertEqual(self.snapshots(), 4)
+
+    def test_since_inside_segment(self):
+        self.assertEqual(self.snapshots(since=HOUR + 30 * 60), 2)
+
+    def test_until_inside_segment(self):
+        self.assertEqual(self.snapshots(until=HOUR + 30 * 60), 2)
+
+    def test_range_inside_segment(self):
+        trips, snapshots = analyze_segment(self.archive_dir, "ferry", self.name, HOUR + 10 * 60, HOUR + 40 * 60)
+        self.assertEqual(snapshots, 2)
+        (observation,) = trips.values()
+        self.assertEqual(observation.first_ts, HOUR + 15 * 60)
+        self.assertEqual(observation.last_ts, HOUR + 30 * 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Lean GTFS-realtime decode into array-backed arrival columns
+Decodes the protobuf straight into one row per (trip, stop) instead of building nyct_gtfs
+Trip/StopTimeUpdate objects and datetimes for every stop of every trip. Rows are sorted by
+(stop, arrival), so a stop's arrivals are one contiguous slice and "next N trains after now"
+is a bisect plus a slice.
+
+    table = ArrivalTable.from_bytes(payload, stops={"G26N", "G26S"})
+    for minutes, arrival_ts, trip in table.upcoming("G26N", now_ts, limit=2):
+        ...
+"""
+
+from array import array
+from bisect import bisect_right
+
+MISSING = -1  # arrival/departure column value when the feed has no such time
+
+
+class ArrivalTable:
+    """Arrivals of one feed snapshot in parallel columns
+
+    stop_codes/trip_ids hold each distinct stop and trip once; the row columns refer to them
+    by index. stop_rows maps a stop index to its (start, end) row slice.
+    """
+
+    def __init__(self, timestamp=0):
+        self.timestamp = timestamp
+        self.stop_codes = []  # stop index -> stop ID
+        self.stop_index = {}  # stop ID -> stop index
+        self.trip_ids = []  # trip index -> trip ID
+        self.trip_start_dates = []  # trip index -> start date (YYYYMMDD); trip IDs repeat daily
+        self.trip_last_stop = array('i')  # trip index -> stop index of the last stop in the update
+        self.stop = array('i')  # row -> stop index
+        self.trip = array('i')  # row -> trip index
+        self.arrival = array('q')  # row -> epoch seconds or MISSING
+        self.departure = array('q')  # row -> epoch seconds or MISSING
+        self.stop_rows = {}
+
+    def intern_stop(self, stop_id):
+        index = self.stop_index.get(stop_id)
+        if index is None:
+            index = self.stop_index[stop_id] = len(self.stop_codes)
+            self.stop_codes.append(stop_id)
+        return index
+
+    @classmethod
+    def from_bytes(cls, payload, stops=None):
+        """Decode a raw GTFS-realtime FeedMessage, keeping only rows for `stops` (all stops if None)"""
+        # nyct_gtfs's compiled pb2 decodes any GTFS-realtime feed and doesn't clash with google.transit's
+        from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2, nyct_subway_pb2
+
+        message = gtfs_realtime_pb2.FeedMessage()
+        message.ParseFromString(payload)
+        table = cls(message.header.timestamp)
+
+        # A trip can be repeated in one snapshot; like nyct_gtfs, the last update for it wins
+        trip_updates = {}
+        for entity in message.entity:
+            if entity.HasField('trip_update'):
+                descriptor = entity.trip_update.trip
+                train_id = descriptor.Extensions[nyct_subway_pb2.nyct_trip_descriptor].train_id
+                trip_updates[descriptor.trip_id + " " + train_id[-7:]] = entity.trip_update
+
+        rows = []
+        for trip_update in trip_updates.values():
+            updates = trip_update.stop_time_update
+            if not updates:
+                continue
+            trip = len(table.trip_ids)
+            table.trip_ids.append(trip_update.trip.trip_id)
+            table.trip_start_dates.append(trip_update.trip.start_date)
+            table.trip_last_stop.append(table.intern_stop(updates[-1].stop_id))
+            seen = set()
+            for stop_time in updates:
+                stop_id = stop_time.stop_id
+                if (stops is not None and stop_id not in stops) or stop_id in seen:
+                    continue  # Only the first update per stop counts, as in feed_extract
+                has_arrival = stop_time.HasField('arrival')
+                if has_arrival:
+                    seen.add(stop_id)
+                rows.append((table.intern_stop(stop_id),
+                             stop_time.arrival.time if has_arrival else MISSING,
+                             trip,
+                             stop_time.departure.time if stop_time.HasField('departure') else MISSING))
+
+        rows.sort()
+        for row, (stop, arrival, trip, departure) in enumerate(rows):
+            table.stop.append(stop)
+            table.arrival.append(arrival)
+            table.trip.append(trip)
+            table.departure.append(departure)
+            start, _ = table.stop_rows.get(stop, (row, row))
+            table.stop_rows[stop] = (start, row + 1)
+        return table
+
+    def upcoming(self, stop_id, now_ts, limit=None):
+        """(whole minutes away, arrival epoch, trip index) of arrivals at stop_id, soonest first
+
+        Minutes are truncated toward zero (like the nyct_gtfs-based code this replaced), so an
+        arrival up to a minute ago still shows as 0.
+        """
+        stop = self.stop_index.get(stop_id)
+        if stop is None or stop not in self.stop_rows:
+            return []
+        start, end = self.stop_rows[stop]
+        # int((arrival - now) / 60) >= 0  <=>  arrival > now - 60; MISSING sorts first and is skipped
+        first = bisect_right(self.arrival, now_ts - 60, start, end)
+        if limit is not None:
+            end = min(end, first + limit)
+        return [(int((self.arrival[row] - now_ts) / 60), self.arrival[row], self.trip[row])
+                for row in range(first, end)]
+
+    def destination(self, trip):
+        """Stop ID of the last stop in a trip's update"""
+        return self.stop_codes[self.trip_last_stop[trip]]
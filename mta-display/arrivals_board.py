@@ -0,0 +1,213 @@
+"""
+Shared-memory arrivals board: one producer decodes the G feed, any local process reads it
+The resident display generator (mta_display.py --resident) publishes the train rows it draws
+into a named shared memory segment after each refresh. The SwiftBar plugin and helper, and
+ad-hoc scripts, read that instead of fetching and decoding the feed themselves:
+
+    board = read_board()            # None if no producer is running (or it's unreadable)
+    for minutes, arrival_ts, destination in board.upcoming("G26N", time.time(), limit=3):
+        ...
+
+    python arrivals_board.py        # print the current board
+
+The segment has a fixed layout (little-endian), so a read is a copy and struct unpacking:
+
+    offset 0   magic b"MTAB", LAYOUT_VERSION (H), row capacity (H)
+    offset 8   sequence (Q): odd while the producer is writing, +2 per publish
+    offset 16  published_at (d), source_ts (d, the feed's own timestamp), row count (H),
+               2 pad bytes, CRC-32 of the rows (I)
+    offset 40  MAX_ROWS rows of stop ID (8s), arrival epoch (d), destination (32s, UTF-8,
+               NUL-padded) and scheduled (B)
+
+Readers take no lock (a seqlock): they read the sequence, copy the segment, and read the
+sequence again. An odd or changed sequence means a publish was in progress, so they retry.
+The CRC also catches a torn copy on CPUs that may reorder the producer's stores (Python has
+no memory barriers). Readers never write to the segment (on Linux they map it read-only), so
+any number of them cost the producer nothing.
+
+POSIX only (macOS, Linux). The producer removes the segment when it exits, and readers
+then get None and fall back to fetching.
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+
+BOARD_NAME = os.environ.get("GREENPOINT_ARRIVALS_BOARD", "greenpoint-arrivals")
+MAGIC = b"MTAB"
+LAYOUT_VERSION = 1
+MAX_ROWS = 32
+READ_ATTEMPTS = 100  # seqlock retries before a reader gives up on this read
+
+HEADER = struct.Struct("<4sHH")
+SEQUENCE = struct.Struct("<Q")
+META = struct.Struct("<ddHxxI")
+ROW = struct.Struct("<8sd32sB")
+SEQUENCE_OFFSET = HEADER.size
+META_OFFSET = SEQUENCE_OFFSET + SEQUENCE.size
+ROWS_OFFSET = META_OFFSET + META.size
+SEGMENT_SIZE = ROWS_OFFSET + MAX_ROWS * ROW.size
+
+
+class BoardSnapshot:
+    """One consistent read of the board
+
+    rows are (stop ID, arrival epoch, destination, scheduled), in the order published;
+    sequence increases with every publish.
+    """
+
+    def __init__(self, sequence, published_at, source_ts, rows):
+        self.sequence = sequence
+        self.published_at = published_at
+        self.source_ts = source_ts
+        self.rows = rows
+
+    def upcoming(self, stop_id, now_ts, limit=None):
+        """(whole minutes away, arrival epoch, destination) at stop_id, soonest first
+
+        Rows are chosen and minutes truncated as in LiveArrivals.upcoming.
+        """
+        arrivals = sorted((arrival, destination) for stop, arrival, destination, _ in self.rows
+                          if stop == stop_id and arrival > now_ts - 60)
+        return [(int((arrival - now_ts) / 60), arrival, destination) for arrival, destination in arrivals[:limit]]
+
+
+class BoardWriter:
+    """The producer's side: creates the segment (or takes over one left behind) and publishes rows"""
+
+    def __init__(self, name=BOARD_NAME):
+        from multiprocessing import shared_memory
+
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            # Left by a producer that didn't exit cleanly; readers may still have it mapped
+            self.shm = shared_memory.SharedMemory(name)
+            if self.shm.size < SEGMENT_SIZE:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = shared_memory.SharedMemory(name, create=True, size=SEGMENT_SIZE)
+        buf = self.shm.buf
+        (self.sequence,) = SEQUENCE.unpack_from(buf, SEQUENCE_OFFSET)
+        self.sequence += self.sequence & 1  # Odd if the last producer died mid-publish
+        HEADER.pack_into(buf, 0, MAGIC, LAYOUT_VERSION, MAX_ROWS)
+
+    def publish(self, rows, source_ts):
+        """Replace the board with rows of (stop ID, arrival epoch, destination, scheduled)
+
+        Rows past MAX_ROWS are dropped, and destinations are cut to 32 bytes.
+        """
+        rows = rows[:MAX_ROWS]
+        data = b"".join(ROW.pack(stop_id.encode(), arrival, destination.encode()[:32], bool(scheduled))
+                        for stop_id, arrival, destination, scheduled in rows)
+        buf = self.shm.buf
+        SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, self.sequence + 1)  # Odd: readers retry
+        buf[ROWS_OFFSET:ROWS_OFFSET + len(data)] = data
+        META.pack_into(buf, META_OFFSET, time.time(), source_ts, len(rows), zlib.crc32(data))
+        self.sequence += 2
+        SEQUENCE.pack_into(buf, SEQUENCE_OFFSET, self.sequence)
+
+    def close(self):
+        """Remove the board; readers then get None"""
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _map_fd(fd):
+    """Read-only mapping of an open segment (closes fd), or None if it is too small"""
+    import mmap
+
+    try:
+        if os.fstat(fd).st_size < SEGMENT_SIZE:
+            return None
+        mapping = mmap.mmap(fd, SEGMENT_SIZE, prot=mmap.PROT_READ)
+        return mapping, mapping.close
+    finally:
+        os.close(fd)
+
+
+def _map_board(name):
+    """(buffer over the segment, function that releases it), or None if there is none
+
+    Readers must not register the segment with multiprocessing's resource tracker, which would
+    remove it when they exit. On Linux POSIX shared memory is a file under /dev/shm, so it is
+    opened and mapped read-only directly; elsewhere (macOS) SharedMemory(track=False) does it
+    on Python 3.13+. Older Pythons fall back to CPython's private _posixshmem, if present.
+    """
+    if os.path.isdir("/dev/shm"):
+        try:
+            return _map_fd(os.open(os.path.join("/dev/shm", name), os.O_RDONLY))
+        except OSError:
+            return None
+    if sys.version_info >= (3, 13):
+        from multiprocessing import shared_memory
+
+        try:
+            shm = shared_memory.SharedMemory(name, track=False)
+        except OSError:
+            return None
+        if shm.size < SEGMENT_SIZE:
+            shm.close()
+            return None
+        return shm.buf, shm.close
+    try:
+        import _posixshmem
+    except ImportError:
+        return None
+    try:
+        return _map_fd(_posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0))
+    except OSError:
+        return None
+
+
+def read_board(name=BOARD_NAME):
+    """The current BoardSnapshot, or None if nothing has been published (or it can't be read)"""
+    mapped = _map_board(name)
+    if mapped is None:
+        return None
+    mapping, release = mapped
+    try:
+        magic, version, capacity = HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != LAYOUT_VERSION or capacity != MAX_ROWS:
+            return None
+        for _ in range(READ_ATTEMPTS):
+            (before,) = SEQUENCE.unpack_from(mapping, SEQUENCE_OFFSET)
+            if before & 1:
+                time.sleep(0.0001)  # A publish is in progress
+                continue
+            data = bytes(mapping[META_OFFSET:SEGMENT_SIZE])  # A copy, even from a memoryview
+            (after,) = SEQUENCE.unpack_from(mapping, SEQUENCE_OFFSET)
+            if before != after:
+                continue
+            if before == 0:
+                return None  # Created, but nothing published yet
+            published_at, source_ts, count, crc = META.unpack_from(data)
+            rows = data[META.size:META.size + count * ROW.size]
+            if count > MAX_ROWS or zlib.crc32(rows) != crc:
+                continue
+            return BoardSnapshot(before, published_at, source_ts,
+                                 [(stop_id.rstrip(b"\0").decode(), arrival,
+                                   destination.rstrip(b"\0").decode("utf-8", "ignore"), bool(scheduled))
+                                  for stop_id, arrival, destination, scheduled in ROW.iter_unpack(rows)])
+        return None
+    finally:
+        release()
+
+
+if __name__ == "__main__":
+    board = read_board()
+    if board is None:
+        print(f"No arrivals board published as {BOARD_NAME} (is mta_display.py --resident running?)")
+        sys.exit(1)
+    now_ts = time.time()
+    print(f"Board #{board.sequence // 2}: published {now_ts - board.published_at:.0f}s ago, "
+          f"feed from {now_ts - board.source_ts:.0f}s ago")
+    for stop_id, arrival, destination, scheduled in sorted(board.rows):
+        if arrival > now_ts - 60:
+            print(f"  {stop_id:<6} {int((arrival - now_ts) / 60):>3} min  {destination}"
+                  + (" (scheduled)" if scheduled else ""))
@@ -0,0 +1,137 @@
+"""
+Incremental G feed decode: apply each snapshot as a diff against the previous one
+Successive snapshots differ in only a few trips. LiveArrivals remembers every trip by its key
+(trip_id plus the train ID's origin time, as in arrival_table.py) and a digest of its
+serialized TripUpdate. On each update only added, removed and changed trips are decoded and
+moved in the per-stop arrival indexes. Unchanged trips cost one serialize and one hash, both
+in C, and an unchanged payload costs nothing. Rows follow the same rules as
+ArrivalTable.from_bytes, and upcoming()/destination() have the same signatures, so either
+can back the board.
+
+    G_ARRIVALS = LiveArrivals(stops={"G26N", "G26S"})   # kept for the life of the process
+    diff = G_ARRIVALS.update(payload)                   # e.g. FeedDiff(+1 -1 ~3)
+    for minutes, arrival_ts, trip in G_ARRIVALS.upcoming("G26N", now_ts, limit=2):
+        ...
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class FeedDiff:
+    """Trip keys added, removed and changed by one update (false if nothing changed)"""
+
+    def __init__(self, added=(), removed=(), changed=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"FeedDiff(+{len(self.added)} -{len(self.removed)} ~{len(self.changed)})"
+
+
+class LiveArrivals:
+    """Arrivals at `stops` (every stop if None), kept up to date from successive feed snapshots
+
+    trips maps a trip key to (digest, stop ID of its last stop, [(stop ID, arrival)]). Each
+    stop's arrivals are two parallel sorted lists, times and trip keys, so "next N trains
+    after now" is a bisect plus a slice, and moving one trip is a bisect and an insert or
+    delete per stop it calls at.
+    """
+
+    def __init__(self, stops=None):
+        self.stops = None if stops is None else frozenset(stops)
+        self.timestamp = 0
+        self.payload = None  # Last payload applied, to skip an unchanged (e.g. cached) feed
+        self.trips = {}
+        self.times = {}  # stop ID -> sorted arrival epochs
+        self.keys = {}  # stop ID -> trip key of each arrival in times
+
+    def update(self, payload):
+        """Apply a raw GTFS-realtime FeedMessage and return what changed since the last one"""
+        if payload == self.payload:
+            return FeedDiff()
+        # nyct_gtfs's compiled pb2 decodes any GTFS-realtime feed and doesn't clash with google.transit's
+        from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2, nyct_subway_pb2
+        from hashlib import blake2b
+
+        message = gtfs_realtime_pb2.FeedMessage()
+        message.ParseFromString(payload)
+
+        # A trip can be repeated in one snapshot; like nyct_gtfs, the last update for it wins
+        current = {}
+        for entity in message.entity:
+            if entity.HasField('trip_update') and entity.trip_update.stop_time_update:
+                descriptor = entity.trip_update.trip
+                train_id = descriptor.Extensions[nyct_subway_pb2.nyct_trip_descriptor].train_id
+                current[descriptor.trip_id + " " + train_id[-7:]] = entity.trip_update
+
+        # Everything that can fail (parsing) is done; from here the indexes change together
+        diff = FeedDiff(removed=self.trips.keys() - current.keys())
+        for key, trip_update in current.items():
+            # The descriptor is fixed for a key, so the digest changes when the stop updates do
+            digest = blake2b(trip_update.SerializeToString(), digest_size=8).digest()
+            known = self.trips.get(key)
+            if known is None:
+                diff.added.append(key)
+            elif known[0] != digest:
+                diff.changed.append(key)
+            else:
+                continue
+            if known is not None:
+                self._unindex(key)
+            self._index(key, digest, trip_update)
+        for key in diff.removed:
+            self._unindex(key)
+            del self.trips[key]
+
+        self.timestamp = message.header.timestamp
+        self.payload = payload
+        return diff
+
+    def _index(self, key, digest, trip_update):
+        rows = []
+        seen = set()
+        for stop_time in trip_update.stop_time_update:
+            stop_id = stop_time.stop_id
+            if (self.stops is not None and stop_id not in self.stops) or stop_id in seen:
+                continue
+            # Only the first update with an arrival counts per stop, as in ArrivalTable.from_bytes;
+            # updates without one never show as upcoming, so they aren't indexed
+            if stop_time.HasField('arrival'):
+                seen.add(stop_id)
+                rows.append((stop_id, stop_time.arrival.time))
+        self.trips[key] = (digest, trip_update.stop_time_update[-1].stop_id, rows)
+
+        for stop_id, arrival in rows:
+            times = self.times.setdefault(stop_id, [])
+            row = bisect_right(times, arrival)
+            times.insert(row, arrival)
+            self.keys.setdefault(stop_id, []).insert(row, key)
+
+    def _unindex(self, key):
+        for stop_id, arrival in self.trips[key][2]:
+            times, keys = self.times[stop_id], self.keys[stop_id]
+            row = bisect_left(times, arrival)
+            while keys[row] != key:  # Other trips due at the same second
+                row += 1
+            del times[row], keys[row]
+
+    def upcoming(self, stop_id, now_ts, limit=None):
+        """(whole minutes away, arrival epoch, trip key) of arrivals at stop_id, soonest first
+
+        Minutes are truncated toward zero, as in ArrivalTable.upcoming.
+        """
+        times = self.times.get(stop_id)
+        if not times:
+            return []
+        first = bisect_right(times, now_ts - 60)
+        end = len(times) if limit is None else min(len(times), first + limit)
+        keys = self.keys[stop_id]
+        return [(int((times[row] - now_ts) / 60), times[row], keys[row]) for row in range(first, end)]
+
+    def destination(self, trip):
+        """Stop ID of the last stop in a trip's update"""
+        return self.trips[trip][1]
@@ -0,0 +1,44 @@
+"""
+Ferry stop extraction shared by the SwiftBar ferry plugin and dev/analyze_archive.py
+(the subway feed is decoded with arrival_table.py / feed_diff.py everywhere, archive included)
+Works on already-decoded feeds, so callers decide where the data comes from (live or archived).
+"""
+
+
+def stop_time_events(feed_message, stop_id):
+    """Yield (trip_update, arrival epoch or None, departure epoch or None) for every update at stop_id
+
+    Takes a raw GTFS-realtime FeedMessage from any generated gtfs_realtime_pb2 module
+    (google.transit's or nyct_gtfs's), so it works on either side of the protobuf conflict.
+    """
+    for entity in feed_message.entity:
+        if not entity.HasField('trip_update'):
+            continue
+        trip = entity.trip_update
+        for stop_time in trip.stop_time_update:
+            if stop_time.stop_id != stop_id:
+                continue
+            arrival = stop_time.arrival.time if stop_time.HasField('arrival') else None
+            departure = stop_time.departure.time if stop_time.HasField('departure') else None
+            if arrival is None and departure is None:
+                continue
+            yield trip, arrival, departure
+
+
+def boarding_time(arrival, departure):
+    """Time a rider cares about at a ferry stop
+
+    Prefer departure time (when ferry leaves) over arrival time (when it arrives) -
+    if the ferry is at the stop, departure is in the future and more useful
+    """
+    return departure if departure is not None else arrival
+
+
+def upcoming_departure_minutes(feed_message, stop_id, now_ts):
+    """Whole minutes until each future departure at stop_id in a raw FeedMessage, soonest first"""
+    minutes = []
+    for _trip, arrival, departure in stop_time_events(feed_message, stop_id):
+        minutes_away = int((boarding_time(arrival, departure) - now_ts) / 60)
+        if minutes_away >= 0:
+            minutes.append(minutes_away)
+    return sorted(minutes)
@@ -0,0 +1,102 @@
+"""
+Output encodings for the rendered frame
+The Kindle's panel shows 16 gray levels, so an 8-bit RGB PNG carries far more than it can
+display and costs transfer and decode time on every refresh. The encodings:
+
+    png            Pillow's default PNG of the frame as rendered (RGB, or L when grayscale)
+    png-palette16  16-entry gray palette PNG, 4 bits per pixel
+    png-gray4      4-bit grayscale PNG (color type 0), for viewers that handle palettes poorly
+    pgm            Uncompressed 8-bit binary PGM: largest file, next to no decode work
+
+Every PNG encoding takes a zlib compress level (0-9) and strategy (see STRATEGIES).
+dev/bench_encoding.py compares them on size, encode time and decode time.
+"""
+
+import struct
+import zlib
+
+ENCODINGS = ('png', 'png-palette16', 'png-gray4', 'pgm')
+STRATEGIES = {
+    'default': zlib.Z_DEFAULT_STRATEGY,
+    'filtered': zlib.Z_FILTERED,
+    'huffman': zlib.Z_HUFFMAN_ONLY,
+    'rle': zlib.Z_RLE,
+    'fixed': zlib.Z_FIXED,
+}
+EXTENSIONS = {'pgm': '.pgm'}  # everything else is .png
+
+# Nearest of the 16 evenly spaced gray levels (0, 17, ..., 255), as a palette index
+GRAY16_LUT = [(value * 15 + 127) // 255 for value in range(256)]
+GRAY16_PALETTE = [level * 17 for level in range(16) for _ in range(3)]
+
+
+def gray16(img):
+    """Frame as a 'P' image whose palette index is the gray level (0-15)"""
+    from PIL import Image
+
+    gray = img if img.mode == 'L' else img.convert('L')
+    indexed = Image.frombytes('P', gray.size, gray.point(GRAY16_LUT).tobytes())
+    indexed.putpalette(GRAY16_PALETTE)
+    return indexed
+
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def write_png_gray4(indexed, fp, compress_level=None, strategy=None):
+    """Write a gray16() image as a 4-bit grayscale PNG (Pillow only writes 4 bits for palettes)"""
+    width, height = indexed.size
+    packed = indexed.tobytes('raw', 'P;4')  # two pixels per byte, high nibble first, rows byte-aligned
+    stride = (width + 1) // 2
+    # Filter type 0 on every row: low bit depths compress best unfiltered (as Pillow does for palettes)
+    rows = b''.join(b'\x00' + packed[y * stride:(y + 1) * stride] for y in range(height))
+    compressor = zlib.compressobj(-1 if compress_level is None else compress_level, zlib.DEFLATED,
+                                  zlib.MAX_WBITS, 9, STRATEGIES[strategy or 'default'])
+    fp.write(b'\x89PNG\r\n\x1a\n')
+    fp.write(png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 4, 0, 0, 0, 0)))
+    fp.write(png_chunk(b'IDAT', compressor.compress(rows) + compressor.flush()))
+    fp.write(png_chunk(b'IEND', b''))
+
+
+def output_path_for(path, encoding):
+    """Swap a .png path's extension for the encoding's own (schedule.png -> schedule.pgm)"""
+    extension = EXTENSIONS.get(encoding, '.png')
+    if path.endswith('.png') and extension != '.png':
+        return path[:-len('.png')] + extension
+    return path
+
+
+def save_frame(img, path, encoding='png', compress_level=None, strategy=None):
+    """Save a rendered frame in the given encoding; returns the path written
+
+    Args:
+        img: Rendered frame (RGB or L)
+        path: Output path; a .png extension is swapped for non-PNG encodings
+        encoding: One of ENCODINGS
+        compress_level: zlib level 0-9 for PNG encodings (None = Pillow/zlib default)
+        strategy: Key of STRATEGIES for PNG encodings (None = default)
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding {encoding!r} (choose from {', '.join(ENCODINGS)})")
+    if strategy is not None and strategy not in STRATEGIES:
+        raise ValueError(f"Unknown zlib strategy {strategy!r} (choose from {', '.join(STRATEGIES)})")
+
+    path = output_path_for(path, encoding)
+    png_options = {}
+    if compress_level is not None:
+        png_options['compress_level'] = compress_level
+    if strategy is not None:
+        png_options['compress_type'] = STRATEGIES[strategy]
+
+    if encoding == 'png':
+        img.save(path, 'PNG', **png_options)
+    elif encoding == 'png-palette16':
+        gray16(img).save(path, 'PNG', bits=4, **png_options)
+    elif encoding == 'png-gray4':
+        with open(path, 'wb') as f:
+            write_png_gray4(gray16(img), f, compress_level, strategy)
+    else:
+        gray = img if img.mode == 'L' else img.convert('L')
+        gray.save(path, 'PPM')  # Pillow writes mode L as binary PGM (P5)
+    return path
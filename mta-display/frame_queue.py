@@ -0,0 +1,79 @@
+"""
+Queue of frames rendered ahead of time, one per upcoming minute (see --lookahead)
+Between feed updates the board only changes as time passes: countdowns drop, trains roll off
+and the clock advances. The generator renders the next few minutes from one snapshot into
+this queue, and swap_frame.sh shows the right one each minute.
+
+The manifest (manifest.txt) has one line per frame, sorted by name and start time:
+
+    <start epoch> <end epoch> <name> <file> <digest>
+
+name is the output variant (e.g. schedule, schedule_portrait) and digest identifies the
+frame's inputs, so a run that brings no new data leaves the queued files untouched.
+"""
+
+import os
+import shutil
+import sys
+import time
+
+QUEUE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frame_queue")
+MANIFEST = "manifest.txt"
+
+
+class FrameQueue:
+    """Manifest entries keyed by (name, start epoch)"""
+
+    def __init__(self, queue_dir=QUEUE_DIR):
+        self.queue_dir = queue_dir
+        self.entries = {}  # (name, start) -> (end, file, digest)
+        try:
+            with open(os.path.join(queue_dir, MANIFEST)) as f:
+                for line in f:
+                    start, end, name, file, digest = line.split()
+                    self.entries[(name, int(start))] = (int(end), file, digest)
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Ignoring unreadable frame manifest: {e}", file=sys.stderr)
+
+    def file_name(self, name, start, extension=".png"):
+        return f"{name}-{time.strftime('%Y%m%dT%H%M', time.localtime(start))}{extension}"
+
+    def path(self, file):
+        return os.path.join(self.queue_dir, file)
+
+    def current(self, name, start, digest):
+        """Path of the queued frame for (name, start) if it was rendered from the same inputs"""
+        entry = self.entries.get((name, start))
+        if entry is not None and entry[2] == digest and os.path.exists(self.path(entry[1])):
+            return self.path(entry[1])
+        return None
+
+    def add(self, name, start, end, file, digest):
+        self.entries[(name, start)] = (end, file, digest)
+
+    def prune(self, now_ts):
+        """Drop frames whose minute has passed, and their files"""
+        for key, (end, file, _digest) in list(self.entries.items()):
+            if end <= now_ts:
+                del self.entries[key]
+                try:
+                    os.remove(self.path(file))
+                except FileNotFoundError:
+                    pass
+
+    def save(self):
+        os.makedirs(self.queue_dir, exist_ok=True)
+        tmp_path = os.path.join(self.queue_dir, f".{MANIFEST}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            for (name, start), (end, file, digest) in sorted(self.entries.items()):
+                f.write(f"{start} {end} {name} {file} {digest}\n")
+        os.replace(tmp_path, os.path.join(self.queue_dir, MANIFEST))  # The swapper never reads a partial manifest
+
+
+def replace_with_copy(source, target):
+    """Copy a file over target without a moment where target is missing or partial"""
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
@@ -0,0 +1,86 @@
+"""
+Pre-rendered glyph/label atlas
+Caches the rasterized mask and measured extents of short strings (countdown minutes,
+"Now", "MIN", clock and temperature labels) per font, size and anchor, so drawing them
+is a mask paste instead of a FreeType rasterization + textbbox measurement.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+MAX_ENTRIES = 2048  # Bounded so odd strings (e.g. every clock minute) can't grow it forever
+
+
+@lru_cache(maxsize=64)
+def load_font(path, size):
+    """Load a TrueType font once per (path, size)"""
+    from PIL import ImageFont
+    return ImageFont.truetype(path, size)
+
+
+def _font_key(font):
+    """Fonts loaded separately from the same file and size rasterize identically"""
+    path = getattr(font, 'path', None)
+    if isinstance(path, str):
+        return (path, font.size)
+    return id(font)  # Built-in default font
+
+
+class GlyphAtlas:
+    """LRU cache of text masks: (font, text, anchor) -> (mask image, bbox relative to the anchor point)"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _render(self, font, text, anchor):
+        from PIL import Image, ImageDraw
+
+        bbox = font.getbbox(text, anchor=anchor)
+        mask = Image.new('L', (max(bbox[2] - bbox[0], 1), max(bbox[3] - bbox[1], 1)), 0)
+        ImageDraw.Draw(mask).text((-bbox[0], -bbox[1]), text, fill=255, font=font, anchor=anchor)
+        return mask, bbox
+
+    def get(self, font, text, anchor='la'):
+        """Return (mask, bbox) for a string, rasterizing it on first use"""
+        key = (_font_key(font), text, anchor)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = self._render(font, text, anchor)
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def textbbox(self, font, text, anchor='la'):
+        """Same result as ImageDraw.textbbox((0, 0), text, font=font, anchor=anchor)"""
+        return self.get(font, text, anchor)[1]
+
+    def draw_text(self, img, xy, text, fill, font, anchor='la'):
+        """Composite a cached string onto img - pixel-identical to ImageDraw.text at integer positions"""
+        # Sub-pixel positions are snapped to whole pixels; only img.paste is needed, so img
+        # can also be a stand-in canvas (see FrameCanvas in mta_display.py)
+        x, y = round(xy[0]), round(xy[1])
+        mask, bbox = self.get(font, text, anchor)
+        img.paste(fill, (x + bbox[0], y + bbox[1]), mask)
+
+    def prewarm(self, font, texts, anchor='la'):
+        """Rasterize a batch of strings up front (for resident processes)"""
+        for text in texts:
+            self.get(font, text, anchor)
+
+
+# Strings that change from frame to frame and are worth rasterizing ahead of time
+COUNTDOWN_TEXTS = [str(minutes) for minutes in range(1, 100)] + ["Now"]
+COUNTDOWN_LABELS = ["MIN", "SCHED"]
+HOUR_LABELS = ["NOW"] + [f"{hour} {half}" for half in ("AM", "PM") for hour in range(1, 13)]
+TEMPERATURE_TEXTS = [f"{temp}°" for temp in range(-20, 121)]
+
+ATLAS = GlyphAtlas()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Static GTFS schedule fallback
+Compiles a static GTFS zip into a per-stop, per-service sorted departure index
+and answers "next N scheduled departures at stop X" with a bisect lookup.
+
+Compile once (or whenever the MTA publishes a new schedule):
+    python gtfs_schedule.py gtfs_subway.zip --stops G26N,G26S
+    python gtfs_schedule.py ferry-gtfs-static.zip --stops 18 -o ferry_schedule_index.pkl
+"""
+
+import bisect
+import csv
+import io
+import os
+import pickle
+import sys
+import zipfile
+from array import array
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEDULE_INDEX_PATH = os.path.join(SCRIPT_DIR, "schedule_index.pkl")
+FERRY_SCHEDULE_INDEX_PATH = os.path.join(SCRIPT_DIR, "ferry_schedule_index.pkl")
+
+INDEX_VERSION = 1
+EASTERN = ZoneInfo('America/New_York')
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def _read_csv(archive, name):
+    """Yield rows of a GTFS text file inside the zip (empty if the file is missing)"""
+    if name not in archive.namelist():
+        return
+    with archive.open(name) as raw:
+        yield from csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8-sig'))
+
+
+def _parse_gtfs_time(value):
+    """Convert a GTFS HH:MM:SS time (hours may exceed 24) to seconds after service-day start"""
+    hours, minutes, seconds = value.strip().split(':')
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _parse_gtfs_date(value):
+    return datetime.strptime(value, '%Y%m%d').date()
+
+
+def compile_index(gtfs_zip_path, stop_ids=None):
+    """Build the departure index from a static GTFS zip
+
+    Args:
+        gtfs_zip_path: Path to the static GTFS zip
+        stop_ids: Optional set of stop IDs to keep (keeps every stop if None)
+
+    Returns:
+        dict: picklable index with 'calendar', 'exceptions', 'headsigns' and
+            'departures' mapping (stop_id, service_id) -> (seconds array, headsign index array)
+    """
+    with zipfile.ZipFile(gtfs_zip_path) as archive:
+        calendar = {}
+        for row in _read_csv(archive, 'calendar.txt'):
+            calendar[row['service_id']] = (
+                tuple(row[day] == '1' for day in WEEKDAYS),
+                _parse_gtfs_date(row['start_date']),
+                _parse_gtfs_date(row['end_date']),
+            )
+
+        # exception_type 1 = service added on that date, 2 = service removed
+        exceptions = {}
+        for row in _read_csv(archive, 'calendar_dates.txt'):
+            day = _parse_gtfs_date(row['date'])
+            exceptions.setdefault(day, {})[row['service_id']] = row['exception_type'] == '1'
+
+        trips = {}
+        for row in _read_csv(archive, 'trips.txt'):
+            trips[row['trip_id']] = (row['service_id'], row.get('trip_headsign', ''))
+
+        headsigns = []
+        headsign_ids = {}
+        rows = {}
+        for row in _read_csv(archive, 'stop_times.txt'):
+            stop_id = row['stop_id']
+            if stop_ids is not None and stop_id not in stop_ids:
+                continue
+            trip = trips.get(row['trip_id'])
+            if trip is None:
+                continue
+            departure = row.get('departure_time') or row.get('arrival_time')
+            if not departure:
+                continue
+            service_id, headsign = trip
+            if headsign not in headsign_ids:
+                headsign_ids[headsign] = len(headsigns)
+                headsigns.append(headsign)
+            rows.setdefault((stop_id, service_id), []).append(
+                (_parse_gtfs_time(departure), headsign_ids[headsign]))
+
+    departures = {}
+    for key, entries in rows.items():
+        entries.sort()
+        departures[key] = (array('l', [secs for secs, _ in entries]),
+                           array('H', [headsign for _, headsign in entries]))
+
+    return {
+        'version': INDEX_VERSION,
+        'calendar': calendar,
+        'exceptions': exceptions,
+        'headsigns': headsigns,
+        'departures': departures,
+    }
+
+
+class ScheduleIndex:
+    """Precompiled scheduled departures, queried with bisect"""
+
+    def __init__(self, data):
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported schedule index version: {data.get('version')}")
+        self.calendar = data['calendar']
+        self.exceptions = data['exceptions']
+        self.headsigns = data['headsigns']
+        self.departures = data['departures']
+        self._services_by_stop = {}
+        for stop_id, service_id in self.departures:
+            self._services_by_stop.setdefault(stop_id, []).append(service_id)
+        self._active_cache = {}
+
+    @classmethod
+    def load(cls, path=SCHEDULE_INDEX_PATH):
+        with open(path, 'rb') as f:
+            return cls(pickle.load(f))
+
+    def save(self, path):
+        data = {
+            'version': INDEX_VERSION,
+            'calendar': self.calendar,
+            'exceptions': self.exceptions,
+            'headsigns': self.headsigns,
+            'departures': self.departures,
+        }
+        with open(path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def active_services(self, service_date):
+        """Return the set of service IDs running on a given date"""
+        active = self._active_cache.get(service_date)
+        if active is not None:
+            return active
+
+        active = set()
+        weekday = service_date.weekday()
+        for service_id, (days, start, end) in self.calendar.items():
+            if start <= service_date <= end and days[weekday]:
+                active.add(service_id)
+        for service_id, added in self.exceptions.get(service_date, {}).items():
+            if added:
+                active.add(service_id)
+            else:
+                active.discard(service_id)
+
+        self._active_cache[service_date] = active
+        return active
+
+    def next_departures(self, stop_id, now=None, limit=3):
+        """Get the next scheduled departures at a stop
+
+        Args:
+            stop_id: GTFS stop ID (e.g. "G26N")
+            now: Timezone-aware datetime to search from (defaults to current time)
+            limit: Maximum number of departures to return
+
+        Returns:
+            list: (epoch_seconds, headsign) tuples sorted by departure time
+        """
+        if now is None:
+            now = datetime.now(EASTERN)
+        now_ts = now.timestamp()
+        local_today = now.astimezone(EASTERN).date()
+
+        results = []
+        # Yesterday's service day covers trips running past midnight (times >= 24:00:00)
+        for service_date in (local_today - timedelta(days=1), local_today):
+            # GTFS service days are measured from "noon minus 12h" so they survive DST changes
+            day_start = datetime.combine(service_date, time(12), tzinfo=EASTERN).timestamp() - 12 * 3600
+            offset = int(now_ts - day_start)
+            active = self.active_services(service_date)
+            for service_id in self._services_by_stop.get(stop_id, ()):
+                if service_id not in active:
+                    continue
+                seconds, headsign_ids = self.departures[(stop_id, service_id)]
+                start = bisect.bisect_left(seconds, offset)
+                for i in range(start, min(start + limit, len(seconds))):
+                    results.append((day_start + seconds[i], self.headsigns[headsign_ids[i]]))
+
+        results.sort()
+        return results[:limit]
+
+
+_loaded_indexes = {}
+
+
+def load_schedule_index(path=SCHEDULE_INDEX_PATH):
+    """Load (and memoize) a compiled schedule index, or return None if it isn't available"""
+    if path not in _loaded_indexes:
+        try:
+            _loaded_indexes[path] = ScheduleIndex.load(path)
+        except FileNotFoundError:
+            _loaded_indexes[path] = None  # Not compiled; callers go without a schedule fallback
+        except Exception as e:
+            print(f"Schedule index unavailable ({path}): {e}")
+            _loaded_indexes[path] = None
+    return _loaded_indexes[path]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: gtfs_schedule.py GTFS_ZIP [--stops ID,ID,...] [-o OUTPUT]")
+        sys.exit(1)
+
+    gtfs_zip = sys.argv[1]
+    stops = None
+    output = SCHEDULE_INDEX_PATH
+    if "--stops" in sys.argv:
+        stops = set(sys.argv[sys.argv.index("--stops") + 1].split(','))
+    if "-o" in sys.argv:
+        output = sys.argv[sys.argv.index("-o") + 1]
+
+    index = ScheduleIndex(compile_index(gtfs_zip, stops))
+    index.save(output)
+    total = sum(len(seconds) for seconds, _ in index.departures.values())
+    print(f"Compiled {total} departures for {len(index._services_by_stop)} stops into {output}")
@@ -0,0 +1,100 @@
+"""
+Shared HTTP transport for every upstream source (MTA, NYC Ferry, weather.gov, sunrise-sunset.org)
+One keep-alive requests.Session per host, so a refresh pays the TCP/TLS handshake once per host
+instead of once per request. Adds gzip, a per-host connection limit, retries with jittered
+exponential backoff and per-request timing.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+USER_AGENT = "MTA Display App"  # weather.gov rejects requests without a User-Agent
+DEFAULT_TIMEOUT = 5  # seconds
+RETRIES = 2  # extra attempts after the first one
+BACKOFF_SECONDS = 0.3  # first retry waits ~0.3s, then ~0.6s (each scaled by a random 0.5-1.5)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_POOL_SIZE = 2
+POOL_SIZES = {
+    "api.weather.gov": 4,  # points, forecast and hourly forecast
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# (host, path, status or error, attempts, elapsed ms) of recent requests, newest last
+timings = deque(maxlen=100)
+
+
+def session_for(host):
+    """Return the pooled session for a host, creating it on first use"""
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            pool_size = POOL_SIZES.get(host, DEFAULT_POOL_SIZE)
+            # pool_block: extra concurrent requests wait for a connection instead of opening more
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",  # requests decompresses transparently
+            })
+            _sessions[host] = session
+        return session
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, retries=RETRIES, **kwargs):
+    """GET a URL through the host's pooled session
+
+    Retries connection errors, timeouts and 429/5xx responses with jittered backoff.
+    Returns the last response (which may still be an error status) or raises the last
+    connection error.
+    """
+    import requests
+
+    parts = urlsplit(url)
+    session = session_for(parts.netloc)
+    started = time.perf_counter()
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == retries:
+                timings.append((parts.netloc, parts.path, type(e).__name__, attempt + 1,
+                                (time.perf_counter() - started) * 1000))
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                timings.append((parts.netloc, parts.path, response.status_code, attempt + 1,
+                                (time.perf_counter() - started) * 1000))
+                return response
+        time.sleep(BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def get_json(url, **kwargs):
+    return get(url, **kwargs).json()
+
+
+def get_bytes(url, **kwargs):
+    """Response body of a successful GET (raises RuntimeError on an error status)"""
+    response = get(url, **kwargs)
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code} from {url}")
+    return response.content
+
+
+def timing_report():
+    """Recent requests, one line each"""
+    lines = []
+    for host, path, status, attempts, elapsed_ms in timings:
+        retry_note = f" ({attempts} attempts)" if attempts > 1 else ""
+        lines.append(f"{elapsed_ms:7.1f} ms  {status}  {host}{path}{retry_note}")
+    return "\n".join(lines)
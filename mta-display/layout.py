@@ -0,0 +1,213 @@
+"""
+Declarative board layout, compiled once per (width, height, orientation) into pixel geometry
+LAYOUT_SPECS describes the board in design units: pixels on the reference board the layout
+was designed for (800x600 landscape). A negative x is measured from the right edge and a
+negative y from the bottom edge. compile_layout() scales a spec to an actual device size
+and resolves every position at the 2x drawing scale. The result is cached, so the per-frame
+code only looks positions up.
+
+The static parts of the board are compiled into display lists: tuples of draw operations
+that mta_display.replay() executes. Text operations name a field instead of holding text,
+and replay() fills them in from each frame's data. An operation whose field has no value in
+that frame is skipped. For example, a row shows either its minutes or "Now".
+
+Operations:
+    ('rect', box, color role)
+    ('line', points, color role, width)
+    ('badge', center, radius, color role, text, font)
+    ('text', xy, field, font, color role, anchor, from glyph atlas)
+
+Colors are named by role (see mta_display.COLOR_ROLES), so they stay configurable in one place.
+"""
+
+from functools import lru_cache
+
+SCALE = 2  # Frames are drawn at 2x and downscaled for antialiasing
+
+LAYOUT_SPECS = {
+    'landscape': {
+        'reference_size': (800, 600),
+        # name -> (style, size)
+        'fonts': {
+            'header': ('bold', 26),
+            'line': ('bold', 48),
+            'dest': ('bold', 48),
+            'time': ('bold', 40),
+            'small': ('bold', 23),
+            'hourly_time': ('regular', 18),
+            'hourly_temp': ('bold', 22),
+        },
+        'footer_height': 250,  # Weather footer, including the time bar
+        'time_bar_height': 50,
+        # Train rows share the height above the footer; y is relative to the row's top anchor,
+        # which sits 30 above the middle of the row
+        'row': {
+            'anchor_above_center': 30,
+            'badge': (70, 30),
+            'badge_radius': 32,
+            'destination': (140, 9),
+            'destination_right': -135,  # longer destinations are cut short with an ellipsis here
+            'minutes': (-62, 22),
+            'now': (-85, 32),
+            'unit': (-62, 55),
+            'separator_width': 8,
+        },
+        'time_bar': {
+            'clock': (20, -35),
+            'stale_gap': 16,  # between the clock and the stale marker
+            'icon_size': 30,
+            'margin': 20,  # right edge to the sun time
+            'icon_spacing': 8,
+            'icon_y': -38,
+            'text_y': -35,
+        },
+        'forecast': {
+            'margin': 20,
+            'max_hours': 12,
+            'label_y': -85,
+            'graph_top': 20,  # below the top of the footer
+            'graph_bottom': -165,
+            'icon_size': 28,
+            'icon_y': -120,
+            'stem_above_icon': 5,
+            'stem_below_temp': 10,
+            'stem_width': 3,
+            'debug_line_width': 2,
+        },
+    },
+}
+
+# A portrait device gets the same board stacked taller: four rows fit comfortably, and the
+# forecast shows fewer hours so their labels don't collide on the narrower footer
+LAYOUT_SPECS['portrait'] = dict(
+    LAYOUT_SPECS['landscape'],
+    reference_size=(600, 800),
+    forecast=dict(LAYOUT_SPECS['landscape']['forecast'], max_hours=8),
+)
+
+
+class Layout:
+    """A spec resolved for one device size; all positions are in 2x drawing pixels"""
+
+    def __init__(self, width, height, orientation):
+        spec = LAYOUT_SPECS[orientation]
+        self.width = width
+        self.height = height
+        self.orientation = orientation
+        self.key = (width, height, orientation)
+        self.scale = SCALE
+        reference_width, reference_height = spec['reference_size']
+        self.unit = min(width / reference_width, height / reference_height)
+
+        self.scaled_width = width * SCALE
+        self.scaled_height = height * SCALE
+        self.fonts = {name: (style, self.size(size)) for name, (style, size) in spec['fonts'].items()}
+
+        # Footer and time bar heights in output pixels (rows share what's left)
+        self.footer_height = round(spec['footer_height'] * self.unit)
+        self.time_bar_height = round(spec['time_bar_height'] * self.unit)
+        self.footer_top = self.scaled_height - self.footer_height * SCALE
+        self.time_bar_top = self.scaled_height - self.time_bar_height * SCALE
+
+        self.row = spec['row']
+        self.destination_right = self.x(self.row['destination_right'])
+        time_bar = spec['time_bar']
+        self.clock_xy = self.point(time_bar['clock'])
+        self.stale_gap = self.size(time_bar['stale_gap'])
+        self.bar_icon_size = self.size(time_bar['icon_size'])
+        self.bar_margin = self.size(time_bar['margin'])
+        self.bar_icon_spacing = self.size(time_bar['icon_spacing'])
+        self.bar_icon_y = self.y(time_bar['icon_y'])
+        self.bar_text_y = self.y(time_bar['text_y'])
+
+        forecast = spec['forecast']
+        self.forecast_left = self.size(forecast['margin'])
+        self.forecast_right = self.scaled_width - self.size(forecast['margin'])
+        self.forecast_max_hours = forecast['max_hours']
+        self.forecast_label_y = self.y(forecast['label_y'])
+        self.graph_top = self.footer_top + self.size(forecast['graph_top'])
+        self.graph_bottom = self.y(forecast['graph_bottom'])
+        self.forecast_icon_size = self.size(forecast['icon_size'])
+        self.forecast_icon_y = self.y(forecast['icon_y'])
+        self.stem_above_icon = self.size(forecast['stem_above_icon'])
+        self.stem_below_temp = self.size(forecast['stem_below_temp'])
+        self.stem_width = self.size(forecast['stem_width'])
+        self.debug_line_width = self.size(forecast['debug_line_width'])
+
+        self.footer_ops = (
+            ('rect', (0, self.footer_top, self.scaled_width, self.scaled_height), 'footer'),
+            ('rect', (0, self.time_bar_top, self.scaled_width, self.scaled_height), 'time_bar'),
+        )
+        self.time_bar_ops = (
+            ('text', self.clock_xy, 'clock', 'small', 'footer_text', None, True),
+        )
+        self._row_ops = {}
+        self._hour_columns = {}
+
+    def size(self, value):
+        """A length in design units, in 2x drawing pixels"""
+        return round(value * self.unit) * SCALE
+
+    def x(self, value):
+        return self.scaled_width + self.size(value) if value < 0 else self.size(value)
+
+    def y(self, value):
+        return self.scaled_height + self.size(value) if value < 0 else self.size(value)
+
+    def point(self, xy):
+        return (self.x(xy[0]), self.y(xy[1]))
+
+    def row_height(self, count):
+        """Height of each train row when `count` rows share the space above the footer"""
+        return ((self.height - self.footer_height) // max(count, 1)) * SCALE
+
+    def row_ops(self, count):
+        """Display list of `count` train rows; fields are destination{i}, minutes{i}, now{i},
+        unit{i} and no_data"""
+        ops = self._row_ops.get(count)
+        if ops is not None:
+            return ops
+
+        row = self.row
+        line_height = self.row_height(count)
+        ops = []
+        if count == 0:
+            ops.append(('text', (self.scaled_width // 2, line_height // 2), 'no_data', 'dest', 'text', 'mm', False))
+
+        anchor_y = line_height // 2 - self.size(row['anchor_above_center'])
+        for i in range(count):
+            def at(xy):
+                return (self.x(xy[0]), anchor_y + self.size(xy[1]))
+
+            ops.append(('badge', at(row['badge']), self.size(row['badge_radius']), 'line', 'G', 'line'))
+            ops.append(('text', at(row['destination']), f'destination{i}', 'dest', 'text', None, False))
+            ops.append(('text', at(row['minutes']), f'minutes{i}', 'time', 'text', 'mm', True))
+            ops.append(('text', at(row['now']), f'now{i}', 'time', 'text', 'mm', True))
+            ops.append(('text', at(row['unit']), f'unit{i}', 'small', 'text', 'mm', True))
+            anchor_y += line_height
+
+            # Separator exactly at the row boundary (not after the last row)
+            if i < count - 1:
+                line_y = (i + 1) * line_height
+                ops.append(('line', ((0, line_y), (self.scaled_width, line_y)), 'separator',
+                            self.size(row['separator_width'])))
+
+        ops = self._row_ops[count] = tuple(ops)
+        return ops
+
+    def hour_columns(self, count):
+        """(column spacing, x of each hour's center) for `count` forecast hours"""
+        columns = self._hour_columns.get(count)
+        if columns is None:
+            spacing = (self.forecast_right - self.forecast_left) // count
+            centers = tuple(self.forecast_left + i * spacing + spacing // 2 for i in range(count))
+            columns = self._hour_columns[count] = (spacing, centers)
+        return columns
+
+
+@lru_cache(maxsize=None)
+def compile_layout(width, height, orientation=None):
+    """The Layout for a device size; orientation defaults to the size's own"""
+    if orientation is None:
+        orientation = 'portrait' if height > width else 'landscape'
+    return Layout(width, height, orientation)
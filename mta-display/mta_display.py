@@ -4,19 +4,60 @@ MTA G Train Display Generator
 Creates an 800x600 PNG showing next trains at Greenpoint G station
 """
 
-from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
-from nyct_gtfs import NYCTFeed
-import requests
+# Heavy third-party modules (PIL, nyct_gtfs + protobuf, requests) are imported inside the
+# functions that use them so paths that never touch them don't pay for the import.
+# Time handling uses the stdlib (zoneinfo, datetime.fromisoformat) instead of pytz/dateutil.
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import sys
 import os
 import platform
+from collections import OrderedDict
+from functools import lru_cache
+
+from gtfs_schedule import load_schedule_index
+from station_catalog import load_station_catalog
+from feed_diff import LiveArrivals
+import http_transport
+from source_cache import (G_FEED, NWS_POINTS, NWS_FORECAST, NWS_HOURLY, SUN_TIMES, SUN_TIMES_TOMORROW, REVALIDATE_WAIT,
+                          stale_labels)
+from weather_model import WeatherReport, build_hourly, condition_icon, hourly_as_of, parse_iso_time
+from warm_state import WarmState, load_state, save_state
+from tile_cache import TILES, content_digest
+from frame_encoding import output_path_for, save_frame
+from frame_queue import QUEUE_DIR, FrameQueue, replace_with_copy
+from layout import compile_layout
+from glyph_atlas import ATLAS, COUNTDOWN_TEXTS, COUNTDOWN_LABELS, HOUR_LABELS, TEMPERATURE_TEXTS, load_font
 
 # Station IDs
 G_TRAIN_GREENPOINT_NORTH = "G26N"  # Queens-bound
 G_TRAIN_GREENPOINT_SOUTH = "G26S"  # Church Ave-bound
+G_FEED_URL = "https://api-endpoint.mta.info/Dataservice/mtagtfsfeeds/nyct%2Fgtfs-g"
+
+# (stop, direction, label used when a trip's last stop can't be named) in display order
+G_DIRECTIONS = ((G_TRAIN_GREENPOINT_NORTH, 'N', 'Court Square'),
+                (G_TRAIN_GREENPOINT_SOUTH, 'S', 'Church Ave'))
+# Board spellings of GTFS station names (the rest are shown as stops.txt has them)
+DESTINATION_NAMES = {'Court Sq': 'Court Square', 'Church Av': 'Church Ave'}
+# Trains kept per direction beyond the two shown, so a frame drawn from the saved state
+# (--warm-start, see warm_state.py) still has trains after the ones it saved have left
+WARM_SPARE_PER_DIRECTION = 4
+WARM_MAX_AGE = 6 * 3600  # seconds; an older saved state is not drawn
+
+# --resident: refresh period and maximum jitter of each source, in seconds (see scheduler.py).
+# Periods are no shorter than the sources' fresh_for in source_cache.py, so each run fetches
+RESIDENT_PERIODS = {
+    'trains': (30, 5),  # The feed is rebuilt about every 30s
+    'weather': (15 * 60, 60),  # NWS forecast and hourly forecast
+    'sun': (12 * 3600, 10 * 60),  # Today's and tomorrow's sun times
+}
+RESIDENT_FIRST_WAIT = 15  # seconds to wait for every source before the first frame
+
+# Arrivals at our stops, updated from each feed snapshot by diff (lives as long as the process)
+G_ARRIVALS = LiveArrivals(stops={G_TRAIN_GREENPOINT_NORTH, G_TRAIN_GREENPOINT_SOUTH})
 
 # Display settings
+# Default output size; positions come from the layout spec in layout.py
 WIDTH = 800
 HEIGHT = 600
 
@@ -32,46 +73,23 @@ WEATHER_LINE = (245, 245, 245)  # Weather graph line color
 TIME_BAR_BG = (0, 0, 0)  # Slightly lighter background for time bar at bottom
 
 # Sunrise/Sunset gradient settings
+# Colors of the layout's display lists (see layout.py), by role
+COLOR_ROLES = {
+    'text': TEXT_COLOR,
+    'separator': SEPARATOR_COLOR,
+    'line': LINE_COLOR,
+    'footer': HEADER_BG,
+    'time_bar': TIME_BAR_BG,
+    'footer_text': HEADER_TEXT,
+}
+
 SUNRISE_GRADIENT_NIGHT_COLOR = HEADER_BG
 SUNRISE_GRADIENT_DAY_COLOR = (115, 115, 115)  # Light gray for day
 SUNRISE_GRADIENT_WIDTH_HOURS = 0.8  # Total width of gradient in hours (centered on sunrise/sunset)
 SUNSET_GRADIENT_ENABLED = True  # Enable sunset gradient (transitions from day to night)
 SHOW_DEBUG_LINES = False  # Show orange/blue lines at sunrise/sunset times
 
-def get_weather_icon(condition_text, is_sunrise=False, is_sunset=False):
-    """Map weather condition text to icon filename using fuzzy matching"""
-    condition_lower = condition_text.lower()
-
-    # Special handling for sunrise/sunset
-    if is_sunrise:
-        return 'sunrise'
-    if is_sunset:
-        return 'sunset'
-
-    # Icon mapping with fuzzy matching
-    if 'thunder' in condition_lower or 'storm' in condition_lower and 'tropical' not in condition_lower:
-        return 'thunderstorm'
-    elif 'snow' in condition_lower or 'flurr' in condition_lower or 'blizzard' in condition_lower:
-        return 'snow'
-    elif 'rain' in condition_lower and 'heavy' in condition_lower:
-        return 'heavy-rain'
-    elif 'rain' in condition_lower or 'shower' in condition_lower:
-        return 'rain'
-    elif 'drizzle' in condition_lower:
-        return 'drizzle'
-    elif 'fog' in condition_lower or 'mist' in condition_lower:
-        return 'fog'
-    elif 'clear' in condition_lower and 'night' in condition_lower:
-        return 'clear-night'
-    elif 'partly' in condition_lower or 'p.' in condition_lower:
-        return 'partly-cloudy'
-    elif 'mostly' in condition_lower or 'm.' in condition_lower or 'overcast' in condition_lower or 'cloudy' in condition_lower:
-        return 'cloudy'
-    elif 'sunny' in condition_lower or 'clear' in condition_lower:
-        return 'sunny'
-    else:
-        # Default to partly cloudy
-        return 'partly-cloudy'
+EASTERN = ZoneInfo('America/New_York')
 
 
 def load_png_icon(png_path, size):
@@ -81,6 +99,8 @@ def load_png_icon(png_path, size):
         png_path: Path to the PNG file
         size: Target size in pixels
     """
+    from PIL import Image
+
     try:
         # Load PNG and resize
         icon = Image.open(png_path)
@@ -92,182 +112,207 @@ def load_png_icon(png_path, size):
         return Image.new('RGBA', (size, size), (0, 0, 0, 0))
 
 
-def get_all_trains(limit=4):
-    """Get next arrivals for both directions - Queens-bound first, then Church Ave-bound"""
-    try:
-        feed = NYCTFeed("G")
-        trains_list = feed.trips
+def get_all_trains(limit=4, now=None, wait=REVALIDATE_WAIT):
+    """Get next arrivals for both directions - Queens-bound first, then Church Ave-bound
 
-        queens_arrivals = []
-        church_arrivals = []
+    Args:
+        limit: Total number of rows (split evenly between the directions)
+        now: Time the minutes are counted from (datetime.now() if None); fetch_snapshot
+            passes one shared time for every source
+        wait: Seconds to wait for a refresh of an out-of-date feed (None waits for it, as the
+            resident scheduler's background refresh does)
+
+    Rows are {'minutes', 'destination', 'direction' ('N'/'S'), 'scheduled', 'arrival' (epoch
+    seconds)}. The destination is named from the trip's last stop (see station_catalog.py), so
+    short-turned trains show where they actually end.
+    """
+    if now is None:
         now = datetime.now()
+    try:
+        # Download through the shared transport (or reuse the cached feed) and apply it to the
+        # arrivals at our two stops, decoding only the trips that changed (see feed_diff.py).
+        # Predictions are absolute times, so a slightly old feed still gives correct minutes.
+        payload, _stale = G_FEED.get(lambda: http_transport.get_bytes(G_FEED_URL), wait=wait)
+        G_ARRIVALS.update(payload)
 
-        # Get Queens-bound trains
-        for train in trains_list:
-            for stop_update in train.stop_time_updates:
-                if stop_update.stop_id == G_TRAIN_GREENPOINT_NORTH and stop_update.arrival:
-                    minutes_away = int((stop_update.arrival - now).total_seconds() / 60)
-                    if minutes_away >= 0:
-                        queens_arrivals.append({
-                            'minutes': minutes_away,
-                            'destination': 'Court Square'
-                        })
-                    break
-
-        # Get Church Ave-bound trains
-        for train in trains_list:
-            for stop_update in train.stop_time_updates:
-                if stop_update.stop_id == G_TRAIN_GREENPOINT_SOUTH and stop_update.arrival:
-                    minutes_away = int((stop_update.arrival - now).total_seconds() / 60)
-                    if minutes_away >= 0:
-                        church_arrivals.append({
-                            'minutes': minutes_away,
-                            'destination': 'Church Ave'
-                        })
-                    break
-
-        # Sort each direction by time, take 2 from each (total of 4)
+        # Each direction comes back sorted by time; take 2 from each (total of 4)
         trains_per_direction = limit // 2
-        queens_sorted = sorted(queens_arrivals, key=lambda x: x['minutes'])[:trains_per_direction]
-        church_sorted = sorted(church_arrivals, key=lambda x: x['minutes'])[:trains_per_direction]
-
-        # Return Queens first, then Church Ave
-        return queens_sorted + church_sorted
+        trains = []
+        # Queens first, then Church Ave
+        for stop_id, direction, terminal in G_DIRECTIONS:
+            for minutes_away, arrival_ts, trip in G_ARRIVALS.upcoming(stop_id, now.timestamp(), trains_per_direction):
+                trains.append({
+                    'minutes': minutes_away,
+                    'destination': destination_name(G_ARRIVALS.destination(trip), terminal),
+                    'direction': direction,
+                    'scheduled': False,
+                    'arrival': arrival_ts
+                })
     except Exception as e:
         print(f"Error fetching MTA data: {e}")
+        trains = []
+
+    if not trains:
+        print("No live train data, falling back to static schedule")
+        trains = get_scheduled_trains(limit, now)
+    return trains
+
+
+def destination_name(stop_id, fallback):
+    """Board label for a trip ending at stop_id, from the station catalog (fallback if unknown)"""
+    catalog = load_station_catalog()
+    name = catalog.name(stop_id) if catalog is not None else None
+    if not name:
+        return fallback
+    return DESTINATION_NAMES.get(name, name)
+
+
+def get_scheduled_trains(limit=4, now=None):
+    """Get next scheduled departures from the compiled static GTFS index (see gtfs_schedule.py)
+
+    Rows are marked with 'scheduled': True so the display can tell them apart from live data
+    """
+    index = load_schedule_index()
+    if index is None:
         return []
 
+    trains_per_direction = limit // 2
+    # One clock for picking the departures and counting their minutes (a naive time is local)
+    now = (now or datetime.now()).astimezone(EASTERN)
+    now_ts = now.timestamp()
+    trains = []
+    for stop_id, direction, terminal in G_DIRECTIONS:
+        for departure_ts, headsign in index.next_departures(stop_id, now=now, limit=trains_per_direction):
+            trains.append({
+                'minutes': max(0, int((departure_ts - now_ts) / 60)),
+                'destination': DESTINATION_NAMES.get(headsign, headsign) or terminal,
+                'direction': direction,
+                'scheduled': True,
+                'arrival': departure_ts
+            })
+    return trains
+
+
+NWS_POINTS_URL = "https://api.weather.gov/points/40.7313,-73.9542"  # Greenpoint coordinates
+SUN_URL = "https://api.sunrise-sunset.org/json?lat=40.7313&lng=-73.9542&formatted=0"
+
+
+def fetch_forecast(wait=REVALIDATE_WAIT):
+    """(forecast periods, hourly periods) from the National Weather Service
+
+    Each request is cached per source (see source_cache.py); payloads are validated inside
+    the fetch so an error response counts as a failure instead of being cached
+    """
+    def fetch_points():
+        properties = http_transport.get_json(NWS_POINTS_URL)['properties']
+        return properties['forecast'], properties['forecastHourly']
+
+    (forecast_url, hourly_url), _ = NWS_POINTS.get(fetch_points, wait=wait)
+    periods, _ = NWS_FORECAST.get(lambda: http_transport.get_json(forecast_url)['properties']['periods'],
+                                  key=forecast_url, wait=wait)
+    # Hourly forecast (filtered to the next hours in build_hourly)
+    hourly_periods, _ = NWS_HOURLY.get(lambda: http_transport.get_json(hourly_url)['properties']['periods'],
+                                       key=hourly_url, wait=wait)
+    return periods, hourly_periods
+
+
+def fetch_sun_times(day, tomorrow=False, wait=REVALIDATE_WAIT):
+    """sunrise-sunset.org results for `day` (today, or tomorrow's with tomorrow=True)
+
+    Offline, the last cached results are returned (marked stale) even if they are for another day
+    """
+    if tomorrow:
+        url = f"{SUN_URL}&date={day}"
+        sun_data, _ = SUN_TIMES_TOMORROW.get(lambda: http_transport.get_json(url)['results'],
+                                             key=day.isoformat(), wait=wait)
+    else:
+        sun_data, _ = SUN_TIMES.get(lambda: http_transport.get_json(SUN_URL)['results'],
+                                    key=day.isoformat(), wait=wait)
+    return sun_data
 
-def get_weather():
+
+def build_weather(now_local, periods, hourly_periods, sun_data, sun_tomorrow):
+    """WeatherReport as of now_local from already-fetched NWS periods and sun times
+
+    Args:
+        sun_tomorrow: Callable returning tomorrow's sun times; only called after sunset, to
+            show tomorrow's sunrise
+    """
+    eastern = EASTERN
+    sunrise_local = parse_iso_time(sun_data['sunrise']).astimezone(eastern)
+    sunset_local = parse_iso_time(sun_data['sunset']).astimezone(eastern)
+
+    # Determine if it's currently daytime or nighttime
+    is_daytime = sunrise_local <= now_local < sunset_local
+
+    # Find the first period matching current day/night status
+    current = None
+    for period in periods:
+        if period['isDaytime'] == is_daytime:
+            current = period
+            break
+
+    # Fallback to first period if no match found
+    if current is None:
+        current = periods[0]
+
+    temp = current['temperature']
+    condition = current['shortForecast']
+
+    # Get the weather icon before shortening text
+    main_icon = condition_icon(condition)
+
+    # Shorten common conditions
+    condition_short = condition.replace("Mostly", "M.").replace("Partly", "P.")
+
+    # Limit length to prevent cutoff
+    if len(condition_short) > 15:
+        condition_short = condition_short[:15]
+
+    # Determine which upcoming sun event to show
+    if now_local < sunrise_local:
+        # Before sunrise - show today's sunrise
+        sun_time = sunrise_local.strftime('%I:%M %p').lstrip('0')
+        sun_icon = 'sunrise'
+    elif now_local < sunset_local:
+        # After sunrise but before sunset - show today's sunset
+        sun_time = sunset_local.strftime('%I:%M %p').lstrip('0')
+        sun_icon = 'sunset'
+    else:
+        # After sunset - show tomorrow's sunrise
+        sunrise_local_tomorrow = parse_iso_time(sun_tomorrow()['sunrise']).astimezone(eastern)
+        sun_time = sunrise_local_tomorrow.strftime('%I:%M %p').lstrip('0')
+        sun_icon = 'sunrise'
+
+    weather_text = f"{temp}°F {condition_short}"
+
+    sunrise_ts = sunrise_local.timestamp()
+    sunset_ts = sunset_local.timestamp()
+    hourly_forecast = build_hourly(hourly_periods, now_local, sunrise_ts, sunset_ts)
+
+    return WeatherReport(weather_text, main_icon, sun_icon, sun_time, hourly_forecast, sunrise_ts, sunset_ts)
+
+
+def get_weather(now=None):
     """Get current weather for Greenpoint, Brooklyn from National Weather Service
 
+    Args:
+        now: Time to pick the current period and next sun event for (datetime.now() if None)
+
     Returns:
-        tuple: (weather_text, main_icon, sun_icon, sun_text, hourly_forecast, sunrise_local, sunset_local) where:
-            - weather_text: formatted temperature and condition string
-            - main_icon: icon name for the main weather condition
-            - sun_icon: icon name for sunrise/sunset
-            - sun_text: formatted sunrise/sunset time text
-            - hourly_forecast: list of 8 hourly forecast dicts with 'time', 'temp', 'condition', and 'hour_time' keys
-            - sunrise_local: datetime object for today's sunrise in local timezone
-            - sunset_local: datetime object for today's sunset in local timezone
+        WeatherReport (see weather_model.py) with the current conditions, the next sun event,
+        up to 12 HourlyForecast records and today's sunrise/sunset timestamps, or None on error
     """
     try:
-        # Greenpoint coordinates
-        url = "https://api.weather.gov/points/40.7313,-73.9542"
-        response = requests.get(url, headers={"User-Agent": "MTA Display App"}, timeout=5)
-        data = response.json()
-        forecast_url = data['properties']['forecast']
-        hourly_url = data['properties']['forecastHourly']
-
-        # Get sunrise/sunset times first to determine if it's day or night
-        from dateutil import parser
-        import pytz
-        from datetime import timedelta
-
-        eastern = pytz.timezone('America/New_York')
-        now_local = datetime.now(eastern)
-
-        forecast = requests.get(forecast_url, headers={"User-Agent": "MTA Display App"}, timeout=5)
-        periods = forecast.json()['properties']['periods']
-
-        # Fetch hourly forecast and filter to next 8 hours from now
-        hourly_response = requests.get(hourly_url, headers={"User-Agent": "MTA Display App"}, timeout=5)
-        all_hourly_periods = hourly_response.json()['properties']['periods']
-
-        # Filter periods to only include future hours
-        hourly_periods = []
-        for period in all_hourly_periods:
-            period_start = parser.parse(period['startTime']).astimezone(eastern)
-            # Only include periods that are in the future or current hour
-            if period_start >= now_local - timedelta(minutes=30):  # Include current hour (within 30 min)
-                hourly_periods.append(period)
-                if len(hourly_periods) >= 12:
-                    break
-
-        sun_url = "https://api.sunrise-sunset.org/json?lat=40.7313&lng=-73.9542&formatted=0"
-        sun_response = requests.get(sun_url, timeout=5)
-        sun_data = sun_response.json()['results']
-
-        sunrise_utc = parser.parse(sun_data['sunrise'])
-        sunset_utc = parser.parse(sun_data['sunset'])
-        sunrise_local = sunrise_utc.astimezone(eastern)
-        sunset_local = sunset_utc.astimezone(eastern)
-
-        # Determine if it's currently daytime or nighttime
-        is_daytime = sunrise_local <= now_local < sunset_local
-
-        # Find the first period matching current day/night status
-        current = None
-        for period in periods:
-            if period['isDaytime'] == is_daytime:
-                current = period
-                break
-
-        # Fallback to first period if no match found
-        if current is None:
-            current = periods[0]
-
-        temp = current['temperature']
-        condition = current['shortForecast']
-
-        # Get the weather icon before shortening text
-        main_icon = get_weather_icon(condition)
-
-        # Shorten common conditions
-        condition_short = condition.replace("Mostly", "M.").replace("Partly", "P.")
-        condition_short = condition_short.replace("Cloudy", "Cloudy").replace("Sunny", "Sunny")
-
-        # Limit length to prevent cutoff
-        if len(condition_short) > 15:
-            condition_short = condition_short[:15]
-
-        # Determine which upcoming sun event to show (sunrise/sunset data already fetched above)
-        if now_local < sunrise_local:
-            # Before sunrise - show today's sunrise
-            sun_time = sunrise_local.strftime('%I:%M %p').lstrip('0')
-            sun_icon = 'sunrise'
-        elif now_local < sunset_local:
-            # After sunrise but before sunset - show today's sunset
-            sun_time = sunset_local.strftime('%I:%M %p').lstrip('0')
-            sun_icon = 'sunset'
-        else:
-            # After sunset - show tomorrow's sunrise
-            tomorrow = now_local.date() + timedelta(days=1)
-            sun_url_tomorrow = f"https://api.sunrise-sunset.org/json?lat=40.7313&lng=-73.9542&formatted=0&date={tomorrow}"
-            sun_response_tomorrow = requests.get(sun_url_tomorrow, timeout=5)
-            sun_data_tomorrow = sun_response_tomorrow.json()['results']
-            sunrise_utc_tomorrow = parser.parse(sun_data_tomorrow['sunrise'])
-            sunrise_local_tomorrow = sunrise_utc_tomorrow.astimezone(eastern)
-            sun_time = sunrise_local_tomorrow.strftime('%I:%M %p').lstrip('0')
-            sun_icon = 'sunrise'
-
-        weather_text = f"{temp}°F {condition_short}"
-
-        # Format hourly forecast for display
-        from dateutil import parser
-        hourly_forecast = []
-        for i, period in enumerate(hourly_periods):
-            # Parse the time from the period
-            start_time = parser.parse(period['startTime']).astimezone(eastern)
-
-            # Check if this is the current hour
-            if i == 0 and start_time.hour == now_local.hour:
-                time_label = "NOW"
-            else:
-                # Format as hour (e.g., "3 PM", "1 AM")
-                time_label = start_time.strftime('%I %p').lstrip('0')
-
-            hourly_forecast.append({
-                'time': time_label,
-                'temp': period['temperature'],
-                'condition': period['shortForecast'],
-                'hour_time': start_time  # Store datetime for day/night checking
-            })
-
-        return (weather_text, main_icon, sun_icon, sun_time, hourly_forecast, sunrise_local, sunset_local)
+        now_local = now.astimezone(EASTERN) if now else datetime.now(EASTERN)
+        periods, hourly_periods = fetch_forecast()
+        sun_data = fetch_sun_times(now_local.date())
+        tomorrow = now_local.date() + timedelta(days=1)
+        return build_weather(now_local, periods, hourly_periods, sun_data,
+                             lambda: fetch_sun_times(tomorrow, tomorrow=True))
     except Exception as e:
         print(f"Error fetching weather: {e}")
-        return ("", "partly-cloudy", "sunrise", "", [], None, None)
+        return None
 
 
 def get_font_paths():
@@ -305,50 +350,938 @@ def get_font_paths():
 
 def draw_antialiased_circle(img, center_x, center_y, radius, fill_color, text, text_font):
     """Draw an antialiased circle with centered text"""
+    if isinstance(img, SelectiveCanvas) and isinstance(getattr(text_font, 'path', None), str):
+        # Already supersampled 4x inside the badge, so draw it at output size instead of 2x;
+        # an odd 2x position becomes a half-pixel offset within the badge image
+        left, top = center_x - radius, center_y - radius
+        circle_img = render_circle_badge(radius // 2, fill_color, text, text_font.path, text_font.size // 2,
+                                         (left % 2, top % 2))
+        img.paste_native(circle_img, (left // 2, top // 2), circle_img)
+        return
+
+    if isinstance(getattr(text_font, 'path', None), str):
+        # The badge is identical on every row and every frame - render it once
+        circle_img = render_circle_badge(radius, fill_color, text, text_font.path, text_font.size)
+    else:
+        circle_img = _render_circle_badge(radius, fill_color, text, text_font)
+
+    # Paste onto main image
+    img.paste(circle_img, (center_x - radius, center_y - radius), circle_img)
+
+
+@lru_cache(maxsize=16)
+def render_circle_badge(radius, fill_color, text, font_path, font_size, half_offset=(0, 0)):
+    """Cached circle badge (e.g. the G bullet) for a font loaded from a file"""
+    return _render_circle_badge(radius, fill_color, text, load_font(font_path, font_size), half_offset)
+
+
+def _render_circle_badge(radius, fill_color, text, text_font, half_offset=(0, 0)):
+    """Render an antialiased circle with centered text as an RGBA image
+
+    half_offset: (x, y) flags that shift the circle right/down by half a pixel; the image
+        grows by a pixel in that direction
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
     # Create a high-resolution temporary image (4x scale for better antialiasing)
     scale = 4
     size = radius * 2 * scale
-    circle_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    dx, dy = (half * scale // 2 for half in half_offset)
+    circle_img = Image.new('RGBA', ((radius * 2 + half_offset[0]) * scale, (radius * 2 + half_offset[1]) * scale),
+                           (0, 0, 0, 0))
     circle_draw = ImageDraw.Draw(circle_img)
 
     # Draw circle at high resolution
-    circle_draw.ellipse([0, 0, size, size], fill=fill_color)
+    circle_draw.ellipse([dx, dy, dx + size, dy + size], fill=fill_color)
 
     # Draw text at high resolution - scale up the font
     try:
-        scaled_font = ImageFont.truetype(text_font.path, text_font.size * scale)
+        scaled_font = load_font(text_font.path, text_font.size * scale)
     except Exception as e:
         # Last resort fallback - just use the original font
         print(f"Warning: Could not scale font for circle ({e}), using original size")
         scaled_font = text_font
 
     # Use anchor='mm' to center text at the middle
-    circle_draw.text((size // 2, size // 2 + 35), text, fill=(255, 255, 255),
+    circle_draw.text((dx + size // 2, dy + size // 2 + 35 * radius // 64), text, fill=(255, 255, 255),
                     font=scaled_font, anchor='mm')
 
     # Resize down with high-quality antialiasing
-    circle_img = circle_img.resize((radius * 2, radius * 2), Image.Resampling.LANCZOS)
+    return circle_img.resize((circle_img.width // scale, circle_img.height // scale), Image.Resampling.LANCZOS)
 
-    # Paste onto main image
-    img.paste(circle_img, (center_x - radius, center_y - radius), circle_img)
+
+def prewarm_atlas(size=None):
+    """Rasterize the strings that change every frame ahead of time (for long-running processes)
+
+    Fills the glyph atlas with every countdown, label, forecast hour and temperature in the
+    fonts the layout for `size` (default WIDTH x HEIGHT) draws them in, so the first frames
+    of a resident process paste masks instead of rasterizing.
+    """
+    _, fonts = load_display_fonts(compile_layout(*(size or (WIDTH, HEIGHT))))
+    ATLAS.prewarm(fonts['time'], COUNTDOWN_TEXTS, anchor='mm')
+    ATLAS.prewarm(fonts['small'], COUNTDOWN_LABELS, anchor='mm')
+    ATLAS.prewarm(fonts['hourly_time'], HOUR_LABELS)
+    ATLAS.prewarm(fonts['hourly_temp'], TEMPERATURE_TEXTS)
+
+
+# Named output variants for --variants (e.g. --variants landscape,portrait,grayscale)
+VARIANT_PRESETS = {
+    'landscape': {'output_path': 'schedule.png', 'rotate': False, 'grayscale': False},
+    'portrait': {'output_path': 'schedule_portrait.png', 'rotate': True, 'grayscale': False},
+    'grayscale': {'output_path': 'schedule_gray.png', 'rotate': False, 'grayscale': True},
+    'portrait-grayscale': {'output_path': 'schedule_portrait_gray.png', 'rotate': True, 'grayscale': True},
+}
+
+
+class DisplaySnapshot:
+    """All data for one frame, fetched once and shared by every output variant"""
+    __slots__ = ('trains', 'weather', 'taken_at', 'stale')
+
+    def __init__(self, trains, weather, taken_at, stale=()):
+        self.trains = trains  # list of train row dicts from get_all_trains
+        self.weather = weather  # WeatherReport or None
+        self.taken_at = taken_at  # datetime shown as the clock
+        self.stale = tuple(stale)  # labels of sources drawn from out-of-date data, e.g. ('weather',)
+
+    def __getstate__(self):
+        return (self.trains, self.weather, self.taken_at, self.stale)
+
+    def __setstate__(self, state):
+        self.trains, self.weather, self.taken_at, self.stale = state
+
+    def at(self, when, per_direction=2):
+        """This snapshot as the board should read at a later time `when` (a datetime)
+
+        Countdowns are recomputed from each row's arrival time; trains that have left roll off
+        and spare rows (see fetch_snapshot) move up. Weather and stale markers carry over.
+        """
+        now_ts = when.timestamp()
+        directions = {}  # direction -> rows, in the snapshot's direction order
+        for train in self.trains:
+            seconds_away = train['arrival'] - now_ts
+            if train.get('scheduled'):
+                if seconds_away < 0:
+                    continue
+                minutes = max(0, int(seconds_away / 60))
+            else:
+                minutes = int(seconds_away / 60)  # Truncated like get_all_trains, so "Now" lasts a minute
+                if minutes < 0:
+                    continue
+            # Rows without a direction (older saved snapshots) are grouped by destination
+            rows = directions.setdefault(train.get('direction', train['destination']), [])
+            if len(rows) < per_direction:
+                rows.append(dict(train, minutes=minutes))
+        trains = [row for rows in directions.values() for row in rows]
+        return DisplaySnapshot(trains, self.weather, when, self.stale)
+
+
+def save_warm_state(snapshot):
+    """Save what this frame was drawn from for the next cold start (see warm_state.py)"""
+    taken_ts = snapshot.taken_at.timestamp()
+    live = any(not train.get('scheduled') for train in snapshot.trains)
+    # When each source's data is from: predictions as of the feed's own timestamp; a static
+    # schedule doesn't age
+    as_of = {'trains': G_ARRIVALS.timestamp if live and G_ARRIVALS.timestamp else taken_ts}
+    if snapshot.weather is not None:
+        as_of['weather'] = NWS_HOURLY.fetched_at or taken_ts
+        as_of['sun'] = SUN_TIMES.fetched_at or taken_ts
+    trains = [{'destination': train['destination'], 'direction': train.get('direction', ''),
+               'scheduled': bool(train.get('scheduled')), 'arrival': train['arrival']}
+              for train in snapshot.trains]
+    weather = snapshot.weather
+
+    # Keep the last good data of a source this refresh got nothing from (e.g. offline)
+    if not trains or weather is None:
+        previous = load_state()
+        if previous is not None:
+            if not trains and previous.trains:
+                trains = previous.trains
+                as_of['trains'] = previous.as_of.get('trains', previous.taken_ts)
+            if weather is None and previous.weather is not None:
+                weather = previous.weather
+                for label in ('weather', 'sun'):
+                    as_of[label] = previous.as_of.get(label, previous.taken_ts)
+    save_state(WarmState(trains, weather, taken_ts, as_of))
+
+
+def format_age(seconds):
+    """Short age for the time bar, e.g. 45s, 12m, 3h, 2d"""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{max(0, int(seconds))}s"
+
+
+def warm_snapshot(now):
+    """The saved state (see warm_state.py) as the board should read at `now`, or None
+
+    Countdowns run on from the saved arrival times and passed hours drop off the forecast.
+    The time bar shows how old the train and weather data is instead of the usual stale marker.
+    """
+    state = load_state()
+    if state is None or now.timestamp() - state.taken_ts > WARM_MAX_AGE:
+        return None
+    weather = state.weather
+    if weather is not None:
+        weather = WeatherReport(weather.text, weather.icon, weather.sun_icon, weather.sun_time,
+                                hourly_as_of(weather.hourly, now.astimezone(EASTERN)),
+                                weather.sunrise_ts, weather.sunset_ts)
+    ages = [f"{label} {format_age(now.timestamp() - ts)}" for label, ts in state.as_of.items() if label != 'sun']
+    return DisplaySnapshot(state.trains, weather, datetime.fromtimestamp(state.taken_ts), ages).at(now)
+
+
+def fetch_with_warm_start(variants, spare_per_direction):
+    """Draw the saved state right away while fresh data loads, then return the fresh snapshot"""
+    import threading
+    import time
+
+    result = {}
+
+    def fetch():
+        try:
+            result['snapshot'] = fetch_snapshot(spare_per_direction)
+        except BaseException as e:
+            result['error'] = e
+
+    fetcher = threading.Thread(target=fetch, daemon=True)
+    fetcher.start()
+    start = time.perf_counter()
+    snapshot = warm_snapshot(datetime.now())
+    if snapshot is None:
+        print("Warm start: no recent saved state, waiting for fresh data")
+    else:
+        save_variants(snapshot, variants, parallel=False)  # The fetch is running in a thread
+        print(f"Warm start: first frame drawn from saved state ({', '.join(snapshot.stale)} old) "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    fetcher.join()
+    if 'error' in result:
+        raise result['error']
+    return result['snapshot']
 
 
-def create_display_image(output_path="schedule.png", rotate=False, grayscale=False):
-    """Create the MTA display image
+def fetch_snapshot(spare_per_direction=0):
+    """Fetch trains and weather once, all relative to one clock reading
+
+    Args:
+        spare_per_direction: Extra trains to fetch per direction beyond the 2 shown, for
+            frames rendered ahead of time (see DisplaySnapshot.at)
+    """
+    now = datetime.now()
+    # Get all trains (2 per direction = 4 total, plus spares)
+    trains = get_all_trains(limit=4 + 2 * spare_per_direction, now=now)
+    weather = get_weather(now)
+    return DisplaySnapshot(trains, weather, now, stale_labels())
+
+
+def create_display_image(output_path="schedule.png", rotate=False, grayscale=False, variants=None, snapshot=None,
+                         low_memory=False, strips=1, encoding='png', compress_level=None, zlib_strategy=None,
+                         lookahead=0, queue_dir=QUEUE_DIR, size=None, selective=False, warm_start=False):
+    """Create the MTA display image(s)
 
     Args:
         output_path: Path to save the PNG file
         rotate: If True, rotate the image 90 degrees counter-clockwise
         grayscale: If True, make the image grayscale
+        variants: Optional list of {'output_path', 'rotate', 'grayscale'} dicts to render instead of
+            the single image described by the arguments above. Data is fetched once and the variants
+            are rendered in parallel worker processes.
+        snapshot: Optional DisplaySnapshot to render instead of fetching fresh data
+        low_memory: If True, render for constrained devices (see render_frame); also applies to variants
+        strips: Number of horizontal strips to render the 2x canvas in (see render_frame)
+        encoding: Output encoding (see frame_encoding.py); also applies to variants
+        compress_level: zlib level 0-9 for PNG encodings (None = default)
+        zlib_strategy: zlib strategy name for PNG encodings (see frame_encoding.STRATEGIES)
+        lookahead: If > 0, also render this many upcoming minutes into the frame queue
+            (see queue_lookahead_frames)
+        queue_dir: Directory of the frame queue
+        size: Optional (width, height) of the device, before rotation (default 800x600); the
+            layout is scaled to it (see layout.py). Also applies to variants
+        selective: If True, supersample only what needs antialiasing (see render_frame); also
+            applies to variants
+        warm_start: If True, first draw every variant from the state saved by the last run
+            (see warm_state.py) while fresh data is fetched, then draw them again from that
+    """
+    variants = expand_variants(output_path, rotate, grayscale, variants, low_memory, strips, encoding,
+                               compress_level, zlib_strategy, size, selective)
+    if snapshot is None:
+        # Trains can roll off in every minute rendered ahead (or since the state was saved),
+        # so keep that many spares
+        spares = max(lookahead, WARM_SPARE_PER_DIRECTION)
+        if warm_start:
+            snapshot = fetch_with_warm_start(variants, spares)
+        else:
+            snapshot = fetch_snapshot(spare_per_direction=spares)
+        save_warm_state(snapshot)
+        if lookahead == 0:
+            snapshot = snapshot.at(snapshot.taken_at)  # Just the rows shown now
+
+    if lookahead > 0:
+        queue_lookahead_frames(snapshot, variants, lookahead, queue_dir)
+        return
+    save_variants(snapshot, variants)
+
+
+def expand_variants(output_path="schedule.png", rotate=False, grayscale=False, variants=None, low_memory=False,
+                    strips=1, encoding='png', compress_level=None, zlib_strategy=None, size=None, selective=False):
+    """Variant dicts for save_variant, with the render and encoding options applied to each
+
+    Arguments are as for create_display_image; without variants, the single image described
+    by output_path, rotate and grayscale.
+    """
+    if variants is None:
+        variants = [{'output_path': output_path, 'rotate': rotate, 'grayscale': grayscale}]
+    if low_memory or strips > 1 or selective:
+        variants = [dict(variant, low_memory=low_memory, strips=strips, selective=selective) for variant in variants]
+    if encoding != 'png' or compress_level is not None or zlib_strategy is not None:
+        variants = [dict(variant, encoding=encoding, compress_level=compress_level, zlib_strategy=zlib_strategy)
+                    for variant in variants]
+    if size is not None:
+        variants = [dict(variant, size=tuple(size)) for variant in variants]
+    return variants
+
+
+def save_variants(snapshot, variants, parallel=True):
+    """Render and save every variant from one snapshot, in worker processes if there are several
+
+    parallel=False renders them in this process, e.g. while another thread is running (a
+    forked worker would inherit whatever locks that thread holds).
+    """
+    if len(variants) == 1 or not parallel:
+        for variant in variants:
+            save_variant(snapshot, variant)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(len(variants), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Each worker receives the pickled snapshot - no worker touches the network
+        for _ in pool.map(save_variant, [snapshot] * len(variants), variants):
+            pass
+
+
+def save_variant(snapshot, variant):
+    """Render one output variant from a snapshot and save it"""
+    img = render_frame(snapshot, rotate=variant['rotate'], grayscale=variant['grayscale'],
+                       low_memory=variant.get('low_memory', False), strips=variant.get('strips', 1),
+                       size=variant.get('size'), selective=variant.get('selective', False))
+    output_path = save_frame(img, variant['output_path'], variant.get('encoding', 'png'),
+                             variant.get('compress_level'), variant.get('zlib_strategy'))
+    del img
+    print(f"Image saved to {output_path}" + (" (rotated 90° CCW)" if variant['rotate'] else ""))
+
+
+def frame_digest(snapshot, variant):
+    """Digest of everything a variant's frame is drawn and encoded from"""
+    options = tuple(variant.get(key) for key in ('rotate', 'grayscale', 'encoding', 'compress_level', 'zlib_strategy',
+                                                 'size', 'selective'))
+    layout = compile_layout(*(variant.get('size') or (WIDTH, HEIGHT)))
+    inputs = tuple(section_inputs(name, snapshot, layout) for name, _, _, _ in frame_sections(layout))
+    return content_digest(SECTION_LAYOUT_VERSION, options, inputs).hex()
+
+
+def queue_lookahead_frames(snapshot, variants, minutes, queue_dir=QUEUE_DIR):
+    """Render the current minute and the next `minutes` minutes of each variant into the frame queue
+
+    Frame 0 is also copied to the variant's output path. Queued frames whose inputs haven't
+    changed since the last run are kept as they are, so a run without new data renders nothing.
+    """
+    queue = FrameQueue(queue_dir)
+    os.makedirs(queue_dir, exist_ok=True)
+    now = snapshot.taken_at
+    minute_start = now.replace(second=0, microsecond=0)
+    rendered = reused = 0
+
+    for variant in variants:
+        name = os.path.splitext(os.path.basename(variant['output_path']))[0]
+        encoding = variant.get('encoding', 'png')
+        for i in range(minutes + 1):
+            # The current minute is drawn as of now; later ones as of the start of their minute
+            when = now if i == 0 else minute_start + timedelta(minutes=i)
+            frame = snapshot.at(when)
+            start = int(minute_start.timestamp()) + 60 * i
+            digest = frame_digest(frame, variant)
+
+            path = queue.current(name, start, digest)
+            if path is None:
+                file = os.path.basename(output_path_for(queue.file_name(name, start), encoding))
+                path = queue.path(file)
+                img = render_frame(frame, rotate=variant['rotate'], grayscale=variant['grayscale'],
+                                   low_memory=variant.get('low_memory', False), strips=variant.get('strips', 1),
+                                   size=variant.get('size'), selective=variant.get('selective', False))
+                # Written under a temporary name so the swapper never copies a partial frame
+                tmp_path = save_frame(img, queue.path(f".{os.getpid()}.{file}"), encoding,
+                                      variant.get('compress_level'), variant.get('zlib_strategy'))
+                os.replace(tmp_path, path)
+                del img
+                queue.add(name, start, start + 60, file, digest)
+                rendered += 1
+            else:
+                reused += 1
+
+            if i == 0:
+                output_path = output_path_for(variant['output_path'], encoding)
+                replace_with_copy(path, output_path)
+                print(f"Image saved to {output_path}" + (" (rotated 90° CCW)" if variant['rotate'] else ""))
+
+    queue.prune(int(minute_start.timestamp()))
+    queue.save()
+    print(f"Frame queue {queue_dir}: rendered {rendered}, unchanged {reused} "
+          f"({minutes} minutes ahead, {len(variants)} variant(s))")
+
+
+def resident_trains():
+    """Train rows for the scheduler: both directions with spares, without the minutes column
+
+    Minutes are recomputed when each frame is drawn (DisplaySnapshot.at), so leaving them out
+    means a refresh that brings no new predictions publishes nothing new.
+    """
+    trains = get_all_trains(limit=4 + 2 * WARM_SPARE_PER_DIRECTION, now=datetime.now(), wait=None)
+    return tuple({key: value for key, value in train.items() if key != 'minutes'} for train in trains)
+
+
+def publish_arrivals(board, trains):
+    """Put train rows on the shared arrivals board for other local readers (see arrivals_board.py)"""
+    stops = {direction: stop_id for stop_id, direction, _ in G_DIRECTIONS}
+    live = any(not train['scheduled'] for train in trains)
+    board.publish([(stops[train['direction']], train['arrival'], train['destination'], train['scheduled'])
+                   for train in trains],
+                  G_ARRIVALS.timestamp if live and G_ARRIVALS.timestamp else datetime.now().timestamp())
+
+
+def resident_sun_times():
+    """Sun times for today and tomorrow, by date"""
+    today = datetime.now(EASTERN).date()
+    tomorrow = today + timedelta(days=1)
+    return {today: fetch_sun_times(today, wait=None), tomorrow: fetch_sun_times(tomorrow, tomorrow=True, wait=None)}
+
+
+def resident_snapshot(board, now):
+    """DisplaySnapshot (with spare rows) at `now` from the scheduler's latest values"""
+    weather = None
+    forecast = board.values.get('weather')
+    sun = board.values.get('sun')
+    if forecast is not None and sun:
+        now_local = now.astimezone(EASTERN)
+        today = now_local.date()
+        # Just after midnight the sun job may not have run for the new date yet; a day-old
+        # sunrise or sunset is off by a minute or two
+        sun_today = sun.get(today) or sun[max(sun)]
+        sun_tomorrow = sun.get(today + timedelta(days=1), sun_today)
+        try:
+            weather = build_weather(now_local, *forecast, sun_today, lambda: sun_tomorrow)
+        except Exception as e:
+            print(f"Error building weather: {e}")
+    return DisplaySnapshot(list(board.values.get('trains', ())), weather, now, stale_labels())
+
+
+def run_resident(variants, warm_start=False):
+    """Keep running, redrawing the board every minute and whenever a source brings new data
+
+    Each source is refreshed in the background on its own period (RESIDENT_PERIODS, see
+    scheduler.py). Only variants whose frame changed are drawn, in this process (forked
+    workers would inherit the refresh threads' locks). Each train refresh is also published
+    on the shared arrivals board (see arrivals_board.py). Runs until interrupted.
+    """
+    import time
+    from scheduler import Scheduler
+
+    try:
+        from arrivals_board import BoardWriter
+
+        board_writer = BoardWriter()
+    except (ImportError, OSError) as e:
+        print(f"Arrivals board unavailable, not publishing it: {e}")
+        board_writer = None
+
+    def trains():
+        rows = resident_trains()
+        if board_writer is not None:
+            publish_arrivals(board_writer, rows)
+        return rows
+
+    scheduler = Scheduler()
+    for name, run in (('trains', trains), ('weather', lambda: fetch_forecast(wait=None)),
+                      ('sun', resident_sun_times)):
+        period, jitter = RESIDENT_PERIODS[name]
+        scheduler.add(name, run, period, jitter)
+    scheduler.start()
+    # Countdowns, hours and temperatures are rasterized once here instead of during the first frames
+    for size in dict.fromkeys(variant.get('size') for variant in variants):
+        prewarm_atlas(size)
+
+    if warm_start:
+        snapshot = warm_snapshot(datetime.now())
+        if snapshot is not None:
+            save_variants(snapshot, variants, parallel=False)
+            print(f"Warm start: first frame drawn from saved state ({', '.join(snapshot.stale)} old)")
+    if not scheduler.wait_ready(RESIDENT_FIRST_WAIT):
+        print(f"Some sources aren't in after {RESIDENT_FIRST_WAIT}s, drawing without them")
+
+    digests = {}
+    saved_version = None
+    try:
+        while True:
+            scheduler.changed.clear()  # Before reading the board, so a later publish wakes the next wait
+            board = scheduler.board  # One read: the whole frame is drawn from the same board
+            now = datetime.now()
+            snapshot = resident_snapshot(board, now)
+            frame = snapshot.at(now)
+            for variant in variants:
+                digest = frame_digest(frame, variant)
+                if digests.get(variant['output_path']) != digest:
+                    save_variant(frame, variant)
+                    digests[variant['output_path']] = digest
+            if board.version != saved_version and board.values:
+                save_warm_state(snapshot)
+                saved_version = board.version
+            # Sleep to the next minute (the clock and countdowns), or until new data comes in
+            scheduler.changed.wait(60 - time.time() % 60 + 0.05)
+    except KeyboardInterrupt:
+        scheduler.stop(timeout=1)
+        print(scheduler.report())
+    finally:
+        if board_writer is not None:
+            board_writer.close()
+
+
+def render_frame(snapshot, rotate=False, grayscale=False, low_memory=False, strips=1, size=None, selective=False):
+    """Draw a frame from a snapshot and return it as a PIL image
+
+    Args:
+        snapshot: DisplaySnapshot with the trains, weather and clock time to show
+        rotate: If True, rotate the image 90 degrees counter-clockwise
+        grayscale: If True, make the image grayscale
+        low_memory: If True (and grayscale), draw straight into a single-channel canvas
+            instead of converting an RGB frame at the end
+        strips: Render the 2x canvas in this many horizontal strips, so only one strip
+            is held in memory at a time
+        size: (width, height) of the frame before rotation; defaults to WIDTH x HEIGHT
+        selective: If True, draw at output resolution and supersample only text, badges, icons
+            and off-grid lines in small tiles (see SelectiveCanvas) instead of a whole 2x canvas.
+            Close to, but not pixel-identical with, the default output (see dev/bench_selective.py)
+    """
+    from PIL import Image, ImageDraw
+
+    # Positions and font sizes for this device size, at 2x resolution for better text antialiasing
+    layout = compile_layout(*(size or (WIDTH, HEIGHT)))
+
+    fonts = load_display_fonts(layout)
+    mode = 'L' if grayscale and low_memory else 'RGB'
+
+    if selective:
+        img = Image.new(mode, (layout.width, layout.height), gray_level(BG_COLOR) if mode == 'L' else BG_COLOR)
+        canvas = SelectiveCanvas(img)
+        draw_frame(canvas, SelectiveDraw(canvas), snapshot, fonts, layout)
+    elif strips > 1:
+        img = render_strips(snapshot, fonts, mode, strips, layout)
+    elif not low_memory:
+        img = render_sections(snapshot, fonts, mode, layout)
+    else:
+        canvas_img = Image.new(mode, (layout.scaled_width, layout.scaled_height),
+                               gray_level(BG_COLOR) if mode == 'L' else BG_COLOR)
+        if mode == 'RGB':
+            draw_frame(canvas_img, ImageDraw.Draw(canvas_img), snapshot, fonts, layout)
+        else:
+            canvas = FrameCanvas(canvas_img)
+            draw_frame(canvas, FrameDraw(canvas), snapshot, fonts, layout)
+
+        # Scale image down to target size for antialiasing
+        img = canvas_img.resize((layout.width, layout.height), Image.Resampling.LANCZOS)
+        del canvas_img  # Free the 2x canvas before rotating/converting
+
+    # Rotate 90 degrees counter-clockwise if requested
+    if rotate:
+        img = img.transpose(Image.Transpose.ROTATE_90)
+
+    if grayscale and img.mode != 'L':
+        img = img.convert("L")  # 8-bit grayscale
+
+    return img
+
+
+# Bump when a section's drawing code changes, so tiles saved by an older version are redrawn
+SECTION_LAYOUT_VERSION = 2
+# Output rows either side of a row that LANCZOS reads when downscaling (its support is 3 px)
+LANCZOS_REACH = 3
+
+
+def frame_sections(layout):
+    """(name, top, bottom, draw function) of each cached section in 2x rows, in paste order"""
+    return [
+        ('trains', 0, layout.footer_top, draw_train_rows),
+        ('time_bar', layout.time_bar_top, layout.scaled_height, draw_time_bar),
+        # The gradient lines end on the time bar's first row, so the forecast tile includes it
+        ('forecast', layout.footer_top, layout.time_bar_top + 1, draw_forecast),
+    ]
+
+
+@lru_cache(maxsize=None)
+def frame_bands(layout):
+    """Split the output rows into bands of (top, bottom, sections the band's pixels depend on)
+
+    An output row depends on every section within the LANCZOS reach of it, so a band only
+    needs to be downscaled again when one of its sections was redrawn.
     """
+    scale = layout.scale
+    sections = frame_sections(layout)
+    bands = []
+    for row in range(layout.height):
+        reach_top = (row - LANCZOS_REACH) * scale
+        reach_bottom = (row + 1 + LANCZOS_REACH) * scale
+        depends_on = tuple(sorted(name for name, top, bottom, _ in sections
+                                  if top < reach_bottom and bottom > reach_top))
+        if bands and bands[-1][2] == depends_on:
+            bands[-1][1] = row + 1
+        else:
+            bands.append([row, row + 1, depends_on])
+    return tuple(tuple(band) for band in bands)
+
+
+def section_inputs(name, snapshot, layout):
+    """Everything a section's pixels are drawn from"""
+    weather = snapshot.weather
+    if name == 'trains':
+        # Only what is drawn; a prediction shifting by a few seconds doesn't change the row
+        return tuple((train['minutes'], train['destination'], train.get('scheduled')) for train in snapshot.trains)
+    if name == 'time_bar':
+        weather_inputs = None
+        if weather and weather.text:
+            weather_inputs = (weather.text, weather.icon, weather.sun_icon, weather.sun_time)
+        return (snapshot.taken_at.strftime("%I:%M %p"), tuple(snapshot.stale), weather_inputs)
+    if name == 'forecast':
+        if not (weather and weather.text and weather.hourly):
+            return None
+        hourly = tuple((hour.start_ts, hour.label, hour.temp, hour.icon)
+                       for hour in weather.hourly[:layout.forecast_max_hours])
+        settings = (SUNRISE_GRADIENT_NIGHT_COLOR, SUNRISE_GRADIENT_DAY_COLOR, SUNRISE_GRADIENT_WIDTH_HOURS,
+                    SUNSET_GRADIENT_ENABLED, SHOW_DEBUG_LINES)
+        return (hourly, weather.sunrise_ts, weather.sunset_ts, settings)
+    raise ValueError(f"Unknown section: {name}")
+
+
+def render_sections(snapshot, fonts, mode, layout):
+    """Render the downscaled frame, redrawing only the sections whose inputs changed
+
+    Sections (train rows, time bar, forecast graph) are drawn at 2x into tiles cached under a
+    digest of their inputs. Output bands are downscaled again only if a section they depend
+    on was redrawn; the forecast tile and its band are also kept on disk for one-shot runs.
+    The result is pixel-identical to drawing and downscaling the whole frame.
+    """
+    from PIL import Image
+
+    scale = layout.scale
+    scaled_width = layout.scaled_width
+    bg = gray_level(BG_COLOR) if mode == 'L' else BG_COLOR
+    persisted = {'forecast'}  # Changes about once an hour; everything else changes every minute
+    prefix = f"{mode}-{layout.width}x{layout.height}"  # Each device size keeps its own tiles
+
+    font_paths = fonts[0]
+    digests = {}
+    tiles = {}
+    redrawn = []
+    for name, top, bottom, draw_section in frame_sections(layout):
+        digest = content_digest(SECTION_LAYOUT_VERSION, name, mode, layout.key, font_paths,
+                                section_inputs(name, snapshot, layout))
+        digests[name] = digest
+        tile = TILES.get(f"{prefix}-{name}", digest, persist=name in persisted)
+        if tile is None:
+            tile = Image.new(mode, (scaled_width, bottom - top), bg)
+            canvas = FrameCanvas(tile, top)
+            draw = FrameDraw(canvas)
+            draw_footer_background(draw, layout)
+            draw_section(canvas, draw, snapshot, fonts, layout)
+            TILES.put(f"{prefix}-{name}", digest, tile, persist=name in persisted)
+            redrawn.append(name)
+        tiles[name] = (top, tile)
+
+    img = Image.new(mode, (layout.width, layout.height), bg)
+    canvas_img = None
+    for i, (top, bottom, depends_on) in enumerate(frame_bands(layout)):
+        band_name = f"{prefix}-band{i}"
+        band_digest = content_digest(band_name, *(digests[name] for name in depends_on))
+        persist = set(depends_on) <= persisted
+        band = TILES.get(band_name, band_digest, persist=persist)
+        if band is None:
+            if canvas_img is None:
+                # Assemble the 2x frame from the tiles only when some band needs downscaling
+                canvas_img = Image.new(mode, (scaled_width, layout.scaled_height), bg)
+                for name, _, _, _ in frame_sections(layout):
+                    canvas_img.paste(tiles[name][1], (0, tiles[name][0]))
+            band = canvas_img.resize((layout.width, bottom - top), Image.Resampling.LANCZOS,
+                                     box=(0, top * scale, scaled_width, bottom * scale))
+            TILES.put(band_name, band_digest, band, persist=persist)
+        img.paste(band, (0, top))
+    del canvas_img
+
+    if "--timing" in sys.argv:  # A diagnostic, like the request timings
+        print(f"Redrew sections: {', '.join(redrawn) or 'none'}")
+    return img
+
+
+# Extra 2x rows rendered above/below each strip so the LANCZOS kernel (3 output px = 6
+# canvas px at 2x) sees the same neighbours it would in a full-frame downscale
+STRIP_OVERLAP = 8
+
+
+def render_strips(snapshot, fonts, mode, strips, layout):
+    """Render the frame one horizontal strip at a time and assemble the downscaled result"""
+    from PIL import Image
+
+    scale = layout.scale
+    scaled_width = layout.scaled_width
+    scaled_height = layout.scaled_height
+    bg = gray_level(BG_COLOR) if mode == 'L' else BG_COLOR
+
+    img = Image.new(mode, (layout.width, layout.height), bg)
+    rows_per_strip = -(-layout.height // strips)  # Ceiling division
+    for top in range(0, layout.height, rows_per_strip):
+        bottom = min(top + rows_per_strip, layout.height)
+        canvas_top = max(0, top * scale - STRIP_OVERLAP)
+        canvas_bottom = min(scaled_height, bottom * scale + STRIP_OVERLAP)
+
+        strip = Image.new(mode, (scaled_width, canvas_bottom - canvas_top), bg)
+        canvas = FrameCanvas(strip, canvas_top)
+        draw_frame(canvas, FrameDraw(canvas), snapshot, fonts, layout)
+
+        # Downscale only the strip's own rows; the overlap feeds the filter at the edges
+        part = strip.resize((layout.width, bottom - top), Image.Resampling.LANCZOS,
+                            box=(0, top * scale - canvas_top, scaled_width, bottom * scale - canvas_top))
+        del strip
+        img.paste(part, (0, top))
+        del part
+    return img
+
+
+def gray_level(color):
+    """Luminance of an RGB color, using the same weights as PIL's convert("L")"""
+    r, g, b = color[:3]
+    return (r * 19595 + g * 38470 + b * 7471 + 0x8000) >> 16
+
+
+class FrameCanvas:
+    """Stand-in for the 2x canvas when it is grayscale and/or only a horizontal strip
+
+    Accepts full-frame coordinates and RGB colors like the normal canvas, and shifts/converts
+    them for the underlying image
+    """
+
+    def __init__(self, img, y_offset=0):
+        self.img = img
+        self.y_offset = y_offset
+
+    def color(self, fill):
+        if self.img.mode == 'L' and isinstance(fill, tuple):
+            return gray_level(fill)
+        return fill
+
+    def paste(self, im, box, mask=None):
+        if len(box) == 2:
+            box = (box[0], box[1] - self.y_offset)
+        else:
+            box = (box[0], box[1] - self.y_offset, box[2], box[3] - self.y_offset)
+        self.img.paste(self.color(im), box, mask)
+
+
+class FrameDraw:
+    """ImageDraw wrapper for a FrameCanvas (only the primitives draw_frame uses)"""
+
+    def __init__(self, canvas):
+        from PIL import ImageDraw
+
+        self.canvas = canvas
+        self.draw = ImageDraw.Draw(canvas.img)
+        self.y_offset = canvas.y_offset
+        self.height = canvas.img.height
+
+    def text(self, xy, text, fill=None, **kwargs):
+        self.draw.text((xy[0], xy[1] - self.y_offset), text, fill=self.canvas.color(fill), **kwargs)
+
+    def line(self, xy, fill=None, width=0):
+        points = [(x, y - self.y_offset) for x, y in xy]
+        if all(y < -width for _, y in points) or all(y > self.height + width for _, y in points):
+            return  # Entirely outside this strip
+        self.draw.line(points, fill=self.canvas.color(fill), width=width)
+
+    def rectangle(self, xy, fill=None, **kwargs):
+        x0, y0, x1, y1 = xy
+        self.draw.rectangle([x0, y0 - self.y_offset, x1, y1 - self.y_offset], fill=self.canvas.color(fill), **kwargs)
 
-    # Create image at 2x resolution for better text antialiasing
-    SCALE = 2
-    SCALED_WIDTH = WIDTH * SCALE
-    SCALED_HEIGHT = HEIGHT * SCALE
 
-    img = Image.new('RGB', (SCALED_WIDTH, SCALED_HEIGHT), BG_COLOR)
-    draw = ImageDraw.Draw(img)
+# 2x pixels of padding around a supersampled tile so its downscale sees the same empty
+# neighbourhood as a full-frame downscale would (LANCZOS_REACH output pixels)
+TILE_PAD = 2 * LANCZOS_REACH
+MAX_NATIVE_MASKS = 1024
+
+
+@lru_cache(maxsize=None)
+def line_offset(width, vertical, reverse):
+    """Where PIL starts a horizontal/vertical line of this width, relative to its center line
+
+    Even widths are off center, to one side or the other depending on the direction the
+    line is drawn in, so this asks PIL rather than assume.
+    """
+    from PIL import Image, ImageDraw
+
+    center = width + 4
+    ends = [(center, 0), (center, 4)]
+    if reverse:
+        ends.reverse()
+    if not vertical:
+        ends = [(y, x) for x, y in ends]
+    probe = Image.new('L', (2 * center, 5) if vertical else (5, 2 * center))
+    ImageDraw.Draw(probe).line(ends, fill=255, width=width)
+    bbox = probe.getbbox()
+    return (bbox[0] if vertical else bbox[1]) - center
+
+
+def coverage_spans(start, end):
+    """Split the 2x range [start, end) into output pixel spans of (first, end, 2x pixels covered of 2)"""
+    spans = []
+    if start % 2:
+        spans.append((start // 2, start // 2 + 1, 1))
+    if (start + 1) // 2 < end // 2:
+        spans.append(((start + 1) // 2, end // 2, 2))
+    if end % 2 and end // 2 >= (start + 1) // 2:
+        spans.append((end // 2, end // 2 + 1, 1))
+    return spans
+
+
+@lru_cache(maxsize=64)
+def coverage_mask(width, height, value):
+    from PIL import Image
+
+    return Image.new('L', (width, height), value)
+
+
+class SelectiveCanvas:
+    """Output-resolution canvas that accepts the same 2x coordinates as the normal canvas
+
+    Only what needs antialiasing (text, badges, icons, lines off the pixel grid) is drawn at 2x,
+    into a small tile that is downscaled with LANCZOS and composited; flat rectangles and
+    grid-aligned lines are filled at output resolution directly (see SelectiveDraw). Downscaled
+    glyph atlas masks are cached by mask and pixel parity, so repeated strings cost a paste.
+    """
+
+    scale = 2
+    native_masks = OrderedDict()  # (id(source), x parity, y parity) -> (source, downscaled)
+
+    def __init__(self, img):
+        self.img = img
+
+    def color(self, fill):
+        if self.img.mode == 'L' and isinstance(fill, tuple):
+            return gray_level(fill)
+        return fill
+
+    def paste_native(self, im, xy, mask=None):
+        """Paste an image that is already at output resolution"""
+        self.img.paste(im, xy, mask)
+
+    def downscaled(self, source, x, y, cache=False):
+        """(image, output x, output y) of a 2x image at 2x position (x, y), downscaled in a padded tile"""
+        from PIL import Image
+
+        key = (id(source), x % 2, y % 2)
+        entry = self.native_masks.get(key) if cache else None
+        if entry is None:
+            # Pad to even 2x coordinates on both sides so tile pixels line up with output pixels
+            left = TILE_PAD + x % 2
+            top = TILE_PAD + y % 2
+            width = left + source.width + TILE_PAD
+            height = top + source.height + TILE_PAD
+            width += width % 2
+            height += height % 2
+            tile = Image.new(source.mode, (width, height), 0)
+            tile.paste(source, (left, top))  # A straight copy, alpha included
+            entry = (source, tile.resize((width // 2, height // 2), Image.Resampling.LANCZOS))
+            if cache:
+                # The entry holds on to the source, so its id can't be reused while cached
+                self.native_masks[key] = entry
+                if len(self.native_masks) > MAX_NATIVE_MASKS:
+                    self.native_masks.popitem(last=False)
+        else:
+            self.native_masks.move_to_end(key)
+        return entry[1], (x - x % 2 - TILE_PAD) // 2, (y - y % 2 - TILE_PAD) // 2
+
+    def paste(self, im, box, mask=None):
+        x, y = box[0], box[1]
+        if isinstance(im, (tuple, int)):
+            # A solid color through a coverage mask (text from the glyph atlas)
+            self.composite(im, (x, y), mask, cache=True)
+        else:
+            # An image, e.g. an icon through its own alpha; LANCZOS on RGBA premultiplies
+            small, out_x, out_y = self.downscaled(im, x, y)
+            self.img.paste(small.convert(self.img.mode), (out_x, out_y), small if mask is not None else None)
+
+    def composite(self, fill, xy, mask, cache=False):
+        """Fill a color through a 2x coverage mask at 2x position xy"""
+        small, out_x, out_y = self.downscaled(mask, xy[0], xy[1], cache)
+        self.img.paste(self.color(fill), (out_x, out_y), small)
+
+
+class SelectiveDraw:
+    """ImageDraw stand-in for a SelectiveCanvas (only the primitives draw_frame uses)"""
+
+    column_step = 2  # draw_forecast fills its gradient one output column at a time
+
+    def __init__(self, canvas):
+        from PIL import ImageDraw
+
+        self.canvas = canvas
+        self.draw = ImageDraw.Draw(canvas.img)
+
+    def text(self, xy, text, fill=None, font=None, anchor=None):
+        ATLAS.draw_text(self.canvas, xy, text, fill, font, anchor=anchor or 'la')
+
+    def rectangle(self, xy, fill=None):
+        """Fill a 2x box (inclusive corners) at output resolution
+
+        Output pixels the box covers completely are filled; an edge on an odd 2x coordinate
+        covers half an output pixel, which is blended in at that coverage (what the 2x
+        downscale would give, minus the filter's ringing).
+        """
+        x0, y0, x1, y1 = xy
+        fill = self.canvas.color(fill)
+        for left, right, x_cover in coverage_spans(x0, x1 + 1):
+            for top, bottom, y_cover in coverage_spans(y0, y1 + 1):
+                if x_cover * y_cover == 4:
+                    self.draw.rectangle([left, top, right - 1, bottom - 1], fill=fill)
+                else:
+                    self.canvas.img.paste(fill, (left, top, right, bottom),
+                                          coverage_mask(right - left, bottom - top, 255 * x_cover * y_cover // 4))
+
+    def line(self, xy, fill=None, width=0):
+        from PIL import Image, ImageDraw
+
+        (x0, y0), (x1, y1) = xy
+        width = max(width, 1)
+        if x0 == x1:
+            # Horizontal and vertical lines are boxes
+            left = x0 + line_offset(width, True, y1 < y0)
+            self.rectangle([left, min(y0, y1), left + width - 1, max(y0, y1)], fill)
+            return
+        if y0 == y1:
+            top = y0 + line_offset(width, False, x1 < x0)
+            self.rectangle([min(x0, x1), top, max(x0, x1), top + width - 1], fill)
+            return
+
+        # Anything else is antialiased: draw its coverage at 2x in a tile of its own
+        left = min(x0, x1) - width
+        top = min(y0, y1) - width
+        mask = Image.new('L', (abs(x1 - x0) + 2 * width + 1, abs(y1 - y0) + 2 * width + 1), 0)
+        ImageDraw.Draw(mask).line([(x0 - left, y0 - top), (x1 - left, y1 - top)], fill=255, width=width)
+        self.canvas.composite(fill, (left, top), mask)
+
+
+@lru_cache(maxsize=16)
+def load_display_fonts(layout):
+    """Load the fonts named in the layout: (font paths, {name: font})
+
+    Memoized per layout (compile_layout returns one per size), so a resident process prints
+    the font diagnostics once per size instead of every frame. Callers must not change the dict.
+    """
+    from PIL import ImageFont
 
     # Get cross-platform font paths
     font_paths = get_font_paths()
@@ -358,99 +1291,125 @@ def create_display_image(output_path="schedule.png", rotate=False, grayscale=Fal
     print(f"Font paths: {font_paths}")
 
     # Load TTF fonts (no index parameter needed)
+    fonts = {}
     try:
         print(f"Loading TTF fonts from: {font_paths['bold']}")
-        header_font = ImageFont.truetype(font_paths['bold'], 26 * SCALE)
-        line_font = ImageFont.truetype(font_paths['bold'], 48 * SCALE)
-        dest_font = ImageFont.truetype(font_paths['bold'], 48 * SCALE)
-        time_font = ImageFont.truetype(font_paths['bold'], 40 * SCALE)
-        small_font = ImageFont.truetype(font_paths['bold'], 23 * SCALE)
+        for name, (style, size) in layout.fonts.items():
+            fonts[name] = load_font(font_paths[style], size)
         print(f"Fonts loaded successfully!")
     except Exception as e:
-        # Fallback to default font if fonts are not available
-        print(f"ERROR: Could not load fonts ({e})")
-        import traceback
-        traceback.print_exc()
-        print("Falling back to default font")
-        header_font = ImageFont.load_default()
-        line_font = ImageFont.load_default()
-        dest_font = ImageFont.load_default()
-        time_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
-
-    # Get all trains (2 per direction = 4 total)
-    all_trains = get_all_trains(limit=4)
-
-    # Calculate even spacing for trains
-    footer_height = 250
-    available_height = HEIGHT - footer_height
-    num_trains = len(all_trains)
-    line_height = (available_height // num_trains) * SCALE
-
-    # Starting Y position for train listings
-    y_pos = (line_height // 2) - (30 * SCALE)  # Center vertically in each section
-
-    # Draw all trains in sorted order
-    for idx, train in enumerate(all_trains):
+        if 'small' in fonts and 'header' in fonts:
+            # Only an hourly forecast font is missing (e.g. no regular face); reuse the bold ones
+            fonts.setdefault('hourly_time', fonts['small'])
+            fonts.setdefault('hourly_temp', fonts['header'])
+        else:
+            # Fallback to default font if fonts are not available
+            print(f"ERROR: Could not load fonts ({e})")
+            import traceback
+            traceback.print_exc()
+            print("Falling back to default font")
+            fonts = {name: ImageFont.load_default() for name in layout.fonts}
+
+    return font_paths, fonts
+
+
+def replay(ops, img, draw, fonts=None, values=None):
+    """Execute a layout display list (see layout.py), filling text fields from values"""
+    for op in ops:
+        kind = op[0]
+        if kind == 'rect':
+            _, box, role = op
+            draw.rectangle(list(box), fill=COLOR_ROLES[role])
+        elif kind == 'line':
+            _, points, role, width = op
+            draw.line(list(points), fill=COLOR_ROLES[role], width=width)
+        elif kind == 'badge':
+            _, (x, y), radius, role, text, font = op
+            draw_antialiased_circle(img, x, y, radius, COLOR_ROLES[role], text, fonts[1][font])
+        elif kind == 'text':
+            _, xy, field, font, role, anchor, from_atlas = op
+            text = values.get(field)
+            if text is None:
+                continue
+            if from_atlas:
+                ATLAS.draw_text(img, xy, text, fill=COLOR_ROLES[role], font=fonts[1][font], anchor=anchor or 'la')
+            else:
+                draw.text(xy, text, fill=COLOR_ROLES[role], font=fonts[1][font], anchor=anchor)
+        else:
+            raise ValueError(f"Unknown layout operation: {kind}")
+
+
+def draw_frame(img, draw, snapshot, fonts, layout):
+    """Draw the whole frame at 2x onto img (a PIL image or FrameCanvas) using draw"""
+    draw_train_rows(img, draw, snapshot, fonts, layout)
+    draw_footer_background(draw, layout)
+    draw_time_bar(img, draw, snapshot, fonts, layout)
+    draw_forecast(img, draw, snapshot, fonts, layout)
+
+
+@lru_cache(maxsize=64)
+def fit_text(text, font, max_width):
+    """text, or as much of it as fits in max_width followed by an ellipsis"""
+    if font.getlength(text) <= max_width:
+        return text
+    while text and font.getlength(text + "…") > max_width:
+        text = text[:-1]
+    return text.rstrip(" -") + "…"
+
+
+def draw_train_rows(img, draw, snapshot, fonts, layout):
+    """Train rows (everything above the footer)"""
+    trains = snapshot.trains
+    values = {}
+    if not trains:
+        values['no_data'] = "No train data"
+    dest_font = fonts[1]['dest']
+    dest_width = layout.destination_right - layout.x(layout.row['destination'][0])
+    for i, train in enumerate(trains):
         minutes = train['minutes']
-        destination = train['destination']
-
-        # Draw G train circle with anti-aliasing and centered text
-        circle_x = 70 * SCALE
-        circle_y = y_pos + 30 * SCALE
-        circle_radius = 32 * SCALE
-        draw_antialiased_circle(img, circle_x, circle_y, circle_radius,
-                               LINE_COLOR, "G", line_font)
-
-        # Draw destination
-        draw.text((140 * SCALE, y_pos + 18), destination, fill=TEXT_COLOR, font=dest_font)
-
-        # Draw arrival time - center-aligned at a fixed x position
-        time_text = str(minutes) if minutes > 0 else "Now"
-        # Fixed x position for center of time numbers (about 100px from right edge)
-        time_center_x = SCALED_WIDTH - 62 * SCALE
-
+        values[f'destination{i}'] = fit_text(train['destination'], dest_font, dest_width)
         if minutes > 0:
-            draw.text((time_center_x, y_pos + 22 * SCALE), time_text, fill=TEXT_COLOR, font=time_font, anchor='mm')
+            values[f'minutes{i}'] = str(minutes)
+            # Rows from the static schedule say "SCHED" instead so they aren't mistaken for live data
+            values[f'unit{i}'] = "SCHED" if train.get('scheduled') else "MIN"
         else:
-            draw.text((SCALED_WIDTH - 85 * SCALE, y_pos + 32 * SCALE), time_text, fill=TEXT_COLOR, font=time_font, anchor='mm')
+            values[f'now{i}'] = "Now"
+    replay(layout.row_ops(len(trains)), img, draw, fonts, values)
 
-        # Draw "min" label if not "Now" - center-aligned below the number
-        if minutes > 0:
-            draw.text((time_center_x, y_pos + 55 * SCALE), "MIN", fill=TEXT_COLOR, font=small_font, anchor='mm')
 
-        y_pos += line_height
+def draw_footer_background(draw, layout):
+    """Footer and time bar backgrounds"""
+    replay(layout.footer_ops, None, draw)
 
-        # Draw dark separator line between trains (not after the last one)
-        if idx < len(all_trains) - 1:
-            # Separator goes exactly at the row boundary
-            line_y = (idx + 1) * line_height
-            draw.line([(0, line_y), (SCALED_WIDTH, line_y)],
-                     fill=SEPARATOR_COLOR, width=8 * SCALE)
 
-    # Draw thin footer at bottom with time in bottom left
-    footer_height_scaled = footer_height * SCALE
-    draw.rectangle([0, SCALED_HEIGHT - footer_height_scaled, SCALED_WIDTH, SCALED_HEIGHT], fill=HEADER_BG)
-
-    # Draw bottom time bar with different color
-    time_bar_height = 50 * SCALE
-    draw.rectangle([0, SCALED_HEIGHT - time_bar_height, SCALED_WIDTH, SCALED_HEIGHT], fill=TIME_BAR_BG)
+def draw_time_bar(img, draw, snapshot, fonts, layout):
+    """Clock, stale marker and next sun event in the bottom bar"""
+    font_paths, font = fonts
+    small_font = font['small']
 
     # Add current time in bottom left corner
-    current_time = datetime.now().strftime("%I:%M %p")
-    draw.text((20 * SCALE, SCALED_HEIGHT - 35 * SCALE), current_time, fill=HEADER_TEXT, font=small_font)
+    current_time = snapshot.taken_at.strftime("%I:%M %p")
+    replay(layout.time_bar_ops, img, draw, fonts, {'clock': current_time})
+
+    # Mark sources drawn from cached data that has aged out (upstream down or circuit open)
+    if snapshot.stale:
+        clock_bbox = ATLAS.textbbox(small_font, current_time)
+        stale_text = "STALE: " + ", ".join(snapshot.stale).upper()
+        clock_x, clock_y = layout.clock_xy
+        draw.text((clock_x + clock_bbox[2] + layout.stale_gap, clock_y), stale_text,
+                  fill=SUNRISE_GRADIENT_DAY_COLOR, font=small_font)
 
     # Add weather in bottom right corner with icons
-    weather_data = get_weather()
-    if weather_data and weather_data[0]:  # Check if weather_text is not empty
-        weather_text, main_icon, sun_icon, sun_time, hourly_forecast, sunrise_local, sunset_local = weather_data
+    weather = snapshot.weather
+    if weather and weather.text:  # Check if weather_text is not empty
+        weather_text, main_icon, sun_icon, sun_time = weather.text, weather.icon, weather.sun_icon, weather.sun_time
 
         # Get icon directory path
         script_dir = os.path.dirname(os.path.abspath(__file__))
         icon_dir = os.path.join(script_dir, "icons")
 
         # Render weather icons at 2x scale
-        icon_size = 30 * SCALE  # Icon size in scaled pixels
+        icon_size = layout.bar_icon_size  # Icon size in scaled pixels
 
         # Load main weather icon (pre-converted to white PNG)
         main_icon_path = os.path.join(icon_dir, f"{main_icon}.png")
@@ -461,14 +1420,14 @@ def create_display_image(output_path="schedule.png", rotate=False, grayscale=Fal
         sun_icon_img = load_png_icon(sun_icon_path, icon_size)
 
         # Calculate positions from right edge
-        margin = 20 * SCALE
-        icon_spacing = 8 * SCALE
+        margin = layout.bar_margin
+        icon_spacing = layout.bar_icon_spacing
 
         # Measure text widths
-        weather_bbox = draw.textbbox((0, 0), weather_text, font=small_font)
+        weather_bbox = ATLAS.textbbox(small_font, weather_text)
         weather_width = weather_bbox[2] - weather_bbox[0]
 
-        sun_time_bbox = draw.textbbox((0, 0), sun_time, font=small_font)
+        sun_time_bbox = ATLAS.textbbox(small_font, sun_time)
         sun_time_width = sun_time_bbox[2] - sun_time_bbox[0]
 
         # Layout from right to left: sun_time + sun_icon + spacing + weather_text + main_icon
@@ -476,15 +1435,15 @@ def create_display_image(output_path="schedule.png", rotate=False, grayscale=Fal
                       icon_spacing * 2 + weather_width + icon_spacing + icon_size)
 
         # Starting x position
-        start_x = SCALED_WIDTH - total_width - margin
+        start_x = layout.scaled_width - total_width - margin
 
         # Draw main weather icon
-        y_icon = SCALED_HEIGHT - 38 * SCALE #(footer_height_scaled - icon_size) // 2 
+        y_icon = layout.bar_icon_y
         #img.paste(main_icon_img, (start_x, y_icon), main_icon_img)
 
         # Draw weather text
         text_x = start_x + icon_size + icon_spacing
-        text_y = SCALED_HEIGHT - 35 * SCALE
+        text_y = layout.bar_text_y
         #draw.text((text_x, text_y), weather_text, fill=HEADER_TEXT, font=small_font)
 
         # Draw sun icon
@@ -493,319 +1452,374 @@ def create_display_image(output_path="schedule.png", rotate=False, grayscale=Fal
 
         # Draw sun time
         sun_time_x = sun_icon_x + icon_size + icon_spacing
-        draw.text((sun_time_x, text_y), sun_time, fill=HEADER_TEXT, font=small_font)
-
-        # Draw 8-hour forecast horizontally in the center of the footer
-        if hourly_forecast:
-            # Create fonts for hourly forecast (regular for time, bold for temp)
-            try:
-                hourly_time_font = ImageFont.truetype(font_paths['regular'], 18 * SCALE)
-                hourly_temp_font = ImageFont.truetype(font_paths['bold'], 22 * SCALE)
-            except:
-                hourly_time_font = small_font
-                hourly_temp_font = header_font
-
-            # Calculate available space for hourly forecast
-            # Place it in the middle section of the footer
-            left_margin = 20 * SCALE
-            right_margin = SCALED_WIDTH - 20 * SCALE
-            forecast_width = right_margin - left_margin
-
-            # Calculate spacing for hours
-            num_hours = len(hourly_forecast)
-            hour_spacing = forecast_width // num_hours
-
-            # Find min and max temperatures for scaling
-            temps = [hour_data['temp'] for hour_data in hourly_forecast]
-            min_temp = min(temps)
-            max_temp = max(temps)
-            temp_range = max_temp - min_temp if max_temp > min_temp else 1
-
-            # Y positions for the hourly forecast
-            forecast_y_time = SCALED_HEIGHT - 85 * SCALE  # Time labels at bottom
-            # Available vertical space for temperature graph (between weather info and time labels)
-            graph_top = SCALED_HEIGHT - footer_height_scaled + 20 * SCALE
-            graph_bottom = SCALED_HEIGHT - 165 * SCALE
-            graph_height = graph_bottom - graph_top
-
-            # Draw gradient background for sunrise transition
-            graph_area_top = SCALED_HEIGHT - footer_height_scaled
-            graph_area_bottom = SCALED_HEIGHT - time_bar_height
-
-            for x in range(SCALED_WIDTH):
-                # Determine what time this x position represents
-
-                # If we're before left_margin, use the first hour's color
-                if x < left_margin:
-                    # Use the time of the first hour in the forecast
-                    if len(hourly_forecast) > 0:
-                        first_hour = hourly_forecast[0]
-                        first_hour_time = first_hour.get('hour_time')
-                        if first_hour_time and sunrise_local:
-                            current_time_estimate = first_hour_time.timestamp()
-
-                            sunrise_timestamp = sunrise_local.timestamp()
-                            sunset_timestamp = sunset_local.timestamp() if sunset_local else None
-
-                            # Determine color based on time of day
-                            if current_time_estimate < sunrise_timestamp:
-                                color = SUNRISE_GRADIENT_NIGHT_COLOR
-                            elif sunset_timestamp and current_time_estimate >= sunset_timestamp:
-                                color = SUNRISE_GRADIENT_NIGHT_COLOR
-                            else:
-                                color = SUNRISE_GRADIENT_DAY_COLOR
-
-                            draw.line([(x, graph_area_top), (x, graph_area_bottom)], fill=color, width=1)
-                    continue
+        ATLAS.draw_text(img, (sun_time_x, text_y), sun_time, fill=HEADER_TEXT, font=small_font)
+
+
+def draw_forecast(img, draw, snapshot, fonts, layout):
+    """Hourly forecast graph with the sunrise/sunset gradient behind it (footer, above the time bar)"""
+    font_paths, font = fonts
+    hourly_time_font = font['hourly_time']
+    hourly_temp_font = font['hourly_temp']
+
+    # Draw the hourly forecast horizontally across the footer
+    weather = snapshot.weather
+    if not (weather and weather.text and weather.hourly):
+        return
+    hourly_forecast = weather.hourly[:layout.forecast_max_hours]
+    sunrise_timestamp = weather.sunrise_ts
+    sunset_timestamp = weather.sunset_ts
+    icon_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+
+    # Columns across the footer, one per hour (label_x[i] is the center of hour i)
+    left_margin = layout.forecast_left
+    right_margin = layout.forecast_right
+    num_hours = len(hourly_forecast)
+    hour_spacing, label_x = layout.hour_columns(num_hours)
+
+    # Find min and max temperatures for scaling
+    temps = [hour.temp for hour in hourly_forecast]
+    min_temp = min(temps)
+    max_temp = max(temps)
+    temp_range = max_temp - min_temp if max_temp > min_temp else 1
+
+    # Y positions for the hourly forecast
+    forecast_y_time = layout.forecast_label_y  # Time labels at bottom
+    # Available vertical space for temperature graph (between weather info and time labels)
+    graph_top = layout.graph_top
+    graph_bottom = layout.graph_bottom
+    graph_height = graph_bottom - graph_top
+
+    # Draw gradient background for sunrise transition
+    graph_area_top = layout.footer_top
+    graph_area_bottom = layout.time_bar_top
+
+    # Columns are a 2x pixel wide here, or an output pixel on a SelectiveDraw (which fills
+    # flat areas at output resolution)
+    step = getattr(draw, 'column_step', 1)
+
+    for x in range(0, layout.scaled_width, step):
+        # Determine what time this x position represents
+
+        # If we're before left_margin, use the first hour's color
+        if x < left_margin:
+            # Use the time of the first hour in the forecast
+            if len(hourly_forecast) > 0:
+                first_hour = hourly_forecast[0]
+                if sunrise_timestamp:
+                    current_time_estimate = first_hour.start_ts
+
+                    # Determine color based on time of day
+                    if current_time_estimate < sunrise_timestamp:
+                        color = SUNRISE_GRADIENT_NIGHT_COLOR
+                    elif sunset_timestamp and current_time_estimate >= sunset_timestamp:
+                        color = SUNRISE_GRADIENT_NIGHT_COLOR
+                    else:
+                        color = SUNRISE_GRADIENT_DAY_COLOR
 
-                # If we're beyond right_margin, use the last hour's color
-                if x > right_margin:
-                    # Use the time of the last hour in the forecast
-                    if len(hourly_forecast) > 0:
-                        last_hour = hourly_forecast[-1]
-                        last_hour_time = last_hour.get('hour_time')
-                        if last_hour_time and sunrise_local:
-                            current_time_estimate = last_hour_time.timestamp()
-
-                            sunrise_timestamp = sunrise_local.timestamp()
-                            sunset_timestamp = sunset_local.timestamp() if sunset_local else None
-
-                            # Determine color based on time of day
-                            if current_time_estimate < sunrise_timestamp:
-                                color = SUNRISE_GRADIENT_NIGHT_COLOR
-                            elif sunset_timestamp and current_time_estimate >= sunset_timestamp:
-                                color = SUNRISE_GRADIENT_NIGHT_COLOR
-                            else:
-                                color = SUNRISE_GRADIENT_DAY_COLOR
-
-                            draw.line([(x, graph_area_top), (x, graph_area_bottom)], fill=color, width=1)
-                    continue
+                    draw.rectangle([x, graph_area_top, x + step - 1, graph_area_bottom], fill=color)
+            continue
 
-                # Find which two hour labels this x position is between
-                # Hour labels are at: left_margin + i * hour_spacing + hour_spacing // 2
+        # If we're beyond right_margin, use the last hour's color
+        if x > right_margin:
+            # Use the time of the last hour in the forecast
+            if len(hourly_forecast) > 0:
+                last_hour = hourly_forecast[-1]
+                if sunrise_timestamp:
+                    current_time_estimate = last_hour.start_ts
 
-                # Find the closest hour labels on either side
-                closest_hour_before = -1
-                closest_hour_after = -1
+                    # Determine color based on time of day
+                    if current_time_estimate < sunrise_timestamp:
+                        color = SUNRISE_GRADIENT_NIGHT_COLOR
+                    elif sunset_timestamp and current_time_estimate >= sunset_timestamp:
+                        color = SUNRISE_GRADIENT_NIGHT_COLOR
+                    else:
+                        color = SUNRISE_GRADIENT_DAY_COLOR
 
-                for i in range(len(hourly_forecast)):
-                    label_x = left_margin + i * hour_spacing + hour_spacing // 2
-                    if label_x <= x:
-                        closest_hour_before = i
-                    if label_x > x and closest_hour_after == -1:
-                        closest_hour_after = i
-                        break
+                    draw.rectangle([x, graph_area_top, x + step - 1, graph_area_bottom], fill=color)
+            continue
 
-                # If we're before the first label, skip
-                if closest_hour_before == -1:
-                    continue
+        # Find which two hour labels this x position is between
 
-                hour_data = hourly_forecast[closest_hour_before]
-                hour_time = hour_data.get('hour_time')
+        # Find the closest hour labels on either side
+        closest_hour_before = -1
+        closest_hour_after = -1
 
-                if not hour_time or not sunrise_local:
-                    continue
+        for i in range(len(hourly_forecast)):
+            if label_x[i] <= x:
+                closest_hour_before = i
+            if label_x[i] > x and closest_hour_after == -1:
+                closest_hour_after = i
+                break
 
-                # Handle position after the last label
-                if closest_hour_after == -1:
-                    # We're after the last label - use the last hour's time
-                    current_time_estimate = hour_time.timestamp()
-                elif closest_hour_after < len(hourly_forecast):
-                    next_hour_time = hourly_forecast[closest_hour_after].get('hour_time')
+        # If we're before the first label, skip
+        if closest_hour_before == -1:
+            continue
 
-                    if next_hour_time:
-                        # Calculate progress between the two label positions
-                        label_before_x = left_margin + closest_hour_before * hour_spacing + hour_spacing // 2
-                        label_after_x = left_margin + closest_hour_after * hour_spacing + hour_spacing // 2
+        hour_ts = hourly_forecast[closest_hour_before].start_ts
 
-                        progress = (x - label_before_x) / (label_after_x - label_before_x)
+        if not sunrise_timestamp:
+            continue
 
-                        # Interpolate the time
-                        time_diff = (next_hour_time - hour_time).total_seconds()
-                        current_time_estimate = hour_time.timestamp() + (time_diff * progress)
-                    else:
-                        current_time_estimate = hour_time.timestamp()
-                else:
-                    continue
+        # Handle position after the last label
+        if closest_hour_after == -1:
+            # We're after the last label - use the last hour's time
+            current_time_estimate = hour_ts
+        elif closest_hour_after < len(hourly_forecast):
+            next_hour_ts = hourly_forecast[closest_hour_after].start_ts
 
-                sunrise_timestamp = sunrise_local.timestamp()
-                sunset_timestamp = sunset_local.timestamp() if sunset_local else None
+            if next_hour_ts:
+                # Calculate progress between the two label positions
+                label_before_x = label_x[closest_hour_before]
+                label_after_x = label_x[closest_hour_after]
 
-                # Determine which gradient to apply based on proximity to sunrise/sunset
-                gradient_half_width = SUNRISE_GRADIENT_WIDTH_HOURS / 2
+                progress = (x - label_before_x) / (label_after_x - label_before_x)
 
-                # Check distance from sunrise
-                time_diff_from_sunrise = (current_time_estimate - sunrise_timestamp) / 3600  # hours
-                in_sunrise_gradient = abs(time_diff_from_sunrise) <= gradient_half_width
+                # Interpolate the time
+                time_diff = next_hour_ts - hour_ts
+                current_time_estimate = hour_ts + (time_diff * progress)
+            else:
+                current_time_estimate = hour_ts
+        else:
+            continue
+
+        # Determine which gradient to apply based on proximity to sunrise/sunset
+        gradient_half_width = SUNRISE_GRADIENT_WIDTH_HOURS / 2
+
+        # Check distance from sunrise
+        time_diff_from_sunrise = (current_time_estimate - sunrise_timestamp) / 3600  # hours
+        in_sunrise_gradient = abs(time_diff_from_sunrise) <= gradient_half_width
+
+        # Check distance from sunset
+        in_sunset_gradient = False
+        if SUNSET_GRADIENT_ENABLED and sunset_timestamp:
+            time_diff_from_sunset = (current_time_estimate - sunset_timestamp) / 3600  # hours
+            in_sunset_gradient = abs(time_diff_from_sunset) <= gradient_half_width
+
+        # Apply gradients
+        if in_sunrise_gradient:
+            # Sunrise gradient: dark to light
+            if time_diff_from_sunrise < -gradient_half_width:
+                color = SUNRISE_GRADIENT_NIGHT_COLOR
+            elif time_diff_from_sunrise > gradient_half_width:
+                color = SUNRISE_GRADIENT_DAY_COLOR
+            else:
+                gradient_pos = (time_diff_from_sunrise + gradient_half_width) / SUNRISE_GRADIENT_WIDTH_HOURS
+                r = int(SUNRISE_GRADIENT_NIGHT_COLOR[0] + (SUNRISE_GRADIENT_DAY_COLOR[0] - SUNRISE_GRADIENT_NIGHT_COLOR[0]) * gradient_pos)
+                g = int(SUNRISE_GRADIENT_NIGHT_COLOR[1] + (SUNRISE_GRADIENT_DAY_COLOR[1] - SUNRISE_GRADIENT_NIGHT_COLOR[1]) * gradient_pos)
+                b = int(SUNRISE_GRADIENT_NIGHT_COLOR[2] + (SUNRISE_GRADIENT_DAY_COLOR[2] - SUNRISE_GRADIENT_NIGHT_COLOR[2]) * gradient_pos)
+                color = (r, g, b)
+        elif in_sunset_gradient:
+            # Sunset gradient: light to dark
+            if time_diff_from_sunset < -gradient_half_width:
+                color = SUNRISE_GRADIENT_DAY_COLOR
+            elif time_diff_from_sunset > gradient_half_width:
+                color = SUNRISE_GRADIENT_NIGHT_COLOR
+            else:
+                gradient_pos = (time_diff_from_sunset + gradient_half_width) / SUNRISE_GRADIENT_WIDTH_HOURS
+                # Reverse the interpolation for sunset (light to dark)
+                r = int(SUNRISE_GRADIENT_DAY_COLOR[0] + (SUNRISE_GRADIENT_NIGHT_COLOR[0] - SUNRISE_GRADIENT_DAY_COLOR[0]) * gradient_pos)
+                g = int(SUNRISE_GRADIENT_DAY_COLOR[1] + (SUNRISE_GRADIENT_NIGHT_COLOR[1] - SUNRISE_GRADIENT_DAY_COLOR[1]) * gradient_pos)
+                b = int(SUNRISE_GRADIENT_DAY_COLOR[2] + (SUNRISE_GRADIENT_NIGHT_COLOR[2] - SUNRISE_GRADIENT_DAY_COLOR[2]) * gradient_pos)
+                color = (r, g, b)
+        else:
+            # Outside gradient zones - use solid color based on time of day
+            if current_time_estimate < sunrise_timestamp:
+                # Before sunrise - night
+                color = SUNRISE_GRADIENT_NIGHT_COLOR
+            elif sunset_timestamp and current_time_estimate >= sunset_timestamp:
+                # After sunset - night
+                color = SUNRISE_GRADIENT_NIGHT_COLOR
+            else:
+                # Between sunrise and sunset (or no sunset data) - day
+                color = SUNRISE_GRADIENT_DAY_COLOR
+
+        # Draw vertical line for this x position
+        draw.rectangle([x, graph_area_top, x + step - 1, graph_area_bottom], fill=color)
+
+    # DEBUG: Draw a thin orange line at the exact sunrise time
+    if SHOW_DEBUG_LINES and sunrise_timestamp and len(hourly_forecast) > 0:
+        # Calculate x position for sunrise
+        for i in range(len(hourly_forecast) - 1):
+            hour_start = hourly_forecast[i].start_ts
+            hour_end = hourly_forecast[i + 1].start_ts
+
+            if hour_start <= sunrise_timestamp < hour_end:
+                # Sunrise is between these two hours
+                time_into_segment = (sunrise_timestamp - hour_start) / (hour_end - hour_start)
+
+                # Calculate sunrise x position (account for centered labels)
+                hour_i_label_x = label_x[i]
+                hour_i_plus_1_label_x = label_x[i + 1]
+                sunrise_x = hour_i_label_x + time_into_segment * (hour_i_plus_1_label_x - hour_i_label_x)
+
+                # Draw thin orange line at sunrise
+                draw.line([(sunrise_x, graph_area_top), (sunrise_x, graph_area_bottom)], fill=(255, 165, 0), width=layout.debug_line_width)
+                break
 
-                # Check distance from sunset
-                in_sunset_gradient = False
-                if SUNSET_GRADIENT_ENABLED and sunset_timestamp:
-                    time_diff_from_sunset = (current_time_estimate - sunset_timestamp) / 3600  # hours
-                    in_sunset_gradient = abs(time_diff_from_sunset) <= gradient_half_width
+    # DEBUG: Draw a thin blue line at the exact sunset time
+    if SHOW_DEBUG_LINES and sunset_timestamp and len(hourly_forecast) > 0:
+        # Calculate x position for sunset
+        for i in range(len(hourly_forecast) - 1):
+            hour_start = hourly_forecast[i].start_ts
+            hour_end = hourly_forecast[i + 1].start_ts
 
-                # Apply gradients
-                if in_sunrise_gradient:
-                    # Sunrise gradient: dark to light
-                    if time_diff_from_sunrise < -gradient_half_width:
-                        color = SUNRISE_GRADIENT_NIGHT_COLOR
-                    elif time_diff_from_sunrise > gradient_half_width:
-                        color = SUNRISE_GRADIENT_DAY_COLOR
-                    else:
-                        gradient_pos = (time_diff_from_sunrise + gradient_half_width) / SUNRISE_GRADIENT_WIDTH_HOURS
-                        r = int(SUNRISE_GRADIENT_NIGHT_COLOR[0] + (SUNRISE_GRADIENT_DAY_COLOR[0] - SUNRISE_GRADIENT_NIGHT_COLOR[0]) * gradient_pos)
-                        g = int(SUNRISE_GRADIENT_NIGHT_COLOR[1] + (SUNRISE_GRADIENT_DAY_COLOR[1] - SUNRISE_GRADIENT_NIGHT_COLOR[1]) * gradient_pos)
-                        b = int(SUNRISE_GRADIENT_NIGHT_COLOR[2] + (SUNRISE_GRADIENT_DAY_COLOR[2] - SUNRISE_GRADIENT_NIGHT_COLOR[2]) * gradient_pos)
-                        color = (r, g, b)
-                elif in_sunset_gradient:
-                    # Sunset gradient: light to dark
-                    if time_diff_from_sunset < -gradient_half_width:
-                        color = SUNRISE_GRADIENT_DAY_COLOR
-                    elif time_diff_from_sunset > gradient_half_width:
-                        color = SUNRISE_GRADIENT_NIGHT_COLOR
-                    else:
-                        gradient_pos = (time_diff_from_sunset + gradient_half_width) / SUNRISE_GRADIENT_WIDTH_HOURS
-                        # Reverse the interpolation for sunset (light to dark)
-                        r = int(SUNRISE_GRADIENT_DAY_COLOR[0] + (SUNRISE_GRADIENT_NIGHT_COLOR[0] - SUNRISE_GRADIENT_DAY_COLOR[0]) * gradient_pos)
-                        g = int(SUNRISE_GRADIENT_DAY_COLOR[1] + (SUNRISE_GRADIENT_NIGHT_COLOR[1] - SUNRISE_GRADIENT_DAY_COLOR[1]) * gradient_pos)
-                        b = int(SUNRISE_GRADIENT_DAY_COLOR[2] + (SUNRISE_GRADIENT_NIGHT_COLOR[2] - SUNRISE_GRADIENT_DAY_COLOR[2]) * gradient_pos)
-                        color = (r, g, b)
-                else:
-                    # Outside gradient zones - use solid color based on time of day
-                    if current_time_estimate < sunrise_timestamp:
-                        # Before sunrise - night
-                        color = SUNRISE_GRADIENT_NIGHT_COLOR
-                    elif sunset_timestamp and current_time_estimate >= sunset_timestamp:
-                        # After sunset - night
-                        color = SUNRISE_GRADIENT_NIGHT_COLOR
-                    else:
-                        # Between sunrise and sunset (or no sunset data) - day
-                        color = SUNRISE_GRADIENT_DAY_COLOR
+            if hour_start <= sunset_timestamp < hour_end:
+                # Sunset is between these two hours
+                time_into_segment = (sunset_timestamp - hour_start) / (hour_end - hour_start)
 
-                # Draw vertical line for this x position
-                draw.line([(x, graph_area_top), (x, graph_area_bottom)], fill=color, width=1)
-
-            # DEBUG: Draw a thin orange line at the exact sunrise time
-            if SHOW_DEBUG_LINES and sunrise_local and len(hourly_forecast) > 0:
-                first_hour = hourly_forecast[0].get('hour_time')
-                if first_hour:
-                    # Calculate x position for sunrise
-                    for i in range(len(hourly_forecast) - 1):
-                        hour_start = hourly_forecast[i].get('hour_time')
-                        hour_end = hourly_forecast[i + 1].get('hour_time')
-
-                        if hour_start and hour_end and hour_start <= sunrise_local < hour_end:
-                            # Sunrise is between these two hours
-                            time_into_segment = (sunrise_local.timestamp() - hour_start.timestamp()) / (hour_end.timestamp() - hour_start.timestamp())
-
-                            # Calculate sunrise x position (account for centered labels)
-                            hour_i_label_x = left_margin + i * hour_spacing + hour_spacing // 2
-                            hour_i_plus_1_label_x = left_margin + (i + 1) * hour_spacing + hour_spacing // 2
-                            sunrise_x = hour_i_label_x + time_into_segment * (hour_i_plus_1_label_x - hour_i_label_x)
-
-                            # Draw thin orange line at sunrise
-                            draw.line([(sunrise_x, graph_area_top), (sunrise_x, graph_area_bottom)], fill=(255, 165, 0), width=2 * SCALE)
-                            break
-
-            # DEBUG: Draw a thin blue line at the exact sunset time
-            if SHOW_DEBUG_LINES and sunset_local and len(hourly_forecast) > 0:
-                first_hour = hourly_forecast[0].get('hour_time')
-                if first_hour:
-                    # Calculate x position for sunset
-                    for i in range(len(hourly_forecast) - 1):
-                        hour_start = hourly_forecast[i].get('hour_time')
-                        hour_end = hourly_forecast[i + 1].get('hour_time')
-
-                        if hour_start and hour_end and hour_start <= sunset_local < hour_end:
-                            # Sunset is between these two hours
-                            time_into_segment = (sunset_local.timestamp() - hour_start.timestamp()) / (hour_end.timestamp() - hour_start.timestamp())
-
-                            # Calculate sunset x position (account for centered labels)
-                            hour_i_label_x = left_margin + i * hour_spacing + hour_spacing // 2
-                            hour_i_plus_1_label_x = left_margin + (i + 1) * hour_spacing + hour_spacing // 2
-                            sunset_x = hour_i_label_x + time_into_segment * (hour_i_plus_1_label_x - hour_i_label_x)
-
-                            # Draw thin blue line at sunset
-                            draw.line([(sunset_x, graph_area_top), (sunset_x, graph_area_bottom)], fill=(0, 150, 255), width=2 * SCALE)
-                            break
-
-            # Draw each hour
-            for i, hour_data in enumerate(hourly_forecast):
-                x_pos = left_margin + i * hour_spacing + hour_spacing // 2
-
-                # Determine if this hour is during day or night
-                hour_time = hour_data.get('hour_time')  # This should be a datetime object
-                is_night = hour_time and (hour_time < sunrise_local or hour_time >= sunset_local)
-
-                # Get weather icon for this hour
-                condition_icon = get_weather_icon(hour_data['condition'])
-
-                # Override with night icons if it's nighttime
-                if is_night:
-                    if 'clear' in condition_icon or 'sunny' in condition_icon:
-                        condition_icon = 'clear-night'
-                    elif 'partly-cloudy' in condition_icon:
-                        condition_icon = 'partly-cloudy'  # Could add a night variant if you have one
-                    elif 'cloudy' in condition_icon:
-                        condition_icon = 'cloudy'  # Cloudy looks the same day or night
-
-                icon_path = os.path.join(icon_dir, f"{condition_icon}.png")
-                hourly_icon_size = 28 * SCALE
-                hourly_icon_img = load_png_icon(icon_path, hourly_icon_size)
-
-                # Draw weather icon above time label
-                icon_y = SCALED_HEIGHT - 120 * SCALE
-                img.paste(hourly_icon_img, (x_pos - hourly_icon_size // 2, icon_y), hourly_icon_img)
-
-                # Draw time label at fixed position at bottom
-                time_text = hour_data['time']
-                time_bbox = draw.textbbox((0, 0), time_text, font=hourly_time_font)
-                time_width = time_bbox[2] - time_bbox[0]
-                draw.text((x_pos - time_width // 2, forecast_y_time),
-                         time_text, fill=HEADER_TEXT, font=hourly_time_font)
-
-                # Draw temperature at Y position based on temperature value
-                # Higher temp = higher up (lower Y value)
-                temp = hour_data['temp']
-                # Normalize temperature to 0-1 range
-                if temp_range > 0:
-                    normalized_temp = (temp - min_temp) / temp_range
-                else:
-                    normalized_temp = 0.5
+                # Calculate sunset x position (account for centered labels)
+                hour_i_label_x = label_x[i]
+                hour_i_plus_1_label_x = label_x[i + 1]
+                sunset_x = hour_i_label_x + time_into_segment * (hour_i_plus_1_label_x - hour_i_label_x)
 
-                # Map to Y position (invert because higher Y is lower on screen)
-                temp_y = graph_bottom - (normalized_temp * graph_height)
+                # Draw thin blue line at sunset
+                draw.line([(sunset_x, graph_area_top), (sunset_x, graph_area_bottom)], fill=(0, 150, 255), width=layout.debug_line_width)
+                break
 
-                temp_text = f"{temp}°"
-                temp_bbox = draw.textbbox((0, 0), temp_text, font=hourly_temp_font)
-                temp_width = temp_bbox[2] - temp_bbox[0]
-                temp_height = temp_bbox[3] - temp_bbox[1]
-                draw.text((x_pos - temp_width // 2, temp_y),
-                         temp_text, fill=HEADER_TEXT, font=hourly_temp_font)
+    # Draw each hour
+    for i, hour in enumerate(hourly_forecast):
+        x_pos = label_x[i]
+
+        # Icon was resolved (including day/night) when the forecast was parsed
+        icon_path = os.path.join(icon_dir, f"{hour.icon}.png")
+        hourly_icon_size = layout.forecast_icon_size
+        hourly_icon_img = load_png_icon(icon_path, hourly_icon_size)
+
+        # Draw weather icon above time label
+        icon_y = layout.forecast_icon_y
+        img.paste(hourly_icon_img, (x_pos - hourly_icon_size // 2, icon_y), hourly_icon_img)
+
+        # Draw time label at fixed position at bottom
+        time_text = hour.label
+        time_bbox = ATLAS.textbbox(hourly_time_font, time_text)
+        time_width = time_bbox[2] - time_bbox[0]
+        ATLAS.draw_text(img, (x_pos - time_width // 2, forecast_y_time),
+                        time_text, fill=HEADER_TEXT, font=hourly_time_font)
+
+        # Draw temperature at Y position based on temperature value
+        # Higher temp = higher up (lower Y value)
+        temp = hour.temp
+        # Normalize temperature to 0-1 range
+        if temp_range > 0:
+            normalized_temp = (temp - min_temp) / temp_range
+        else:
+            normalized_temp = 0.5
 
-                # Draw thin line from just above icon to just below temperature
-                line_start_y = icon_y - 5 * SCALE  # Just above icon
-                line_end_y = temp_y + temp_height + 10 * SCALE  # Just below temperature
-                draw.line([(x_pos, line_start_y), (x_pos, line_end_y)],
-                         fill=WEATHER_LINE, width=3 * SCALE)
+        # Map to Y position (invert because higher Y is lower on screen)
+        # Whole pixels (at 2x) so the temperature label can come from the glyph atlas
+        temp_y = round(graph_bottom - (normalized_temp * graph_height))
 
-    # Scale image down to target size for antialiasing
-    img = img.resize((WIDTH, HEIGHT), Image.Resampling.LANCZOS)
+        temp_text = f"{temp}°"
+        temp_bbox = ATLAS.textbbox(hourly_temp_font, temp_text)
+        temp_width = temp_bbox[2] - temp_bbox[0]
+        temp_height = temp_bbox[3] - temp_bbox[1]
+        ATLAS.draw_text(img, (x_pos - temp_width // 2, temp_y),
+                        temp_text, fill=HEADER_TEXT, font=hourly_temp_font)
 
-    # Rotate 90 degrees counter-clockwise if requested
-    if rotate:
-        img = img.transpose(Image.Transpose.ROTATE_90)
+        # Draw thin line from just above icon to just below temperature
+        line_start_y = icon_y - layout.stem_above_icon  # Just above icon
+        line_end_y = temp_y + temp_height + layout.stem_below_temp  # Just below temperature
+        draw.line([(x_pos, line_start_y), (x_pos, line_end_y)],
+                 fill=WEATHER_LINE, width=layout.stem_width)
 
-    if grayscale:
-        img = img.convert("L")  # 8-bit grayscale
 
-    # Save image
-    img.save(output_path)
-    print(f"Image saved to {output_path}" + (" (rotated 90° CCW)" if rotate else ""))
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where resource is unavailable)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
 
 
 if __name__ == "__main__":
     # Check for --rotate flag
     rotate = "--rotate" in sys.argv or "-r" in sys.argv
     grayscale = "--grayscale" in sys.argv or "-g" in sys.argv
-    create_display_image(rotate=rotate, grayscale=grayscale)
+
+    # --variants landscape,portrait,grayscale renders several outputs from one fetch
+    variants = None
+    if "--variants" in sys.argv:
+        names = sys.argv[sys.argv.index("--variants") + 1].split(',')
+        variants = [VARIANT_PRESETS[name] for name in names]
+
+    # --low-memory draws grayscale output on a single-channel canvas; --strips N renders the
+    # 2x canvas N horizontal strips at a time (e.g. on the Kindle)
+    low_memory = "--low-memory" in sys.argv
+    strips = 1
+    if "--strips" in sys.argv:
+        strips = int(sys.argv[sys.argv.index("--strips") + 1])
+
+    # --encoding png-palette16|png-gray4|pgm, --compress-level 0-9 and --zlib-strategy NAME
+    # trade file size against encode/decode time (see dev/bench_encoding.py)
+    encoding = 'png'
+    if "--encoding" in sys.argv:
+        encoding = sys.argv[sys.argv.index("--encoding") + 1]
+    compress_level = None
+    if "--compress-level" in sys.argv:
+        compress_level = int(sys.argv[sys.argv.index("--compress-level") + 1])
+    zlib_strategy = None
+    if "--zlib-strategy" in sys.argv:
+        zlib_strategy = sys.argv[sys.argv.index("--zlib-strategy") + 1]
+
+    # --lookahead K also renders the next K minutes into the frame queue (--queue-dir DIR)
+    # for swap_frame.sh to show one per minute
+    lookahead = 0
+    if "--lookahead" in sys.argv:
+        lookahead = int(sys.argv[sys.argv.index("--lookahead") + 1])
+    queue_dir = QUEUE_DIR
+    if "--queue-dir" in sys.argv:
+        queue_dir = sys.argv[sys.argv.index("--queue-dir") + 1]
+
+    # --selective supersamples only text, badges and icons instead of the whole 2x canvas
+    selective = "--selective" in sys.argv
+
+    # --warm-start draws the first frame from the last run's saved state while fresh data
+    # loads (e.g. right after the device boots)
+    warm_start = "--warm-start" in sys.argv
+
+    # --size WxH lays the board out for another panel (e.g. 1072x1448); taller than wide
+    # switches to the portrait layout
+    size = None
+    if "--size" in sys.argv:
+        size = tuple(int(value) for value in sys.argv[sys.argv.index("--size") + 1].lower().split('x'))
+
+    def refresh():
+        create_display_image(rotate=rotate, grayscale=grayscale, variants=variants,
+                             low_memory=low_memory, strips=strips, encoding=encoding,
+                             compress_level=compress_level, zlib_strategy=zlib_strategy,
+                             lookahead=lookahead, queue_dir=queue_dir, size=size, selective=selective,
+                             warm_start=warm_start)
+
+    # --resident keeps running: each source is refreshed in the background on its own period
+    # and the board is redrawn every minute (see scheduler.py)
+    if "--resident" in sys.argv:
+        run_resident(expand_variants(rotate=rotate, grayscale=grayscale, variants=variants, low_memory=low_memory,
+                                     strips=strips, encoding=encoding, compress_level=compress_level,
+                                     zlib_strategy=zlib_strategy, size=size, selective=selective),
+                     warm_start=warm_start)
+    # --profile records this refresh with cProfile; --profile-sample adds (or, without
+    # --profile, runs only) the wall-clock sampler. Reports go to --profile-dir DIR
+    # (default profiles/); see profiling.py
+    elif "--profile" in sys.argv or "--profile-sample" in sys.argv:
+        from profiling import profile_call
+
+        profile_dir = None
+        if "--profile-dir" in sys.argv:
+            profile_dir = sys.argv[sys.argv.index("--profile-dir") + 1]
+        profile_call("mta_display", refresh, cprofile="--profile" in sys.argv,
+                     sample="--profile-sample" in sys.argv, output_dir=profile_dir)
+    else:
+        refresh()
+
+    # --timing lists every upstream request with its duration (and, as each frame is drawn,
+    # which sections were redrawn)
+    if "--timing" in sys.argv:
+        print(http_transport.timing_report())
+
+    if low_memory or strips > 1:
+        peak = peak_rss_mb()
+        if peak is not None:
+            print(f"Peak RSS: {peak:.1f} MB")
@@ -0,0 +1,224 @@
+"""
+On-demand profiling of one refresh (--profile / --profile-sample)
+Shared by mta_display.py and the SwiftBar plugin. profile_call() runs one refresh under
+cProfile and/or a sampling profiler and writes, to PROFILE_DIR (or the given directory):
+
+    <name>-<time>.prof            cProfile stats (python -m pstats, snakeviz, ...)
+    <name>-<time>.cprofile.folded collapsed stacks rebuilt from cProfile's call graph
+    <name>-<time>.sample.folded   collapsed stacks from the sampler (exact stacks, wall time)
+    <name>-<time>.txt             top functions by own and cumulative time
+
+The .folded files are one "frame;frame;frame weight" line per stack, the input format of
+flamegraph.pl, speedscope and inferno. cProfile's weights are microseconds, and its stacks
+are apportioned by call edge, so they are approximate. The sampler's weights are sample
+counts. It interrupts the main thread on a wall-clock timer (SIGALRM), so time spent waiting
+on the network shows up too. Its overhead is low enough to leave on for a real refresh, but
+running it together with cProfile measures cProfile's overhead as well.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+SAMPLE_INTERVAL = 0.002  # seconds between samples
+TOP_FUNCTIONS = 25
+MIN_EDGE_SECONDS = 0.0001  # cProfile call paths cheaper than this are left out of the folded output
+
+
+def frame_label(filename, lineno, name):
+    """One flame graph frame, e.g. 'from_bytes (arrival_table.py:45)'"""
+    if filename == '~':  # cProfile's name for built-ins
+        return name.replace(';', ',')
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(';', ',')
+
+
+class Sampler:
+    """Records the main thread's stack every `interval` seconds of wall time
+
+    Uses a SIGALRM interval timer where available, so samples are taken in the main thread
+    between bytecodes, with no extra thread contending for the GIL. Elsewhere (Windows) a
+    background thread reads the stack through sys._current_frames().
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()  # tuple of frame labels, outermost first -> samples
+        self.samples = 0
+        self._labels = {}  # code object -> frame label
+        self._thread_id = threading.main_thread().ident
+        self._running = False
+        self._previous_handler = None
+        self._thread = None
+
+    def record(self, frame):
+        stack = []
+        # Stacks start at the profiled function: stop at profile_call and everything above it
+        while frame is not None and frame.f_code is not profile_call.__code__:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                # Labelled by the function's first line, like cProfile, so samples aggregate per function
+                label = self._labels[code] = frame_label(code.co_filename, code.co_firstlineno, code.co_name)
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def _on_signal(self, signum, frame):
+        self.record(frame)
+
+    def _run_thread(self):
+        while self._running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.record(frame)
+
+    def start(self):
+        self._running = True
+        import signal
+
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGALRM, self._on_signal)
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(target=self._run_thread, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            return
+        import signal
+
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous_handler)
+
+    def folded(self):
+        return [f"{';'.join(stack)} {count}" for stack, count in sorted(self.stacks.items()) if stack]
+
+    def summary(self, limit=TOP_FUNCTIONS):
+        """Top functions by samples on top of the stack (own) and anywhere on it (inclusive)"""
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            if stack:
+                own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        total = self.samples or 1
+        lines = [f"Sampler: {self.samples} samples every {self.interval * 1000:g} ms (wall time)",
+                 f"{'own':>7} {'incl':>7}  function"]
+        for label, count in own.most_common(limit):
+            lines.append(f"{count / total:7.1%} {inclusive[label] / total:7.1%}  {label}")
+        return lines
+
+
+def cprofile_folded(stats):
+    """Approximate collapsed stacks from a pstats.Stats call graph, weighted in microseconds
+
+    cProfile only records caller -> callee edges, so each function's own time is split
+    across the paths leading to it in proportion to the time spent along each edge.
+    """
+    entries = stats.stats  # func -> (primitive calls, calls, own time, cumulative time, {caller: edge})
+    callees = defaultdict(list)
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))  # edge[3]: cumulative time of calls from caller
+    roots = [func for func, entry in entries.items() if not entry[4]]
+
+    weights = Counter()
+
+    def walk(func, path, labels, share):
+        _cc, _nc, own, cumulative, _callers = entries[func]
+        labels = labels + (frame_label(*func),)
+        if own * share * 1e6 >= 1:
+            weights[';'.join(labels)] += own * share * 1e6
+        for callee, edge_time in callees.get(func, ()):
+            callee_total = entries[callee][3]
+            if callee in path or callee_total <= 0 or edge_time * share < MIN_EDGE_SECONDS:
+                continue  # Recursion is already counted in the callee's own entry
+            walk(callee, path | {callee}, labels, share * edge_time / callee_total)
+
+    for root in roots:
+        walk(root, {root}, (), 1.0)
+    return [f"{stack} {round(weight)}" for stack, weight in sorted(weights.items()) if round(weight) > 0]
+
+
+def cprofile_summary(stats, limit=TOP_FUNCTIONS):
+    import io
+
+    lines = []
+    for order, title in (('tottime', "own time"), ('cumulative', "cumulative time")):
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats(order).print_stats(limit)
+        lines.append(f"cProfile: top {limit} by {title}")
+        # Skip pstats' header lines up to the column titles
+        body = out.getvalue().splitlines()
+        start = next((i for i, line in enumerate(body) if line.lstrip().startswith('ncalls')), 0)
+        lines.extend(line for line in body[start:] if line.strip())
+        lines.append("")
+    return lines
+
+
+def write_lines(path, lines):
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def profile_call(name, action, cprofile=True, sample=False, output_dir=None, interval=SAMPLE_INTERVAL):
+    """Run action() under the chosen profilers, write the reports and return action's result
+
+    Reports are written even if action raises. A summary is printed to stderr, since stdout
+    may be the output itself (the SwiftBar menu).
+    """
+    output_dir = output_dir or PROFILE_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+    profiler = None
+    if cprofile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    sampler = Sampler(interval) if sample else None
+
+    start = time.perf_counter()
+    if sampler:
+        sampler.start()
+    if profiler:
+        profiler.enable()
+    try:
+        return action()
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+        elapsed = time.perf_counter() - start
+
+        summary = [f"Profile of {name}: {elapsed * 1000:.0f} ms wall time", ""]
+        written = []
+        if profiler:
+            import pstats
+
+            profiler.dump_stats(base + ".prof")
+            stats = pstats.Stats(base + ".prof")
+            write_lines(base + ".cprofile.folded", cprofile_folded(stats))
+            written += [base + ".prof", base + ".cprofile.folded"]
+            summary += cprofile_summary(stats)
+        if sampler:
+            write_lines(base + ".sample.folded", sampler.folded())
+            written.append(base + ".sample.folded")
+            summary += sampler.summary() + [""]
+        write_lines(base + ".txt", summary)
+        written.append(base + ".txt")
+
+        print("\n".join(summary[:2] + summary[2:2 + TOP_FUNCTIONS + 2]), file=sys.stderr)
+        print("Profile written to:\n  " + "\n  ".join(written), file=sys.stderr)
@@ -0,0 +1,124 @@
+"""
+Background refresh of each data source on its own period, for a resident generator
+Each job (trains, weather, sun times) runs in its own thread: once right away, then
+`period` seconds after each run plus up to `jitter` seconds at random, so restarts and
+several displays don't hit an upstream in step. The jitter is only ever added, so a job
+whose source is cached for `period` seconds (see source_cache.py) finds it due each run.
+
+Each result is published as a new Board, an immutable set of the latest value of every
+job. The renderer reads `scheduler.board` once per frame and draws from that without
+taking a lock: a publish builds a whole new Board and swaps one reference, so a reader
+sees the old board or the new one, never a mix.
+
+    scheduler = Scheduler()
+    scheduler.add('trains', fetch_trains, period=30, jitter=5)
+    scheduler.add('weather', fetch_forecast, period=15 * 60, jitter=60)
+    scheduler.start()
+    scheduler.wait_ready(10)
+    board = scheduler.board      # latest values, e.g. board.values['trains']
+
+A job that fails keeps its last published value, and is retried on its next run.
+"""
+
+import random
+import sys
+import threading
+import time
+from types import MappingProxyType
+
+
+class Board:
+    """The latest value of each job, with its version and when it was refreshed
+
+    Never changed once published; values, versions (how many times each job's value changed)
+    and refreshed_at (epoch seconds of each job's last successful run) are read-only
+    mappings. version counts the changes of every job together.
+    """
+    __slots__ = ('values', 'versions', 'refreshed_at', 'version')
+
+    def __init__(self, values, versions, refreshed_at, version):
+        self.values = MappingProxyType(values)
+        self.versions = MappingProxyType(versions)
+        self.refreshed_at = MappingProxyType(refreshed_at)
+        self.version = version
+
+
+class Job:
+    """One source's refresh: run() returns the value to publish (raises on failure)"""
+
+    def __init__(self, name, run, period, jitter=0.0):
+        self.name = name
+        self.run = run
+        self.period = period
+        self.jitter = jitter
+        self.runs = 0
+        self.failures = 0
+        self.ran_once = threading.Event()  # set after the first attempt, successful or not
+
+    def next_delay(self):
+        return self.period + random.uniform(0, self.jitter)
+
+
+class Scheduler:
+    """Runs each job on its own period in a daemon thread and publishes results as Boards"""
+
+    def __init__(self):
+        self.jobs = []
+        self.board = Board({}, {}, {}, 0)
+        self.changed = threading.Event()  # set on each publish that changed a value
+        self._publish_lock = threading.Lock()  # Writers only; readers just take self.board
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def add(self, name, run, period, jitter=0.0):
+        self.jobs.append(Job(name, run, period, jitter))
+
+    def start(self):
+        for job in self.jobs:
+            thread = threading.Thread(target=self._loop, args=(job,), name=f"refresh-{job.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Stop after the runs in progress; waits up to `timeout` seconds for them"""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def wait_ready(self, timeout):
+        """Wait up to `timeout` seconds for every job's first run; returns whether all finished"""
+        deadline = time.monotonic() + timeout
+        return all(job.ran_once.wait(max(0.0, deadline - time.monotonic())) for job in self.jobs)
+
+    def publish(self, name, value):
+        with self._publish_lock:
+            board = self.board
+            changed = name not in board.values or board.values[name] != value
+            values = dict(board.values)
+            versions = dict(board.versions)
+            refreshed_at = dict(board.refreshed_at)
+            values[name] = value
+            refreshed_at[name] = time.time()
+            if changed:
+                versions[name] = versions.get(name, 0) + 1
+            self.board = Board(values, versions, refreshed_at, board.version + changed)
+        if changed:  # An unchanged value only updates refreshed_at, without waking the renderer
+            self.changed.set()
+
+    def _loop(self, job):
+        while not self._stopping.is_set():
+            try:
+                value = job.run()
+            except Exception as e:
+                job.failures += 1
+                print(f"{job.name}: refresh failed, keeping the last value ({e})", file=sys.stderr)
+            else:
+                job.runs += 1
+                self.publish(job.name, value)
+            job.ran_once.set()
+            self._stopping.wait(job.next_delay())
+
+    def report(self):
+        """One line per job: period, refreshes and failures"""
+        return "\n".join(f"{job.name}: every {job.period:g}s (+{job.jitter:g}s), {job.runs} refreshes, "
+                         f"{job.failures} failures" for job in self.jobs)
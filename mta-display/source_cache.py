@@ -0,0 +1,187 @@
+"""
+Stale-while-revalidate cache and circuit breaker for each upstream data source
+The last good payload of every source is kept on disk (so one-shot runs share it). A frame is
+drawn from it right away while a refresh runs in the background, and an upstream that keeps
+failing is left alone for a cool-down period instead of being retried on every render.
+
+    payload, stale = G_FEED.get(lambda: http_transport.get_bytes(G_FEED_URL))
+
+`stale` is True once the payload is older than the source's max_age, or when it is the last
+payload for another key (e.g. yesterday's sun times) because upstream is down; the display
+marks those.
+"""
+
+import os
+import pickle
+import sys
+import threading
+import time
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".source_cache")
+REVALIDATE_WAIT = 1.0  # seconds a caller waits for a background refresh before using the cached payload
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a source's breaker is open and there is no cached payload to fall back on"""
+
+
+class DataSource:
+    """One upstream (G feed, ferry, NWS forecast, ...) with its cache and breaker state
+
+    Args:
+        name: File name of the on-disk cache entry
+        label: Short name shown in the display's stale marker
+        fresh_for: Seconds a payload is used without refreshing
+        max_age: Seconds after which a payload is still used but reported as stale
+        failure_threshold: Consecutive failures that open the breaker
+        cooldown: Seconds the breaker stays open before one trial request is let through
+    """
+
+    def __init__(self, name, label, fresh_for, max_age, failure_threshold=3, cooldown=120):
+        self.name = name
+        self.label = label
+        self.fresh_for = fresh_for
+        self.max_age = max_age
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self.key = None  # what the payload is for (e.g. a date); a different key is a cache miss
+        self.payload = None
+        self.fetched_at = 0
+        self.failures = 0
+        self.open_until = 0
+        self.wanted_key = None  # key of the last get(); the payload may be for another one
+
+        self._lock = threading.Lock()
+        self._refresh = None  # running background refresh thread
+        self._loaded = False
+
+    @property
+    def path(self):
+        return os.path.join(CACHE_DIR, f"{self.name}.pkl")
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, "rb") as f:
+                self.key, self.payload, self.fetched_at, self.failures, self.open_until = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, ValueError, EOFError):
+            pass
+
+    def _save(self):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((self.key, self.payload, self.fetched_at, self.failures, self.open_until),
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)  # Readers never see a half-written entry
+        except OSError as e:
+            print(f"Could not save {self.name} cache: {e}", file=sys.stderr)
+
+    def _fetch(self, fetch, key):
+        """Call upstream and record the outcome; re-raises the upstream error"""
+        try:
+            payload = fetch()
+        except Exception:
+            with self._lock:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self.open_until = time.time() + self.cooldown
+                    print(f"{self.name}: {self.failures} failures in a row, pausing requests for {self.cooldown}s",
+                          file=sys.stderr)
+                self._save()
+            raise
+        with self._lock:
+            self.key = key
+            self.payload = payload
+            self.fetched_at = time.time()
+            self.failures = 0
+            self.open_until = 0
+            self._save()
+        return payload
+
+    def _background_fetch(self, fetch, key):
+        try:
+            self._fetch(fetch, key)
+        except Exception as e:
+            print(f"{self.name}: refresh failed, keeping cached data ({e})", file=sys.stderr)
+
+    def get(self, fetch, key=None, wait=REVALIDATE_WAIT, linger=True):
+        """Return (payload, stale)
+
+        Args:
+            fetch: Callable that downloads a new payload (raises on failure)
+            key: Optional identity of the wanted payload; a cached payload for another key is
+                only returned (as stale) when fetching the wanted one fails
+            wait: Seconds to wait for a refresh of an out-of-date payload before returning the cached one
+            linger: Keep the process alive until an unfinished refresh is saved. Pass False where
+                the process must exit promptly (the SwiftBar plugin), which abandons it instead.
+
+        Raises the upstream error (or CircuitOpenError) only when there is nothing cached to return.
+        """
+        with self._lock:
+            self._load()
+            self.wanted_key = key
+            now = time.time()
+            cached = self.payload is not None and self.key == key
+            fallback = self.payload is not None and not cached
+            age = now - self.fetched_at
+            breaker_open = now < self.open_until
+
+        if not cached:
+            if not breaker_open:
+                try:
+                    return self._fetch(fetch, key), False
+                except Exception as e:
+                    if not fallback:
+                        raise
+                    print(f"{self.name}: fetch failed, using the cached payload for {self.key} ({e})",
+                          file=sys.stderr)
+            elif not fallback:
+                raise CircuitOpenError(f"{self.name} unavailable, retrying after {time.ctime(self.open_until)}")
+            with self._lock:
+                return self.payload, True
+
+        if age >= self.fresh_for and not breaker_open:
+            refresh = self._refresh
+            if refresh is None or not refresh.is_alive():
+                refresh = self._refresh = threading.Thread(target=self._background_fetch, args=(fetch, key),
+                                                           daemon=not linger)
+                refresh.start()
+            refresh.join(wait)
+
+        with self._lock:
+            return self.payload, self.is_stale(time.time())
+
+    def is_stale(self, now):
+        """Whether the payload is older than max_age, or is for another key than the last get() wanted"""
+        return self.payload is not None and (self.key != self.wanted_key or now - self.fetched_at > self.max_age)
+
+
+G_FEED = DataSource("g_feed", "trains", fresh_for=20, max_age=5 * 60)
+FERRY = DataSource("ferry", "ferry", fresh_for=20, max_age=10 * 60)
+NWS_POINTS = DataSource("nws_points", "weather", fresh_for=7 * 86400, max_age=30 * 86400)  # Forecast URLs for our location
+NWS_FORECAST = DataSource("nws_forecast", "weather", fresh_for=15 * 60, max_age=6 * 3600)
+NWS_HOURLY = DataSource("nws_hourly", "weather", fresh_for=15 * 60, max_age=3 * 3600)
+SUN_TIMES = DataSource("sun_times", "sun", fresh_for=12 * 3600, max_age=2 * 86400)  # keyed by date
+SUN_TIMES_TOMORROW = DataSource("sun_times_tomorrow", "sun", fresh_for=12 * 3600, max_age=2 * 86400)
+
+SOURCES = [G_FEED, FERRY, NWS_POINTS, NWS_FORECAST, NWS_HOURLY, SUN_TIMES, SUN_TIMES_TOMORROW]
+
+
+def stale_labels():
+    """Labels of sources whose payload is stale now (see DataSource.is_stale)
+
+    Worked out from each payload's age when called, so a source that isn't asked for on every
+    frame (tomorrow's sun times, the ferry) isn't left marked by an old get(). Sources this
+    process never asked for have no payload loaded and are skipped.
+    """
+    now = time.time()
+    labels = []
+    for source in SOURCES:
+        if source.is_stale(now) and source.label not in labels:
+            labels.append(source.label)
+    return labels
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Subway station catalog: stop ID -> station name and parent station
+Compiled once from the static GTFS stops.txt into a small indexed file, so the display can
+name each train's destination from the last stop of its trip with a dict lookup instead of
+a CSV scan:
+
+    python station_catalog.py gtfs_subway.zip      # or a bare stops.txt
+    # Creates station_catalog.pkl
+
+    catalog = load_station_catalog()
+    catalog.name("G22N")      # "Court Sq"
+    catalog.station("G22N")   # "G22"
+
+The file holds the stop IDs in one list, the distinct names once each, and arrays of indexes
+into those (name and parent station per stop).
+"""
+
+import csv
+import io
+import os
+import pickle
+import sys
+import zipfile
+from array import array
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATION_CATALOG_PATH = os.path.join(SCRIPT_DIR, "station_catalog.pkl")
+
+CATALOG_VERSION = 1
+NO_PARENT = -1
+
+
+def _read_stops(path):
+    """Rows of stops.txt, from a GTFS zip or the file itself"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive, archive.open('stops.txt') as raw:
+            yield from csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8-sig'))
+    else:
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+
+
+def compile_catalog(path):
+    """Build the catalog from a static GTFS zip or stops.txt
+
+    Returns:
+        dict: picklable catalog with 'stop_ids', 'names', and 'name_index' / 'parent_index'
+            arrays parallel to stop_ids (parent_index is NO_PARENT for a station itself)
+    """
+    rows = list(_read_stops(path))
+    stop_ids = [row['stop_id'] for row in rows]
+    position = {stop_id: i for i, stop_id in enumerate(stop_ids)}
+
+    names = []
+    name_ids = {}
+    name_index = array('i')
+    parent_index = array('i')  # 32-bit: multi-agency stops.txt files pass 32767 stops
+    for row in rows:
+        name = row.get('stop_name', '').strip()
+        if name not in name_ids:
+            name_ids[name] = len(names)
+            names.append(name)
+        name_index.append(name_ids[name])
+        parent_index.append(position.get(row.get('parent_station') or '', NO_PARENT))
+
+    return {
+        'version': CATALOG_VERSION,
+        'stop_ids': stop_ids,
+        'names': names,
+        'name_index': name_index,
+        'parent_index': parent_index,
+    }
+
+
+class StationCatalog:
+    """Compiled stops.txt, looked up by stop ID"""
+
+    def __init__(self, data):
+        if data.get('version') != CATALOG_VERSION:
+            raise ValueError(f"Unsupported station catalog version: {data.get('version')}")
+        self.stop_ids = data['stop_ids']
+        self.names = data['names']
+        self.name_index = data['name_index']
+        self.parent_index = data['parent_index']
+        self.position = {stop_id: i for i, stop_id in enumerate(self.stop_ids)}
+
+    @classmethod
+    def load(cls, path=STATION_CATALOG_PATH):
+        with open(path, 'rb') as f:
+            return cls(pickle.load(f))
+
+    def save(self, path):
+        data = {
+            'version': CATALOG_VERSION,
+            'stop_ids': self.stop_ids,
+            'names': self.names,
+            'name_index': self.name_index,
+            'parent_index': self.parent_index,
+        }
+        with open(path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def name(self, stop_id):
+        """Name of a stop (e.g. "Court Sq" for G22N), or None if it isn't in the catalog"""
+        i = self.position.get(stop_id)
+        return None if i is None else self.names[self.name_index[i]]
+
+    def station(self, stop_id):
+        """Stop ID of a stop's parent station (the stop itself if it is one), or None if unknown"""
+        i = self.position.get(stop_id)
+        if i is None:
+            return None
+        parent = self.parent_index[i]
+        return stop_id if parent == NO_PARENT else self.stop_ids[parent]
+
+
+_loaded_catalogs = {}
+
+
+def load_station_catalog(path=STATION_CATALOG_PATH):
+    """Load (and memoize) the compiled station catalog, or return None if it isn't available"""
+    if path not in _loaded_catalogs:
+        try:
+            _loaded_catalogs[path] = StationCatalog.load(path)
+        except FileNotFoundError:
+            _loaded_catalogs[path] = None  # Not compiled; callers fall back to their own labels
+        except Exception as e:
+            print(f"Station catalog unavailable ({path}): {e}")
+            _loaded_catalogs[path] = None
+    return _loaded_catalogs[path]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: station_catalog.py GTFS_ZIP|stops.txt [-o OUTPUT]")
+        sys.exit(1)
+
+    source = sys.argv[1]
+    output = STATION_CATALOG_PATH
+    if "-o" in sys.argv:
+        output = sys.argv[sys.argv.index("-o") + 1]
+
+    catalog = StationCatalog(compile_catalog(source))
+    catalog.save(output)
+    stations = sum(1 for parent in catalog.parent_index if parent == NO_PARENT)
+    print(f"Compiled {len(catalog.stop_ids)} stops ({stations} stations, {len(catalog.names)} names) into {output}")
@@ -0,0 +1,36 @@
+#!/bin/sh
+# Show the pre-rendered frame for the current minute (see --lookahead in README.md)
+#
+# Usage: swap_frame.sh QUEUE_DIR NAME TARGET [COMMAND...]
+#   Copies the queued NAME frame for this minute to TARGET. If a COMMAND is given it is run
+#   with TARGET appended, but only when the frame actually changed. Run it every minute, e.g.:
+#   * * * * * /mnt/us/dash/swap_frame.sh /mnt/us/dash/frame_queue schedule /tmp/schedule.png eips -g
+#
+# Exits 1 (leaving TARGET as it was) when the queue has no frame for this minute.
+
+if [ $# -lt 3 ]; then
+    echo "Usage: $0 QUEUE_DIR NAME TARGET [COMMAND...]" >&2
+    exit 2
+fi
+QUEUE_DIR=$1
+NAME=$2
+TARGET=$3
+shift 3
+
+NOW=$(date +%s)
+FRAME=$(awk -v now="$NOW" -v name="$NAME" '$3 == name && $1 <= now && now < $2 { print $4; exit }' \
+    "$QUEUE_DIR/manifest.txt" 2>/dev/null)
+if [ -z "$FRAME" ]; then
+    echo "No queued $NAME frame for $(date)" >&2
+    exit 1
+fi
+
+# Already showing this frame
+if [ -f "$TARGET" ] && cmp -s "$QUEUE_DIR/$FRAME" "$TARGET"; then
+    exit 0
+fi
+
+cp "$QUEUE_DIR/$FRAME" "$TARGET.tmp" && mv "$TARGET.tmp" "$TARGET" || exit 1
+if [ $# -gt 0 ]; then
+    "$@" "$TARGET"
+fi
@@ -0,0 +1,79 @@
+"""
+Rendered pieces of the frame, kept until their inputs change
+Each entry is an image stored with a digest of whatever it was drawn from. A lookup with a
+different digest is a miss, so a caller only redraws the pieces whose inputs changed.
+
+    tile = TILES.get("forecast", digest)
+    if tile is None:
+        tile = draw_forecast_tile(...)
+        TILES.put("forecast", digest, tile, persist=True)
+
+Entries put with persist=True are also written to .tile_cache/, so pieces that rarely change
+(the hourly forecast) carry over between one-shot runs. Everything else is kept in memory only.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tile_cache")
+
+
+def content_digest(*inputs):
+    """Digest of a tile's inputs (anything with a stable repr: tuples, strings, numbers)"""
+    return hashlib.blake2b(repr(inputs).encode(), digest_size=16).digest()
+
+
+class TileCache:
+    """Images keyed by name, each valid for one input digest"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.entries = {}  # name -> (digest, image)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.tile")
+
+    def _load(self, name):
+        from PIL import Image
+
+        try:
+            with open(self.path(name), "rb") as f:
+                digest, mode, size, data = pickle.load(f)
+            return digest, Image.frombytes(mode, size, data)
+        except (OSError, pickle.UnpicklingError, ValueError, EOFError):
+            return None
+
+    def _save(self, name, digest, image):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.path(name)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((digest, image.mode, image.size, image.tobytes()), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(name))  # Parallel variant workers never read a partial tile
+        except OSError as e:
+            print(f"Could not save {name} tile: {e}", file=sys.stderr)
+
+    def get(self, name, digest, persist=False):
+        """The cached image for name if it was drawn from the same inputs, else None"""
+        entry = self.entries.get(name)
+        if entry is None and persist:
+            entry = self._load(name)
+            if entry is not None:
+                self.entries[name] = entry
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, name, digest, image, persist=False):
+        self.entries[name] = (digest, image)
+        if persist:
+            self._save(name, digest, image)
+
+
+TILES = TileCache()
@@ -0,0 +1,161 @@
+"""
+Last processed board state, kept on disk for an instant first frame after a restart
+After each refresh the generator saves what the board was drawn from: the train rows (with
+spares, so the countdowns can run on), the weather model with its sun times, and when the
+data from each source is from. With --warm-start the first frame is drawn from this file,
+with each source's age in the time bar, while fresh data loads.
+
+The file is a small struct-packed record, written under a temporary name and renamed, so a
+crash or power loss mid-write leaves the previous state in place:
+
+    header   magic b"MTAW", FORMAT_VERSION (B), taken_at (d), string count (H)
+    strings  length (H) + UTF-8 each; the fields below refer to them by index (H)
+    as_of    count (H), then label (H) and epoch seconds (d) per source
+    trains   count (H), then arrival (d), destination (H), direction (H) and scheduled (B)
+             per row
+    weather  present (B); text, icon, sun_icon, sun_time (H each), sunrise and sunset
+             (d, NaN if unknown), hour count (B), then start (d), label (H), temp (h),
+             condition (H) and icon (H) per hour
+
+Loading it needs no third-party imports and takes well under a millisecond.
+"""
+
+import math
+import os
+import struct
+import sys
+
+from weather_model import HourlyForecast, WeatherReport
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".warm_state.bin")
+MAGIC = b"MTAW"
+FORMAT_VERSION = 2
+NO_TEMP = -32768  # temp field value of an hour without a temperature
+
+HEADER = struct.Struct("<4sBdH")
+STRING = struct.Struct("<H")
+AS_OF = struct.Struct("<Hd")
+TRAIN = struct.Struct("<dHHB")
+WEATHER = struct.Struct("<HHHHddB")
+HOUR = struct.Struct("<dHhHH")
+
+
+class WarmState:
+    """A saved board: train rows, WeatherReport (or None), when it was taken and data times
+
+    as_of maps a source label ('trains', 'weather', 'sun') to the epoch seconds its data is
+    from. Train rows are {'destination', 'direction', 'scheduled', 'arrival'}; minutes are
+    recomputed when the state is drawn.
+    """
+
+    def __init__(self, trains, weather, taken_ts, as_of):
+        self.trains = trains
+        self.weather = weather
+        self.taken_ts = taken_ts
+        self.as_of = as_of
+
+
+def _optional(value):
+    return math.nan if value is None else value
+
+
+def _unoptional(value):
+    return None if math.isnan(value) else value
+
+
+def encode_state(state):
+    strings = {}
+
+    def ref(text):
+        return strings.setdefault(text, len(strings))
+
+    body = [STRING.pack(len(state.as_of))]
+    body += [AS_OF.pack(ref(label), ts) for label, ts in state.as_of.items()]
+    body.append(STRING.pack(len(state.trains)))
+    body += [TRAIN.pack(train['arrival'], ref(train['destination']), ref(train.get('direction', '')),
+                        bool(train.get('scheduled')))
+             for train in state.trains]
+    weather = state.weather
+    if weather is None:
+        body.append(b"\0")
+    else:
+        body.append(b"\1")
+        body.append(WEATHER.pack(ref(weather.text), ref(weather.icon), ref(weather.sun_icon), ref(weather.sun_time),
+                                 _optional(weather.sunrise_ts), _optional(weather.sunset_ts), len(weather.hourly)))
+        body += [HOUR.pack(hour.start_ts, ref(hour.label), NO_TEMP if hour.temp is None else hour.temp,
+                           ref(hour.condition), ref(hour.icon))
+                 for hour in weather.hourly]
+
+    table = []
+    for text in strings:  # Insertion order is index order
+        data = text.encode()
+        table.append(STRING.pack(len(data)) + data)
+    return HEADER.pack(MAGIC, FORMAT_VERSION, state.taken_ts, len(strings)) + b"".join(table) + b"".join(body)
+
+
+def decode_state(data):
+    """WarmState from encode_state's bytes; raises ValueError if they aren't a state of this format"""
+    try:
+        magic, version, taken_ts, string_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("not a warm state file of this version")
+        offset = HEADER.size
+        strings = []
+        for _ in range(string_count):
+            (length,) = STRING.unpack_from(data, offset)
+            offset += STRING.size
+            strings.append(data[offset:offset + length].decode())
+            offset += length
+
+        def records(record):
+            nonlocal offset
+            (count,) = STRING.unpack_from(data, offset)
+            offset += STRING.size
+            rows = list(record.iter_unpack(data[offset:offset + count * record.size]))
+            offset += count * record.size
+            return rows
+
+        as_of = {strings[label]: ts for label, ts in records(AS_OF)}
+        trains = [{'destination': strings[destination], 'direction': strings[direction], 'scheduled': bool(scheduled),
+                   'arrival': arrival}
+                  for arrival, destination, direction, scheduled in records(TRAIN)]
+
+        weather = None
+        offset += 1
+        if data[offset - 1]:
+            text, icon, sun_icon, sun_time, sunrise_ts, sunset_ts, hour_count = WEATHER.unpack_from(data, offset)
+            offset += WEATHER.size
+            hourly = [HourlyForecast(start_ts, strings[label], None if temp == NO_TEMP else temp,
+                                     strings[condition], strings[hour_icon])
+                      for start_ts, label, temp, condition, hour_icon
+                      in HOUR.iter_unpack(data[offset:offset + hour_count * HOUR.size])]
+            weather = WeatherReport(strings[text], strings[icon], strings[sun_icon], strings[sun_time], hourly,
+                                    _unoptional(sunrise_ts), _unoptional(sunset_ts))
+        return WarmState(trains, weather, taken_ts, as_of)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"truncated or corrupt warm state: {e}") from e
+
+
+def save_state(state, path=STATE_PATH):
+    try:
+        data = encode_state(state)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())  # On disk before the rename, so a power cut can't leave an empty file
+        os.replace(tmp_path, path)
+    except (OSError, struct.error) as e:  # struct.error: a value outside its field, e.g. a fractional temp
+        print(f"Could not save warm state: {e}", file=sys.stderr)
+
+
+def load_state(path=STATE_PATH):
+    """The saved WarmState, or None if there is none (or it can't be read)"""
+    try:
+        with open(path, "rb") as f:
+            return decode_state(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable warm state: {e}", file=sys.stderr)
+        return None
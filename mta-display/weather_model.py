@@ -0,0 +1,135 @@
+"""
+Compact weather model for the display footer
+Hourly periods are __slots__ records holding epoch timestamps and precomputed labels/icons,
+so the renderer never re-parses times or re-runs the condition matching per hour.
+"""
+
+import bisect
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+HOURLY_LIMIT = 12  # Number of hourly periods shown in the footer graph
+CURRENT_HOUR_GRACE = timedelta(minutes=30)  # Include the current hour if it started within 30 min
+
+
+def parse_iso_time(value):
+    """Parse an ISO 8601 timestamp from the weather APIs
+
+    datetime.fromisoformat only accepts a trailing 'Z' from Python 3.11 on
+    """
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=256)
+def condition_icon(condition_text):
+    """Map NWS shortForecast text to an icon name (memoized - the same few strings repeat all day)"""
+    condition_lower = condition_text.lower()
+
+    # Icon mapping with fuzzy matching
+    if 'thunder' in condition_lower or 'storm' in condition_lower and 'tropical' not in condition_lower:
+        return 'thunderstorm'
+    elif 'snow' in condition_lower or 'flurr' in condition_lower or 'blizzard' in condition_lower:
+        return 'snow'
+    elif 'rain' in condition_lower and 'heavy' in condition_lower:
+        return 'heavy-rain'
+    elif 'rain' in condition_lower or 'shower' in condition_lower:
+        return 'rain'
+    elif 'drizzle' in condition_lower:
+        return 'drizzle'
+    elif 'fog' in condition_lower or 'mist' in condition_lower:
+        return 'fog'
+    elif 'clear' in condition_lower and 'night' in condition_lower:
+        return 'clear-night'
+    elif 'partly' in condition_lower or 'p.' in condition_lower:
+        return 'partly-cloudy'
+    elif 'mostly' in condition_lower or 'm.' in condition_lower or 'overcast' in condition_lower or 'cloudy' in condition_lower:
+        return 'cloudy'
+    elif 'sunny' in condition_lower or 'clear' in condition_lower:
+        return 'sunny'
+    else:
+        # Default to partly cloudy
+        return 'partly-cloudy'
+
+
+def night_icon(icon):
+    """Swap daytime icons for their night variant"""
+    if 'clear' in icon or 'sunny' in icon:
+        return 'clear-night'
+    # Partly cloudy / cloudy look the same day or night (could add night variants later)
+    return icon
+
+
+class HourlyForecast:
+    """One hour of the footer graph"""
+    __slots__ = ('start_ts', 'label', 'temp', 'condition', 'icon')
+
+    def __init__(self, start_ts, label, temp, condition, icon):
+        self.start_ts = start_ts  # Epoch seconds of the period start
+        self.label = label  # "NOW", "3 PM", ...
+        self.temp = temp
+        self.condition = condition
+        self.icon = icon  # Already adjusted for day/night
+
+
+class WeatherReport:
+    """Everything the footer needs from the weather and sun APIs"""
+    __slots__ = ('text', 'icon', 'sun_icon', 'sun_time', 'hourly', 'sunrise_ts', 'sunset_ts')
+
+    def __init__(self, text, icon, sun_icon, sun_time, hourly, sunrise_ts, sunset_ts):
+        self.text = text  # e.g. "54°F P. Cloudy"
+        self.icon = icon
+        self.sun_icon = sun_icon  # 'sunrise' or 'sunset', whichever comes next
+        self.sun_time = sun_time  # e.g. "6:42 PM"
+        self.hourly = hourly  # list of HourlyForecast
+        self.sunrise_ts = sunrise_ts  # Today's sunrise, epoch seconds (None if unknown)
+        self.sunset_ts = sunset_ts
+
+
+def hour_label(start_time, now_local, first):
+    """"NOW" for the first hour if it is the current one, else the hour (e.g. "3 PM", "1 AM")"""
+    if first and start_time.hour == now_local.hour:
+        return "NOW"
+    return start_time.strftime('%I %p').lstrip('0')
+
+
+def _period_start_ts(period):
+    return parse_iso_time(period['startTime']).timestamp()
+
+
+def build_hourly(periods, now_local, sunrise_ts, sunset_ts, limit=HOURLY_LIMIT):
+    """Turn NWS hourly periods into HourlyForecast records for the next `limit` hours
+
+    NWS returns ~156 periods sorted by start time; bisecting on start time means only
+    ~log2(n) + limit timestamps get parsed instead of every period up to the cutoff.
+    """
+    cutoff = (now_local - CURRENT_HOUR_GRACE).timestamp()
+    first = bisect.bisect_left(periods, cutoff, key=_period_start_ts)
+    tz = now_local.tzinfo
+
+    hourly = []
+    for i, period in enumerate(periods[first:first + limit]):
+        start_time = parse_iso_time(period['startTime']).astimezone(tz)
+        start_ts = start_time.timestamp()
+
+        label = hour_label(start_time, now_local, first=i == 0)
+        icon = condition_icon(period['shortForecast'])
+        if sunrise_ts is not None and sunset_ts is not None and (start_ts < sunrise_ts or start_ts >= sunset_ts):
+            icon = night_icon(icon)
+
+        hourly.append(HourlyForecast(start_ts, label, period['temperature'], period['shortForecast'], icon))
+    return hourly
+
+
+def hourly_as_of(hourly, now_local):
+    """HourlyForecast records from an earlier build_hourly as the graph should read at now_local
+
+    Hours that have passed are dropped and the labels redone, so "NOW" moves along.
+    """
+    cutoff = (now_local - CURRENT_HOUR_GRACE).timestamp()
+    tz = now_local.tzinfo
+    kept = [hour for hour in hourly if hour.start_ts >= cutoff]
+    return [HourlyForecast(hour.start_ts, hour_label(datetime.fromtimestamp(hour.start_ts, tz), now_local, first=i == 0),
+                           hour.temp, hour.condition, hour.icon)
+            for i, hour in enumerate(kept)]
@@ -0,0 +1,73 @@
+#!/Users/provolot/.pyenv/versions/3.10.15/bin/python3
+"""Resident helper for the SwiftBar plugin
+
+Keeps the imports warm, refreshes arrivals in the background and serves the
+pre-formatted menu over a Unix socket, so each plugin run is a socket read instead of
+a cold start (imports, two feed downloads and a ferry subprocess).
+
+Run it once per login, e.g.:
+    python3 transit_helper.py &
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+from transit_menu import fetch_menu
+
+SOCKET_PATH = os.environ.get("GREENPOINT_TRANSIT_SOCKET", "/tmp/greenpoint-transit.sock")
+REFRESH_SECONDS = 20  # Shorter than the plugin's 30s so every run sees fresh-ish data
+
+
+class TransitHelper:
+    def __init__(self):
+        self.menu = None  # bytes; swapped whole so readers never see a partial menu
+
+    def refresh(self):
+        self.menu = fetch_menu().encode("utf-8")
+
+    def refresh_loop(self):
+        while True:
+            time.sleep(REFRESH_SECONDS)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing transit data: {e}", file=sys.stderr)
+
+    def serve(self):
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)  # Stale socket from a previous run
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(SOCKET_PATH)
+        os.chmod(SOCKET_PATH, 0o600)
+        server.listen(8)
+        print(f"Serving transit menu on {SOCKET_PATH}", file=sys.stderr)
+
+        try:
+            while True:
+                conn, _ = server.accept()
+                with conn:
+                    menu = self.menu
+                    if menu:
+                        conn.sendall(menu)
+                    # Closing without data tells the client to use its fallback path
+        finally:
+            server.close()
+            os.unlink(SOCKET_PATH)
+
+
+def main():
+    helper = TransitHelper()
+    try:
+        helper.refresh()
+    except Exception as e:
+        print(f"Error on initial refresh: {e}", file=sys.stderr)
+    threading.Thread(target=helper.refresh_loop, daemon=True).start()
+    helper.serve()
+
+
+if __name__ == "__main__":
+    main()
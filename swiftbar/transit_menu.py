@@ -0,0 +1,170 @@
+"""Fetch G train / ferry arrivals and format the SwiftBar menu
+
+Shared by the plugin script (fallback path) and transit_helper.py (resident path)
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Feed decoding is shared with the display generator
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mta-display"))
+from arrivals_board import read_board
+from feed_diff import LiveArrivals
+from feed_extract import upcoming_departure_minutes
+from gtfs_schedule import load_schedule_index, EASTERN, FERRY_SCHEDULE_INDEX_PATH, SCHEDULE_INDEX_PATH
+import http_transport
+from source_cache import FERRY, G_FEED
+
+# Station IDs
+G_TRAIN_GREENPOINT_NORTH = "G26N"  # Queens-bound
+G_TRAIN_GREENPOINT_SOUTH = "G26S"  # Church Ave-bound
+G_FEED_URL = "https://api-endpoint.mta.info/Dataservice/mtagtfsfeeds/nyct%2Fgtfs-g"
+# Arrivals at our stops; the helper keeps this between refreshes and only decodes changed trips
+G_ARRIVALS = LiveArrivals(stops={G_TRAIN_GREENPOINT_NORTH, G_TRAIN_GREENPOINT_SOUTH})
+# The display generator's shared arrivals board is used instead of the feed while it is
+# published at least this often (seconds; it publishes every 30s or so)
+BOARD_MAX_AGE = 90
+
+FERRY_TRIP_UPDATES = "http://nycferry.connexionz.net/rtt/public/utility/gtfsrealtime.aspx/tripupdate"
+FERRY_STOP_GREENPOINT = "18"
+_ferry_feed = (None, None)  # (payload, decoded FeedMessage) of the last ferry feed
+
+
+def get_mta_arrivals(table, stop_id, now_ts):
+    """Get next arrivals for a specific MTA stop from already-decoded arrivals (LiveArrivals, ArrivalTable or BoardSnapshot)"""
+    try:
+        return [minutes for minutes, _, _ in table.upcoming(stop_id, now_ts, limit=3)]
+    except Exception as e:
+        return []
+
+def scheduled_minutes(index_path, stop_id, now_ts):
+    """Minutes until the next scheduled departures at a stop, from a compiled static GTFS index (see gtfs_schedule.py)"""
+    index = load_schedule_index(index_path)
+    if index is None:
+        return []
+    departures = index.next_departures(stop_id, now=datetime.fromtimestamp(now_ts, EASTERN), limit=3)
+    return [max(0, int((departure_ts - now_ts) / 60)) for departure_ts, _headsign in departures]
+
+
+def get_ferry_arrivals():
+    """Get next ferry arrivals for Greenpoint (stop ID: 18)
+
+    Decoded in this process with nyct_gtfs's compiled GTFS-realtime module, the one the G feed
+    already uses, so it doesn't clash with google.transit's copy and needs no subprocess. The
+    helper keeps the decoded feed between refreshes and only parses a payload that changed.
+    """
+    global _ferry_feed
+    now_ts = datetime.now().timestamp()
+    arrivals = []
+    stale = False
+    try:
+        # Last good feed if the ferry endpoint is slow or failing (see source_cache.py);
+        # the plugin's fallback path must exit promptly, so a refresh gets `wait` seconds
+        payload, stale = FERRY.get(lambda: http_transport.get_bytes(FERRY_TRIP_UPDATES, timeout=4, retries=0),
+                                   wait=5, linger=False)
+        if _ferry_feed[0] != payload:
+            from nyct_gtfs.compiled_gtfs import gtfs_realtime_pb2
+
+            message = gtfs_realtime_pb2.FeedMessage()
+            message.ParseFromString(payload)
+            _ferry_feed = (payload, message)
+        # Departure time where the feed has one, otherwise arrival time (see feed_extract.boarding_time)
+        arrivals = upcoming_departure_minutes(_ferry_feed[1], FERRY_STOP_GREENPOINT, now_ts)[:3]
+    except Exception as e:
+        print(f"Error fetching ferry data: {e}", file=sys.stderr)
+
+    scheduled = False
+    if not arrivals:
+        # No live arrivals - try the static schedule
+        arrivals = scheduled_minutes(FERRY_SCHEDULE_INDEX_PATH, FERRY_STOP_GREENPOINT, now_ts)
+        scheduled = bool(arrivals)
+        stale = False
+
+    # For now, show all ferries - we'll determine direction later
+    return {
+        "hunters_point": arrivals,  # Show all ferries here for now
+        "wall_st": [],  # Leave empty until we can determine direction
+        "scheduled": scheduled,
+        "stale": stale
+    }
+
+def format_times(times, scheduled=False, stale=False):
+    """Format arrival times for display"""
+    if not times:
+        return "No data"
+    text = ", ".join([f"{t}min" if t > 0 else "Now" for t in times])
+    if scheduled:
+        return f"{text} (scheduled)"
+    return f"{text} (stale)" if stale else text
+
+def build_menu(g_queens, g_church, ferry, g_stale=False, g_scheduled=False):
+    """Return the full SwiftBar menu text for the given arrivals"""
+    lines = []
+
+    # Menu bar - just show a simple icon
+    lines.append("🚇")
+
+    # Separator for dropdown
+    lines.append("---")
+
+    # Dropdown menu - show all routes
+    lines.append("🚊 G Train - Greenpoint Ave")
+    lines.append(f"  Queens-bound: {format_times(g_queens, g_scheduled, g_stale)} | font=monospace")
+    lines.append(f"  Church Ave-bound: {format_times(g_church, g_scheduled, g_stale)} | font=monospace")
+
+    lines.append("---")
+
+    lines.append("⛴️ East River Ferry - Greenpoint")
+    lines.append(f"  Hunters Point: {format_times(ferry['hunters_point'], ferry['scheduled'], ferry['stale'])} | font=monospace")
+    lines.append(f"  Wall St: {format_times(ferry['wall_st'], ferry['scheduled'], ferry['stale'])} | font=monospace")
+
+    lines.append("---")
+    lines.append(f"Updated: {datetime.now().strftime('%I:%M:%S %p')} | font=monospace size=10")
+    return "\n".join(lines) + "\n"
+
+def read_board_arrivals(now_ts):
+    """(Queens-bound, Church Ave-bound, stale) from the shared arrivals board, or None
+
+    None unless mta_display.py --resident is publishing live arrivals (see arrivals_board.py)
+    """
+    board = read_board()
+    if board is None or now_ts - board.published_at > BOARD_MAX_AGE or all(row[3] for row in board.rows):
+        return None
+    return (get_mta_arrivals(board, G_TRAIN_GREENPOINT_NORTH, now_ts),
+            get_mta_arrivals(board, G_TRAIN_GREENPOINT_SOUTH, now_ts),
+            now_ts - board.source_ts > G_FEED.max_age)
+
+
+def fetch_menu():
+    """Fetch everything and return the menu text
+
+    G arrivals come from the display generator's shared arrivals board when it is running.
+    Otherwise the G feed is downloaded once and applied to the arrivals at our two stops as a
+    diff against the previous refresh (see feed_diff.py). With no live G arrivals, the static
+    schedule is shown, as on the display.
+    """
+    now_ts = datetime.now().timestamp()
+    board_arrivals = read_board_arrivals(now_ts)
+    if board_arrivals is not None:
+        g_queens, g_church, g_stale = board_arrivals
+        return build_menu(g_queens, g_church, get_ferry_arrivals(), g_stale)
+    try:
+        # Through the shared transport, so the helper reuses one connection across refreshes,
+        # and the source cache, so a slow or failing MTA endpoint doesn't hold up the menu
+        payload, g_stale = G_FEED.get(lambda: http_transport.get_bytes(G_FEED_URL), wait=2, linger=False)
+        G_ARRIVALS.update(payload)
+        g_queens = get_mta_arrivals(G_ARRIVALS, G_TRAIN_GREENPOINT_NORTH, now_ts)
+        g_church = get_mta_arrivals(G_ARRIVALS, G_TRAIN_GREENPOINT_SOUTH, now_ts)
+    except Exception as e:
+        g_queens = []
+        g_church = []
+        g_stale = False
+    g_scheduled = False
+    if not g_queens and not g_church:
+        g_queens = scheduled_minutes(SCHEDULE_INDEX_PATH, G_TRAIN_GREENPOINT_NORTH, now_ts)
+        g_church = scheduled_minutes(SCHEDULE_INDEX_PATH, G_TRAIN_GREENPOINT_SOUTH, now_ts)
+        g_scheduled = bool(g_queens or g_church)
+        g_stale = False
+    ferry = get_ferry_arrivals()
+    return build_menu(g_queens, g_church, ferry, g_stale, g_scheduled)